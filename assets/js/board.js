@@ -0,0 +1,83 @@
+// Task board script: drag-and-drop moves and per-column "load more".
+// Bundled into static/dist/board.min.js by `python manage.py build_assets`.
+(function () {
+    const board = document.getElementById('taskBoard');
+    if (!board) {
+        return;
+    }
+    const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]').value;
+    let dragged = null;
+
+    function adjustCount(column, delta) {
+        const badge = column.querySelector('.board-count');
+        badge.textContent = parseInt(badge.textContent) + delta;
+    }
+
+    board.addEventListener('dragstart', function (event) {
+        dragged = event.target.closest('.board-card');
+        if (dragged) {
+            event.dataTransfer.effectAllowed = 'move';
+            event.dataTransfer.setData('text/plain', dragged.dataset.taskId);
+        }
+    });
+
+    board.addEventListener('dragover', function (event) {
+        if (dragged && event.target.closest('.board-column')) {
+            event.preventDefault();
+        }
+    });
+
+    board.addEventListener('drop', function (event) {
+        const target = event.target.closest('.board-column');
+        const card = dragged;
+        dragged = null;
+        if (!card || !target) {
+            return;
+        }
+        event.preventDefault();
+        const source = card.closest('.board-column');
+        if (source === target) {
+            return;
+        }
+
+        const body = new FormData();
+        body.append('column', target.dataset.column);
+        fetch(card.dataset.moveUrl, {
+            method: 'POST',
+            body: body,
+            headers: {'X-CSRFToken': csrfToken},
+            credentials: 'same-origin'
+        }).then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            target.querySelector('.board-cards').prepend(card);
+            adjustCount(source, -1);
+            adjustCount(target, 1);
+        }).catch(function () {
+            window.alert('The task could not be moved. Please reload the page.');
+        });
+    });
+
+    board.addEventListener('click', function (event) {
+        const button = event.target.closest('.board-more');
+        if (!button) {
+            return;
+        }
+        button.disabled = true;
+        fetch(button.dataset.url, {credentials: 'same-origin'})
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.text();
+            })
+            .then(function (html) {
+                button.insertAdjacentHTML('beforebegin', html);
+                button.remove();
+            })
+            .catch(function () {
+                button.disabled = false;
+            });
+    });
+})();
@@ -0,0 +1,45 @@
+// Dashboard page script. Bundled with Chart.js into
+// static/dist/dashboard.min.js by `python manage.py build_assets`.
+(function () {
+    // Setting colors for type badges
+    document.querySelectorAll('.type-badge').forEach(function (badge) {
+        const list = badge.closest('[data-type-colors]');
+        if (list) {
+            const colors = JSON.parse(list.dataset.typeColors);
+            const index = parseInt(badge.dataset.index);
+            badge.style.setProperty('background-color', colors[index % colors.length]);
+        }
+    });
+
+    // Priority and type distributions (personal and team)
+    [
+        'personalPriorityChart',
+        'teamPriorityChart',
+        'personalTypeChart',
+        'teamTypeChart'
+    ].forEach(function (canvasId) {
+        const canvas = document.getElementById(canvasId);
+        if (!canvas) {
+            return;
+        }
+        const chartData = JSON.parse(canvas.dataset.chart);
+        const colors = JSON.parse(canvas.dataset.colors);
+        new Chart(canvas, {
+            type: 'doughnut',
+            data: {
+                labels: chartData.labels,
+                datasets: [{
+                    data: chartData.data,
+                    backgroundColor: colors.slice(0, chartData.labels.length)
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: true,
+                plugins: {
+                    legend: {display: false}
+                }
+            }
+        });
+    });
+})();
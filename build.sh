@@ -3,6 +3,8 @@ set -o errexit
 
 pip install -r requirements.txt
 
+python manage.py build_assets
+
 python manage.py collectstatic --no-input
 
 python manage.py migrate
\ No newline at end of file
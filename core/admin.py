@@ -1,6 +1,20 @@
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import Position, TaskType, Worker, Task
+from django.utils import timezone
+from .bulk import bulk_update_tasks
+from .forms import VersionedTaskForm
+from .jobs import enqueue
+from .models import (
+    ArchivedTask,
+    Job,
+    Position,
+    TaskType,
+    VersionConflict,
+    Worker,
+    Task,
+)
+from .search import search_workers
 
 
 @admin.register(Position)
@@ -21,11 +35,14 @@ class WorkerAdmin(UserAdmin):
         "username",
         "position",
         "email",
+        "open_task_count",
+        "completed_task_count",
         "is_active",
         "is_staff",
         "is_superuser",
     )
-    search_fields = ("username", "email", "first_name", "last_name")
+    # Names are matched through ``core.search``; see get_search_results().
+    search_fields = ("email",)
     list_filter = ("position", "is_active", "is_staff", "is_superuser",)
     list_display_links = ("username",)
     list_select_related = ("position",)
@@ -43,6 +60,13 @@ class WorkerAdmin(UserAdmin):
         }),
     )
 
+    def get_search_results(self, request, queryset, search_term):
+        if "@" in search_term:
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        return search_workers(queryset, search_term), False
+
     add_fieldsets = (
         (None, {
             "fields": (
@@ -59,8 +83,15 @@ class WorkerAdmin(UserAdmin):
     )
 
 
+class TaskAdminForm(VersionedTaskForm):
+    class Meta:
+        model = Task
+        fields = "__all__"
+
+
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
+    form = TaskAdminForm
     list_display = (
         "id",
         "name",
@@ -69,17 +100,84 @@ class TaskAdmin(admin.ModelAdmin):
         "priority",
         "deadline",
         "get_assignees",
+        "version",
     )
     search_fields = ("name", "description",)
     list_filter = ("deadline", "is_completed", "priority", "task_type",)
     list_display_links = ("id", "name",)
     list_select_related = ("task_type",)
+    raw_id_fields = ("parent",)
     list_editable = ("is_completed", "priority",)
+    readonly_fields = ("version",)
+    actions = ("mark_completed", "mark_pending",)
+
+    def get_form(self, request, obj=None, **kwargs):
+        form = super().get_form(request, obj, **kwargs)
+        form.conflicted_task_ids = self.conflicted_task_ids(request)
+        return form
+
+    def get_changelist_form(self, request, **kwargs):
+        kwargs.setdefault("form", TaskAdminForm)
+        form = super().get_changelist_form(request, **kwargs)
+        form.conflicted_task_ids = self.conflicted_task_ids(request)
+        return form
+
+    @staticmethod
+    def conflicted_task_ids(request):
+        return getattr(request, "conflicted_task_ids", frozenset())
+
+    def changeform_view(self, request, *args, **kwargs):
+        return self.render_conflicts(
+            super().changeform_view, request, *args, **kwargs
+        )
+
+    def changelist_view(self, request, *args, **kwargs):
+        return self.render_conflicts(
+            super().changelist_view, request, *args, **kwargs
+        )
+
+    def render_conflicts(self, view, request, *args, **kwargs):
+        # Both views save and log in one transaction, so a task that
+        # changed after validation rolls back everything. The request is
+        # then handled again with that task's form invalid.
+        try:
+            return view(request, *args, **kwargs)
+        except VersionConflict as conflict:
+            if conflict.task_id in self.conflicted_task_ids(request):
+                raise
+            request.conflicted_task_ids = (
+                self.conflicted_task_ids(request) | {conflict.task_id}
+            )
+            return self.render_conflicts(view, request, *args, **kwargs)
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            return super().save_model(request, obj, form, change)
+        form.save_edits()
+
+    def save_related(self, request, form, formsets, change):
+        # Edits of assignees are written by ``save_edits``.
+        if not change:
+            super().save_related(request, form, formsets, change)
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
         return queryset.prefetch_related("assignees")
 
+    def get_search_results(self, request, queryset, search_term):
+        # Also find tasks by the names of their assignees.
+        matches, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        if search_term:
+            assigned = Task.assignees.through.objects.filter(
+                worker__in=search_workers(
+                    Worker.objects.all(), search_term
+                ).values("pk")
+            ).values("task_id")
+            matches |= queryset.filter(pk__in=assigned)
+        return matches, may_have_duplicates
+
     def get_assignees(self, obj):
         assignees = obj.assignees.all()
         if assignees:
@@ -89,3 +187,87 @@ class TaskAdmin(admin.ModelAdmin):
         return "No assignees"
 
     get_assignees.short_description = "Assignees"
+
+    @admin.action(description="Mark selected tasks as completed")
+    def mark_completed(self, request, queryset):
+        self.update_tasks(request, queryset, "completed", is_completed=True)
+
+    @admin.action(description="Mark selected tasks as pending")
+    def mark_pending(self, request, queryset):
+        self.update_tasks(request, queryset, "pending", is_completed=False)
+
+    def update_tasks(self, request, queryset, state, **changes):
+        # Large selections would hold the request for too long.
+        if queryset.count() > settings.JOB_BULK_UPDATE_THRESHOLD:
+            task_ids = list(queryset.order_by().values_list("pk", flat=True))
+            job = enqueue(
+                "tasks.bulk_update",
+                {
+                    "task_ids": task_ids,
+                    "changes": changes,
+                    "actor_id": request.user.pk,
+                },
+                user=request.user,
+            )
+            self.message_user(
+                request,
+                f"{len(task_ids)} task(s) will be marked {state} in the "
+                f"background (job #{job.pk}).",
+            )
+            return
+        updated = bulk_update_tasks(queryset, actor=request.user, **changes)
+        self.message_user(request, f"{updated} task(s) marked {state}.")
+
+
+@admin.register(ArchivedTask)
+class ArchivedTaskAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "name",
+        "task_type",
+        "priority",
+        "deadline",
+        "archived_at",
+    )
+    search_fields = ("name", "description",)
+    list_filter = ("archived_at", "priority", "task_type",)
+    list_select_related = ("task_type",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "name",
+        "status",
+        "progress",
+        "total",
+        "attempts",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "name",)
+    list_select_related = ("created_by",)
+    readonly_fields = [field.name for field in Job._meta.fields]
+    actions = ("retry",)
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Retry selected failed jobs")
+    def retry(self, request, queryset):
+        retried = queryset.filter(status=Job.STATUS_FAILED).update(
+            status=Job.STATUS_QUEUED,
+            attempts=0,
+            run_after=timezone.now(),
+            locked_by="",
+            finished_at=None,
+        )
+        self.message_user(request, f"{retried} job(s) queued again.")
@@ -0,0 +1,94 @@
+"""Moving old completed tasks out of ``Task`` into ``ArchivedTask``.
+
+Every filter, count and dashboard aggregate runs against ``Task``, so
+keeping years of finished work there slows down the pages people use.
+Archived tasks stay reachable by id from the detail views.
+"""
+import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.counters import reconcile_task_counts
+from core.hierarchy import detach
+from core.models import ArchivedTask, DataVersion, Task
+from core.signals import bulk_task_delete
+from core.sync import log_changes
+
+
+def archivable_tasks(older_than_days, today=None):
+    """Completed tasks whose deadline is more than ``older_than_days`` ago."""
+    if today is None:
+        today = timezone.localdate()
+    cutoff = today - datetime.timedelta(days=older_than_days)
+    return Task.objects.filter(is_completed=True, deadline__lt=cutoff)
+
+
+def archive_batch(task_ids):
+    """Move the completed tasks among ``task_ids`` in one transaction.
+
+    Returns the number of tasks archived.
+    """
+    with transaction.atomic():
+        rows = list(
+            Task.objects.filter(pk__in=task_ids, is_completed=True)
+            .select_for_update()
+            .order_by()
+            .values(*ArchivedTask.COPIED_FIELDS)
+        )
+        if not rows:
+            return 0
+        ids = [row["id"] for row in rows]
+        links = Task.assignees.through.objects.filter(task_id__in=ids)
+        link_rows = list(links.values_list("task_id", "worker_id"))
+
+        archived_at = timezone.now()
+        ArchivedTask.objects.bulk_create(
+            ArchivedTask(archived_at=archived_at, **row) for row in rows
+        )
+        ArchivedTask.assignees.through.objects.bulk_create(
+            ArchivedTask.assignees.through(
+                archivedtask_id=task_id, worker_id=worker_id
+            )
+            for task_id, worker_id in link_rows
+        )
+
+        links.delete()
+        # The effects of the per-task delete signals on the hierarchy,
+        # counters, change log and the data version are applied once
+        # here and below instead.
+        detach(ids)
+        with bulk_task_delete():
+            Task.objects.filter(pk__in=ids).delete()
+        log_changes(ids)
+
+        reconcile_task_counts(
+            worker_ids={worker_id for _, worker_id in link_rows}
+        )
+        DataVersion.bump(DataVersion.TASKS)
+    return len(rows)
+
+
+def archive_tasks(older_than_days, batch_size=500, today=None,
+                  progress=None):
+    """Archive every archivable task, ``batch_size`` per transaction.
+
+    Short transactions keep row locks brief, so the app stays usable
+    while a large backlog is moved. ``progress`` is called with the
+    running total after each batch. Returns the number of tasks archived.
+    """
+    candidates = (
+        archivable_tasks(older_than_days, today)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    archived = 0
+    last_id = 0
+    while True:
+        task_ids = list(candidates.filter(pk__gt=last_id)[:batch_size])
+        if not task_ids:
+            return archived
+        archived += archive_batch(task_ids)
+        last_id = task_ids[-1]
+        if progress is not None:
+            progress(archived)
@@ -0,0 +1,144 @@
+"""Buffered, append-only audit trail of task changes.
+
+Signal handlers describe each change as ``(field, old, new)`` and hand it
+to :func:`record`. Inside a request (see ``TaskAuditMiddleware``) or an
+explicit :func:`audit_context`, events are held in memory once their
+transaction commits and written with a single ``bulk_create`` when the
+context ends, or earlier every ``TASK_AUDIT_FLUSH_EVERY`` events.
+"""
+import contextlib
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import TaskAuditEvent, TaskType, Worker
+
+_current_buffer = ContextVar("task_audit_buffer", default=None)
+
+
+class AuditBuffer:
+    def __init__(self, actor=None, source=TaskAuditEvent.SOURCE_SYSTEM,
+                 flush_every=None):
+        self.actor = actor
+        self.source = source
+        self.flush_every = flush_every or getattr(
+            settings, "TASK_AUDIT_FLUSH_EVERY", 100
+        )
+        self.events = []
+        self.closed = False
+
+    def extend(self, events):
+        actor = self.actor
+        actor_id = actor.pk if actor and actor.is_authenticated else None
+        for event in events:
+            event.actor_id = actor_id
+            event.source = self.source
+        self.events.extend(events)
+        # An outer transaction may commit after the context has ended.
+        if self.closed or len(self.events) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self.events:
+            return
+        events, self.events = self.events, []
+        TaskAuditEvent.objects.bulk_create(events, batch_size=500)
+
+
+@contextlib.contextmanager
+def audit_context(actor=None, source=TaskAuditEvent.SOURCE_SYSTEM,
+                  flush_every=None):
+    buffer = AuditBuffer(actor, source, flush_every)
+    token = _current_buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _current_buffer.reset(token)
+        buffer.closed = True
+        buffer.flush()
+
+
+def record(task_id, changes):
+    """Queue ``(field, old, new)`` changes of one task for writing."""
+    if not getattr(settings, "TASK_AUDIT_ENABLED", True):
+        return
+    now = timezone.now()
+    events = [
+        TaskAuditEvent(
+            task_id=task_id,
+            field=field,
+            old_value=old,
+            new_value=new,
+            created_at=now,
+        )
+        for field, old, new in changes
+    ]
+    if not events:
+        return
+
+    buffer = _current_buffer.get()
+    if buffer is None:
+        transaction.on_commit(
+            lambda: TaskAuditEvent.objects.bulk_create(events)
+        )
+    else:
+        transaction.on_commit(lambda: buffer.extend(events))
+
+
+FIELD_NAMES = {
+    "is_completed": "status",
+    "task_type_id": "task_type",
+    "parent_id": "parent",
+}
+
+
+def display_value(attname, value):
+    if value is None:
+        return ""
+    if attname == "is_completed":
+        return "Completed" if value else "Pending"
+    if attname == "task_type_id":
+        name = TaskType.objects.filter(pk=value).values_list(
+            "name", flat=True
+        ).first()
+        return name or str(value)
+    if attname == "parent_id":
+        return f"#{value}"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def field_changes(changed_values):
+    """Turn ``Task.changed_tracked_values()`` into audit changes."""
+    return [
+        (
+            FIELD_NAMES.get(attname, attname),
+            display_value(attname, old),
+            display_value(attname, new),
+        )
+        for attname, (old, new) in changed_values.items()
+    ]
+
+
+def worker_name(first_name, last_name, username):
+    return f"{first_name} {last_name}".strip() or username
+
+
+def record_assignee_changes(task_ids, worker_ids, added):
+    """Record assignment changes between every task and every worker."""
+    if not task_ids or not worker_ids:
+        return
+    names = [
+        worker_name(*row)
+        for row in Worker.objects.filter(pk__in=worker_ids).values_list(
+            "first_name", "last_name", "username"
+        )
+    ]
+    for task_id in task_ids:
+        record(task_id, [
+            ("assignees", "", name) if added else ("assignees", name, "")
+            for name in names
+        ])
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from core.metrics import cache_lookup
+
+USER_CACHE_KEY = "auth:worker:{pk}"
+
+
+def user_cache_key(pk):
+    return USER_CACHE_KEY.format(pk=pk)
+
+
+def invalidate_cached_users(*pks):
+    cache.delete_many([user_cache_key(pk) for pk in pks])
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` that serves ``request.user`` from the cache.
+
+    The worker is cached with its position already joined, so rendering
+    it costs no queries. Entries are dropped whenever the worker or its
+    position is saved (see ``core.signals``).
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        cache_lookup("user", hit=user is not None)
+        if user is None:
+            user_model = get_user_model()
+            try:
+                user = user_model._default_manager.select_related(
+                    "position"
+                ).get(pk=user_id)
+            except user_model.DoesNotExist:
+                return None
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,37 @@
+"""Helpers shared by the ``benchmark_*`` management commands."""
+import contextlib
+import time
+
+from django.db import connection
+
+
+@contextlib.contextmanager
+def scratch_database():
+    """Run the block against a freshly migrated throwaway database.
+
+    Uses the same test database the test runner would create, so
+    benchmarks never touch real data.
+    """
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+@contextlib.contextmanager
+def measure():
+    """Yield a dict that receives ``seconds`` and ``queries`` on exit."""
+    result = {"queries": 0}
+
+    def count_queries(execute, sql, params, many, context):
+        result["queries"] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_queries):
+        start = time.perf_counter()
+        yield result
+        result["seconds"] = time.perf_counter() - start
@@ -0,0 +1,126 @@
+"""Kanban board of tasks: one column per priority of open tasks, plus one
+for completed tasks.
+
+The board shows the first ``TASK_BOARD_PAGE_SIZE`` cards of each column
+and its total, counted for all columns in one grouped query. Columns
+load further cards by keyset pagination on their ``(deadline, id)``
+ordering, so deep pages cost the same as the first. Open columns are
+read from ``core_task_board_idx``.
+"""
+import datetime
+
+from django.db.models import Count, Q, prefetch_related_objects
+
+from core.bulk import bulk_update_tasks
+from core.models import Task, TaskAuditEvent
+
+DONE = "done"
+
+
+class Column:
+    def __init__(self, key, label, condition, descending, changes):
+        self.key = key
+        self.label = label
+        self.condition = condition
+        # Open work is shown soonest deadline first, finished work most
+        # recent first.
+        self.descending = descending
+        # Applied to a task dropped into the column.
+        self.changes = changes
+
+    @property
+    def ordering(self):
+        if self.descending:
+            return ["-deadline", "-id"]
+        return ["deadline", "id"]
+
+    def after(self, cursor):
+        """``Q`` for the cards that follow ``cursor`` in this column."""
+        deadline, pk = cursor
+        # The outer bound lets the index seek straight to ``deadline``.
+        if self.descending:
+            return Q(deadline__lte=deadline) & (
+                Q(deadline__lt=deadline) | Q(pk__lt=pk)
+            )
+        return Q(deadline__gte=deadline) & (
+            Q(deadline__gt=deadline) | Q(pk__gt=pk)
+        )
+
+
+COLUMNS = [
+    Column(
+        priority, label,
+        Q(is_completed=False, priority_rank=Task.PRIORITY_RANKS[priority]),
+        descending=False,
+        changes={"is_completed": False, "priority": priority},
+    )
+    for priority, label in Task._meta.get_field("priority").choices
+] + [
+    Column(
+        DONE, "Completed",
+        Q(is_completed=True),
+        descending=True,
+        changes={"is_completed": True},
+    ),
+]
+COLUMNS_BY_KEY = {column.key: column for column in COLUMNS}
+
+
+def encode_cursor(task):
+    return f"{task.deadline.isoformat()}_{task.pk}"
+
+
+def decode_cursor(value):
+    """Return ``(deadline, id)`` for a cursor, or raise ``ValueError``."""
+    deadline, _, pk = value.partition("_")
+    return datetime.date.fromisoformat(deadline), int(pk)
+
+
+def column_counts(condition):
+    """Return ``{column key: count}`` of the tasks matching ``condition``.
+
+    Counted with the same ``Column.condition`` as the cards, so a header
+    never disagrees with its column.
+    """
+    return Task.objects.filter(condition).aggregate(**{
+        column.key: Count("pk", filter=column.condition)
+        for column in COLUMNS
+    })
+
+
+def column_page(column, condition, limit, cursor=None):
+    """Return up to ``limit`` cards of ``column`` after ``cursor``, and the
+    cursor of the next page (``None`` on the last one).
+
+    Assignees are not loaded; see :func:`load_assignees`.
+    """
+    condition = condition & column.condition
+    if cursor is not None:
+        condition &= column.after(cursor)
+    cards = list(
+        Task.objects.filter(condition)
+        .select_related("task_type")
+        .defer("description")
+        .order_by(*column.ordering)[:limit + 1]
+    )
+    if len(cards) > limit:
+        return cards[:limit], encode_cursor(cards[limit - 1])
+    return cards, None
+
+
+def load_assignees(cards):
+    """Prefetch assignees of cards from all columns in one query."""
+    prefetch_related_objects(cards, "assignees")
+
+
+def move_task(task_id, column, actor=None):
+    """Move a task into ``column`` with a single-row ``UPDATE``.
+
+    Returns the number of tasks moved (0 if the task does not exist).
+    """
+    return bulk_update_tasks(
+        Task.objects.filter(pk=task_id),
+        actor=actor,
+        source=TaskAuditEvent.SOURCE_WEB,
+        **column.changes,
+    )
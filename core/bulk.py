@@ -0,0 +1,69 @@
+"""Bulk edits of tasks that bypass ``save()`` but keep its side effects."""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core import audit
+from core.counters import reconcile_task_counts
+from core.deadlines import bucket_expression
+from core.models import DataVersion, Task, TaskAuditEvent
+from core.sync import log_changes
+
+
+def bulk_update_tasks(queryset, actor=None,
+                      source=TaskAuditEvent.SOURCE_BULK, **changes):
+    """Apply literal ``changes`` to every task in ``queryset``.
+
+    Runs a single ``UPDATE`` and then restores what per-row saves would
+    have done: deadline buckets, ``updated_at`` and ``version``, the
+    change log, worker counters, the data version and audit events
+    (recorded with ``source``). Returns the number of tasks updated.
+    """
+    attnames = {
+        Task._meta.get_field(name).attname: value
+        for name, value in changes.items()
+    }
+    if "parent_id" in attnames:
+        # Moves relink whole subtrees; see ``core.hierarchy.move``.
+        raise ValueError("Tasks cannot be moved with a bulk edit")
+    tracked = [name for name in attnames if name in Task.TRACKED_FIELDS]
+
+    bulk_audit = audit.audit_context(actor=actor, source=source)
+    with bulk_audit, transaction.atomic():
+        before = list(
+            queryset.select_for_update().values("pk", *tracked).order_by()
+        )
+        if not before:
+            return 0
+        task_ids = [row["pk"] for row in before]
+        tasks = Task.objects.filter(pk__in=task_ids)
+
+        updates = dict(
+            attnames, updated_at=timezone.now(), version=F("version") + 1
+        )
+        if "priority" in attnames:
+            updates["priority_rank"] = Task.PRIORITY_RANKS[
+                attnames["priority"]
+            ]
+        if "deadline" in attnames or "is_completed" in attnames:
+            updates["deadline_bucket"] = bucket_expression(
+                timezone.localdate()
+            )
+        updated = tasks.update(**updates)
+        log_changes(task_ids)
+
+        if "is_completed" in attnames:
+            reconcile_task_counts(
+                worker_ids=Task.assignees.through.objects.filter(
+                    task_id__in=task_ids
+                ).values("worker_id")
+            )
+        DataVersion.bump(DataVersion.TASKS)
+
+        for row in before:
+            audit.record(row["pk"], audit.field_changes({
+                attname: (row[attname], attnames[attname])
+                for attname in tracked
+                if row[attname] != attnames[attname]
+            }))
+    return updated
@@ -0,0 +1,55 @@
+"""System checks for settings the app relies on."""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.checks import Error, register
+
+CACHED_SESSION_ENGINE = "core.sessions"
+CACHED_AUTH_BACKEND = "core.backends.CachedModelBackend"
+
+
+def _process_local(alias):
+    backend = settings.CACHES.get(alias, {}).get("BACKEND")
+    return backend in settings.PROCESS_LOCAL_CACHE_BACKENDS
+
+
+@register()
+def check_auth_cache(app_configs, **kwargs):
+    """Cached sessions and users need a cache every worker shares."""
+    errors = []
+    if (settings.SESSION_ENGINE == CACHED_SESSION_ENGINE
+            and _process_local(settings.SESSION_CACHE_ALIAS)):
+        errors.append(Error(
+            f"SESSION_ENGINE {CACHED_SESSION_ENGINE!r} needs a shared "
+            f"cache, but the {settings.SESSION_CACHE_ALIAS!r} cache is "
+            f"local to each process.",
+            hint="Configure Redis or Memcached (CACHE_BACKEND), or use "
+                 "django.contrib.sessions.backends.db.",
+            id="core.E001",
+        ))
+    if (CACHED_AUTH_BACKEND in settings.AUTHENTICATION_BACKENDS
+            and _process_local("default")):
+        errors.append(Error(
+            f"{CACHED_AUTH_BACKEND} needs a shared cache, but the "
+            f"'default' cache is local to each process.",
+            hint="Configure Redis or Memcached (CACHE_BACKEND), or use "
+                 "django.contrib.auth.backends.ModelBackend.",
+            id="core.E002",
+        ))
+    return errors
+
+
+@register(deploy=True)
+def check_asset_bundles(app_configs, **kwargs):
+    """Pages load the bundles ``build_assets`` writes, not their sources."""
+    output_dir = Path(settings.ASSET_BUNDLES_OUTPUT_DIR)
+    return [
+        Error(
+            f"Asset bundle {name!r} has not been built.",
+            hint="Run `python manage.py build_assets` before "
+                 "collectstatic.",
+            id="core.E003",
+        )
+        for name in settings.ASSET_BUNDLES
+        if not (output_dir / name).exists()
+    ]
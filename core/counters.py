@@ -0,0 +1,85 @@
+"""Maintenance of the task counters denormalized onto ``Worker``."""
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+
+from core.models import Task, Worker
+
+
+def _shift(field, delta):
+    if delta >= 0:
+        return F(field) + delta
+    return Greatest(F(field) + delta, 0)
+
+
+def adjust_task_counts(worker_ids, open_delta=0, completed_delta=0):
+    """Atomically shift the counters of ``worker_ids`` by the deltas."""
+    if not worker_ids or not (open_delta or completed_delta):
+        return
+    changes = {}
+    if open_delta:
+        changes["open_task_count"] = _shift("open_task_count", open_delta)
+    if completed_delta:
+        changes["completed_task_count"] = _shift(
+            "completed_task_count", completed_delta
+        )
+    Worker.objects.filter(pk__in=worker_ids).update(**changes)
+
+
+def task_assigned(task, worker_ids, sign=1):
+    if task.is_completed:
+        adjust_task_counts(worker_ids, completed_delta=sign)
+    else:
+        adjust_task_counts(worker_ids, open_delta=sign)
+
+
+def worker_assigned(worker, task_ids, sign=1):
+    totals = Task.objects.filter(pk__in=task_ids).aggregate(
+        open=Count("pk", filter=Q(is_completed=False)),
+        completed=Count("pk", filter=Q(is_completed=True)),
+    )
+    adjust_task_counts(
+        [worker.pk],
+        open_delta=sign * totals["open"],
+        completed_delta=sign * totals["completed"],
+    )
+
+
+def completion_toggled(task):
+    delta = 1 if task.is_completed else -1
+    Worker.objects.filter(tasks=task).update(
+        open_task_count=_shift("open_task_count", -delta),
+        completed_task_count=_shift("completed_task_count", delta),
+    )
+
+
+def reconcile_task_counts(worker_ids=None, dry_run=False):
+    """Recount workers from the assignment table and fix drift.
+
+    Every worker is checked unless ``worker_ids`` narrows it down.
+
+    Returns the number of workers whose stored counters were wrong.
+    Increments that land between the recount and the write are lost, so
+    run it when the app is quiet (e.g. from a nightly cron job).
+    """
+    actual = Worker.objects.annotate(
+        actual_open=Count("tasks", filter=Q(tasks__is_completed=False)),
+        actual_completed=Count("tasks", filter=Q(tasks__is_completed=True)),
+    ).only("pk", "open_task_count", "completed_task_count")
+    if worker_ids is not None:
+        actual = actual.filter(pk__in=worker_ids)
+
+    drifted = []
+    for worker in actual.iterator(chunk_size=2000):
+        if (worker.open_task_count != worker.actual_open
+                or worker.completed_task_count != worker.actual_completed):
+            worker.open_task_count = worker.actual_open
+            worker.completed_task_count = worker.actual_completed
+            drifted.append(worker)
+
+    if drifted and not dry_run:
+        Worker.objects.bulk_update(
+            drifted,
+            ["open_task_count", "completed_task_count"],
+            batch_size=500,
+        )
+    return len(drifted)
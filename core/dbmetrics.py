@@ -0,0 +1,66 @@
+"""Per-process query counters broken down by database alias."""
+import contextlib
+import contextvars
+import threading
+import time
+from collections import defaultdict
+
+from core import metrics
+
+_lock = threading.Lock()
+_totals = defaultdict(lambda: {"queries": 0, "errors": 0, "seconds": 0.0})
+
+# Per-request tally, set by ``track_queries``.
+_tracked = contextvars.ContextVar("tracked_queries", default=None)
+
+
+class QueryMetrics:
+    """``execute_wrapper`` that accumulates query count and time."""
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        failed = False
+        try:
+            return execute(sql, params, many, context)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with _lock:
+                totals = _totals[self.alias]
+                totals["queries"] += 1
+                totals["seconds"] += elapsed
+                totals["errors"] += failed
+            metrics.QUERY_LATENCY.labels(self.alias).observe(elapsed)
+            if failed:
+                metrics.QUERY_ERRORS.labels(self.alias).inc()
+            tracked = _tracked.get()
+            if tracked is not None:
+                tracked["queries"] += 1
+                tracked["seconds"] += elapsed
+
+
+def install(connection):
+    if not any(isinstance(wrapper, QueryMetrics)
+               for wrapper in connection.execute_wrappers):
+        connection.execute_wrappers.append(QueryMetrics(connection.alias))
+
+
+def snapshot():
+    with _lock:
+        return {alias: dict(totals) for alias, totals in _totals.items()}
+
+
+@contextlib.contextmanager
+def track_queries():
+    """Yield a dict counting ``queries`` and ``seconds`` run in the block."""
+    tracked = {"queries": 0, "seconds": 0.0}
+    token = _tracked.set(tracked)
+    try:
+        yield tracked
+    finally:
+        _tracked.reset(token)
@@ -0,0 +1,113 @@
+"""Deadline horizons precomputed into ``Task.deadline_bucket``.
+
+Buckets are assigned on save and shifted once a day by the
+``bucket_deadlines`` command. Until that command has run for the current
+date, the helpers below fall back to comparing deadlines directly.
+"""
+import datetime
+
+from django.db.models import Case, Q, Value, When
+from django.utils import timezone
+
+from core.models import DataVersion, Task
+
+BUCKETS_KEY = "deadline_buckets"
+
+DEADLINE_FILTER_BUCKETS = {
+    "today": [Task.BUCKET_TODAY],
+    "next_3_days": [Task.BUCKET_TODAY, Task.BUCKET_NEXT_3_DAYS],
+    "next_week": [
+        Task.BUCKET_TODAY,
+        Task.BUCKET_NEXT_3_DAYS,
+        Task.BUCKET_NEXT_WEEK,
+    ],
+    "overdue": [Task.BUCKET_OVERDUE],
+}
+
+
+def bucket_expression(today):
+    """SQL counterpart of ``Task.compute_deadline_bucket``."""
+    return Case(
+        When(
+            deadline__lt=today,
+            is_completed=False,
+            then=Value(Task.BUCKET_OVERDUE),
+        ),
+        When(deadline__lt=today, then=Value(Task.BUCKET_PAST)),
+        When(deadline=today, then=Value(Task.BUCKET_TODAY)),
+        When(
+            deadline__lte=today + datetime.timedelta(days=3),
+            then=Value(Task.BUCKET_NEXT_3_DAYS),
+        ),
+        When(
+            deadline__lte=today + datetime.timedelta(days=7),
+            then=Value(Task.BUCKET_NEXT_WEEK),
+        ),
+        default=Value(Task.BUCKET_LATER),
+    )
+
+
+def rebucket_tasks(today=None, full=False):
+    """Move tasks into the horizons for ``today``.
+
+    Past and overdue buckets never change with time, and anything due
+    more than a week ahead stays in "later", so only the rows in between
+    are rewritten unless ``full`` is set. Returns the number of rows
+    updated.
+    """
+    if today is None:
+        today = timezone.localdate()
+    tasks = Task.objects.all()
+    if not full:
+        tasks = tasks.filter(
+            deadline__lte=today + datetime.timedelta(days=7)
+        ).exclude(
+            deadline_bucket__in=[Task.BUCKET_PAST, Task.BUCKET_OVERDUE]
+        )
+    updated = tasks.update(deadline_bucket=bucket_expression(today))
+
+    DataVersion.objects.update_or_create(
+        key=BUCKETS_KEY,
+        defaults={
+            "version": today.toordinal(),
+            "updated_at": timezone.now(),
+        },
+    )
+    if updated:
+        DataVersion.bump(DataVersion.TASKS)
+    return updated
+
+
+def buckets_are_current(today=None):
+    if today is None:
+        today = timezone.localdate()
+    return DataVersion.objects.filter(
+        key=BUCKETS_KEY,
+        version=today.toordinal(),
+    ).exists()
+
+
+def deadline_q(deadline_filter, today=None, use_buckets=None):
+    """Return a ``Q`` for one of ``TaskFilterForm.DEADLINE_CHOICES``."""
+    if deadline_filter not in DEADLINE_FILTER_BUCKETS:
+        return Q()
+    if today is None:
+        today = timezone.localdate()
+    if use_buckets is None:
+        use_buckets = buckets_are_current(today)
+
+    if use_buckets:
+        buckets = DEADLINE_FILTER_BUCKETS[deadline_filter]
+        if len(buckets) == 1:
+            return Q(deadline_bucket=buckets[0])
+        return Q(deadline_bucket__in=buckets)
+
+    if deadline_filter == "today":
+        return Q(deadline=today)
+    if deadline_filter == "overdue":
+        return Q(deadline__lt=today, is_completed=False)
+    days = 3 if deadline_filter == "next_3_days" else 7
+    return Q(
+        deadline__gte=today,
+        deadline__lte=today + datetime.timedelta(days=days),
+    )
@@ -0,0 +1,133 @@
+"""Daily email digests of overdue and soon-due tasks, one per worker.
+
+All digests come from one query over the assignment table, ordered by
+worker, so the number of queries does not grow with the team. The
+template is loaded once, and messages go out in batches of
+``DIGEST_BATCH_SIZE`` over a single mail connection.
+"""
+import datetime
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import get_template
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import DataVersion, Task
+
+DIGESTS_KEY = "deadline_digests"
+TEMPLATE_NAME = "emails/deadline_digest.txt"
+
+_COLUMNS = (
+    "worker_id",
+    "worker__email",
+    "worker__first_name",
+    "worker__username",
+    "task_id",
+    "task__name",
+    "task__deadline",
+    "task__priority",
+)
+
+
+class AlreadySent(Exception):
+    """Today's digests have already gone out."""
+
+
+def digest_links(today, due_within):
+    """Assignment rows of open tasks that belong in today's digests."""
+    return Task.assignees.through.objects.filter(
+        worker__is_active=True,
+        task__is_completed=False,
+        task__deadline__lte=today + datetime.timedelta(days=due_within),
+    ).exclude(worker__email="").order_by(
+        "worker_id", "task__deadline", "task_id"
+    ).values_list(*_COLUMNS)
+
+
+def build_digests(today=None, due_within=None):
+    """Yield ``(email, context)`` for every worker with tasks to report."""
+    if today is None:
+        today = timezone.localdate()
+    if due_within is None:
+        due_within = settings.DIGEST_DUE_WITHIN_DAYS
+    rows = digest_links(today, due_within).iterator(chunk_size=2000)
+
+    for _, worker_rows in groupby(rows, key=lambda row: row[0]):
+        overdue, due_soon = [], []
+        for row in worker_rows:
+            (_, email, first_name, username,
+             task_id, name, deadline, priority) = row
+            task = {
+                "name": name,
+                "deadline": deadline,
+                "priority": priority,
+                "url": settings.SITE_URL + reverse(
+                    "core:task-detail", args=[task_id]
+                ),
+            }
+            (overdue if deadline < today else due_soon).append(task)
+        yield email, {
+            "name": first_name or username,
+            "today": today,
+            "due_within": due_within,
+            "overdue": overdue,
+            "due_soon": due_soon,
+        }
+
+
+def digest_subject(context):
+    parts = []
+    if context["overdue"]:
+        parts.append(f"{len(context['overdue'])} overdue")
+    if context["due_soon"]:
+        parts.append(f"{len(context['due_soon'])} due soon")
+    return f"Pulseboard: {', '.join(parts)} task(s)"
+
+
+def already_sent(today):
+    return DataVersion.objects.filter(
+        key=DIGESTS_KEY, version=today.toordinal()
+    ).exists()
+
+
+def send_deadline_digests(today=None, due_within=None, batch_size=None,
+                          connection=None, progress=None, force=False):
+    """Send today's digests and return the number of messages sent.
+
+    ``progress`` is called with the running total after each batch.
+    Raises ``AlreadySent`` if they were sent today, unless ``force``.
+    """
+    if today is None:
+        today = timezone.localdate()
+    if not force and already_sent(today):
+        raise AlreadySent
+    if batch_size is None:
+        batch_size = settings.DIGEST_BATCH_SIZE
+    template = get_template(TEMPLATE_NAME)
+    connection = connection or get_connection()
+
+    sent = 0
+    batch = []
+    with connection:
+        for email, context in build_digests(today, due_within):
+            batch.append(EmailMessage(
+                subject=digest_subject(context),
+                body=template.render(context),
+                to=[email],
+                connection=connection,
+            ))
+            if len(batch) >= batch_size:
+                sent += connection.send_messages(batch) or 0
+                batch = []
+                if progress is not None:
+                    progress(sent)
+        if batch:
+            sent += connection.send_messages(batch) or 0
+
+    DataVersion.objects.update_or_create(
+        key=DIGESTS_KEY,
+        defaults={"version": today.toordinal(), "updated_at": timezone.now()},
+    )
+    return sent
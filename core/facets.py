@@ -0,0 +1,97 @@
+"""Counts shown next to each task list filter option.
+
+Every group is counted with all other active filters applied but not its
+own, so the number next to an option is what selecting it would return.
+Each group costs one conditional-aggregation or grouping query. Results
+are cached per normalized filter set and tasks data version.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from core.deadlines import (
+    DEADLINE_FILTER_BUCKETS,
+    buckets_are_current,
+    deadline_q,
+)
+from core.filters import task_filter_q
+from core.metrics import cache_lookup
+from core.models import Task
+
+FACETS_CACHE_KEY = "task-facets:{digest}"
+
+
+def facets_cache_key(filters, version, today):
+    payload = json.dumps(
+        [filters, version, today.isoformat()], sort_keys=True
+    )
+    return FACETS_CACHE_KEY.format(
+        digest=hashlib.sha1(payload.encode()).hexdigest()
+    )
+
+
+def task_facets(filters, version, today=None):
+    """Return ``{group: {choice value: count}}`` for ``filters``.
+
+    ``version`` is the current ``DataVersion.TASKS`` counter; any change
+    to tasks or assignments makes cached counts unreachable.
+    """
+    if today is None:
+        today = timezone.localdate()
+    key = facets_cache_key(filters, version, today)
+    facets = cache.get(key)
+    cache_lookup("facets", hit=facets is not None)
+    if facets is None:
+        facets = count_facets(filters, today)
+        cache.set(key, facets, settings.TASK_FACET_CACHE_TIMEOUT)
+    return facets
+
+
+def count_facets(filters, today):
+    use_buckets = buckets_are_current(today)
+
+    def tasks_without(group):
+        others = {key: value for key, value in filters.items()
+                  if key != group}
+        return Task.objects.filter(
+            task_filter_q(others, today, use_buckets)
+        ).order_by()
+
+    status = tasks_without("status").aggregate(
+        completed=Count("pk", filter=Q(is_completed=True)),
+        pending=Count("pk", filter=Q(is_completed=False)),
+    )
+    priority = tasks_without("priority").aggregate(**{
+        value: Count("pk", filter=Q(priority=value))
+        for value, _ in Task._meta.get_field("priority").choices
+    })
+    deadline = tasks_without("deadline_filter").aggregate(**{
+        value: Count("pk", filter=deadline_q(value, today, use_buckets))
+        for value in DEADLINE_FILTER_BUCKETS
+    })
+    task_type = (
+        tasks_without("task_type")
+        .filter(task_type__isnull=False)
+        .values_list("task_type_id")
+        .annotate(count=Count("pk"))
+    )
+    assignee = (
+        Task.assignees.through.objects
+        .filter(task__in=tasks_without("assignee").values("pk"))
+        .values_list("worker_id")
+        .annotate(count=Count("task_id"))
+        .order_by("-count", "worker_id")
+        [:settings.TASK_FACET_TOP_ASSIGNEES]
+    )
+
+    return {
+        "status": status,
+        "priority": priority,
+        "deadline_filter": deadline,
+        "task_type": {str(pk): count for pk, count in task_type},
+        "assignee": {str(pk): count for pk, count in assignee},
+    }
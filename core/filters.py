@@ -0,0 +1,73 @@
+"""Task list filters shared by the list view and its facet counts."""
+from django.db.models import Q
+
+from core.deadlines import deadline_q
+from core.models import Task, Worker
+from core.search import search_workers
+
+FILTER_KEYS = (
+    "search",
+    "status",
+    "priority",
+    "task_type",
+    "deadline_filter",
+    "assignee",
+)
+
+# Filters that take a primary key. ``assignee`` takes a worker id or a
+# name, which is looked up with ``core.search``.
+ID_FILTER_KEYS = ("task_type",)
+
+
+def normalized_filters(params):
+    """Return ``{key: value}`` for the filters in ``params`` that narrow
+    the list, dropping blanks, "all" and malformed ids."""
+    filters = {}
+    for key in FILTER_KEYS:
+        value = (params.get(key) or "").strip()
+        if not value or value == "all":
+            continue
+        if key in ID_FILTER_KEYS and not value.isdigit():
+            continue
+        filters[key] = value
+    return filters
+
+
+def task_filter_q(filters, today=None, use_buckets=None):
+    """Return a ``Q`` matching the tasks selected by ``filters``."""
+    condition = Q()
+
+    search = filters.get("search")
+    if search:
+        condition &= (
+            Q(name__icontains=search) | Q(description__icontains=search)
+        )
+
+    status = filters.get("status")
+    if status == "completed":
+        condition &= Q(is_completed=True)
+    elif status == "pending":
+        condition &= Q(is_completed=False)
+
+    if "priority" in filters:
+        condition &= Q(priority=filters["priority"])
+
+    if "task_type" in filters:
+        condition &= Q(task_type_id=filters["task_type"])
+
+    if "deadline_filter" in filters:
+        condition &= deadline_q(filters["deadline_filter"], today, use_buckets)
+
+    # A subquery rather than a join, so that no ``distinct()`` is needed.
+    assignee = filters.get("assignee")
+    if assignee:
+        links = Task.assignees.through.objects
+        if assignee.isdigit():
+            links = links.filter(worker_id=assignee)
+        else:
+            links = links.filter(worker__in=search_workers(
+                Worker.objects.all(), assignee
+            ).values("pk"))
+        condition &= Q(pk__in=links.values("task_id"))
+
+    return condition
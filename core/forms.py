@@ -4,8 +4,10 @@ from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.password_validation import (
     password_validators_help_text_html
 )
+from django.db import transaction
 from django.utils.safestring import mark_safe
 
+from core import jobs
 from core.models import Task, TaskType, Position
 
 User = get_user_model()
@@ -118,16 +120,110 @@ class TaskFilterForm(forms.Form):
             assignee_choices.append((str(worker.id), display_name))
         self.fields["assignee"].choices = assignee_choices
 
+    # Facets that only hold the top options; the rest get no count.
+    PARTIAL_FACETS = ("assignee",)
 
-class TaskForm(forms.ModelForm):
+    def show_counts(self, facets):
+        """Append the counts from ``core.facets`` to the option labels."""
+        for name, counts in facets.items():
+            field = self.fields[name]
+            choices = []
+            for value, label in field.choices:
+                if value == "all":
+                    pass
+                elif value in counts:
+                    label = f"{label} ({counts[value]})"
+                elif name not in self.PARTIAL_FACETS:
+                    label = f"{label} (0)"
+                choices.append((value, label))
+            field.choices = choices
+
+
+TASK_CONFLICT_MESSAGE = (
+    "Someone else changed this task while you were editing it, so your "
+    "changes were not saved. Reload the page to see the latest version."
+)
+
+
+class VersionedTaskForm(forms.ModelForm):
+    """Task form carrying the ``version`` it was rendered with.
+
+    Edits write only the fields that changed, as a compare-and-swap on
+    that version, so concurrent edits are reported instead of silently
+    overwriting each other. The version itself is not editable; it
+    travels in the hidden ``expected_version`` field.
+    """
+
+    expected_version = forms.IntegerField(
+        min_value=1, required=False, widget=forms.HiddenInput()
+    )
+
+    # Tasks whose save already hit a ``VersionConflict`` in this request.
+    conflicted_task_ids = frozenset()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.instance._state.adding:
+            self.fields["expected_version"].required = True
+            self.initial["expected_version"] = self.instance.version
+
+    def edited_fields(self):
+        return [
+            name for name in self.changed_data if name != "expected_version"
+        ]
+
+    def clean(self):
+        cleaned_data = super().clean()
+        # Bound forms start from the stored task, so a changed version
+        # means the task moved on since the form was rendered.
+        if self.instance.pk in self.conflicted_task_ids or (
+                not self.instance._state.adding
+                and "expected_version" in self.changed_data
+                and self.edited_fields()):
+            raise forms.ValidationError(
+                TASK_CONFLICT_MESSAGE, code="conflict"
+            )
+        return cleaned_data
+
+    def save_edits(self):
+        """Write the edited fields of an existing task.
+
+        Raises ``VersionConflict`` if the task changed after validation.
+        """
+        edited = self.edited_fields()
+        if not edited:
+            return
+        columns = [
+            name for name in edited
+            if not Task._meta.get_field(name).many_to_many
+        ]
+        with transaction.atomic():
+            self.instance.save(
+                update_fields=columns,
+                expected_version=self.cleaned_data["expected_version"],
+            )
+            if "assignees" in edited:
+                # ``set()`` only adds and removes the difference.
+                self.instance.assignees.set(self.cleaned_data["assignees"])
+
+
+class TaskForm(VersionedTaskForm):
     class Meta:
         model = Task
         fields = "__all__"
         widgets = {
             "assignees": forms.CheckboxSelectMultiple(),
-            "deadline": forms.DateInput(attrs={"type": "date"})
+            "deadline": forms.DateInput(attrs={"type": "date"}),
+            # An id rather than a list of every task.
+            "parent": forms.NumberInput(attrs={"placeholder": "Task ID"}),
         }
 
+    def save(self, commit=True):
+        if self.instance._state.adding or not commit:
+            return super().save(commit)
+        self.save_edits()
+        return self.instance
+
 
 class WorkerSearchForm(forms.Form):
     search = forms.CharField(
@@ -155,7 +251,36 @@ class WorkerFilterForm(forms.Form):
         self.fields["position"].choices = position_choices
 
 
+class JobEnqueueForm(forms.Form):
+    name = forms.ChoiceField(
+        choices=jobs.menu,
+        widget=forms.Select(attrs={"class": "form-select"})
+    )
+
+
 class WorkerUpdateForm(forms.ModelForm):
     class Meta:
         model = User
         fields = ("first_name", "last_name", "username", "email", "position")
+
+
+class TaskStatsTrendForm(forms.Form):
+    start = forms.DateField()
+    end = forms.DateField()
+    worker = forms.ModelChoiceField(
+        queryset=User.objects.all(),
+        required=False,
+    )
+    points = forms.IntegerField(
+        min_value=2,
+        max_value=366,
+        required=False,
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start = cleaned_data.get("start")
+        end = cleaned_data.get("end")
+        if start and end and start > end:
+            raise forms.ValidationError("Start date must not be after end.")
+        return cleaned_data
@@ -0,0 +1,124 @@
+"""Parent and child tasks, kept as a closure table.
+
+``TaskClosure`` has a row for every task and each of its ancestors, so
+the whole subtree of a task, or its path up to the top, is one indexed
+query at any depth, and subtree rollups are one aggregate. Top-level
+tasks have no rows at all, which is why tasks created in bulk need no
+bookkeeping.
+
+Rows follow ``Task.parent`` from signal handlers: a new subtask and a
+moved subtree are linked to all of their new ancestors with one
+``bulk_create``, and removed tasks are cut out with a few deletes,
+however many tasks sit below them.
+"""
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from core.models import Task, TaskClosure
+from core.sync import log_changes
+
+BATCH_SIZE = 1000
+
+
+def ancestors(task):
+    """Return the ancestors of ``task``, top-level task first."""
+    return [
+        link.ancestor
+        for link in TaskClosure.objects.filter(descendant=task)
+        .select_related("ancestor").order_by("-depth")
+    ]
+
+
+def descendants(task):
+    """Tasks anywhere below ``task``."""
+    return Task.objects.filter(ancestor_links__ancestor=task)
+
+
+def subtree_progress(task):
+    """Return the number of tasks below ``task`` and of completed ones."""
+    totals = TaskClosure.objects.filter(ancestor=task).aggregate(
+        total=Count("pk"),
+        completed=Count("pk", filter=Q(descendant__is_completed=True)),
+    )
+    return totals["total"], totals["completed"]
+
+
+def _subtree(task_id):
+    """``(id, depth below task_id)`` of the task and its descendants."""
+    return [(task_id, 0), *TaskClosure.objects.filter(
+        ancestor_id=task_id
+    ).values_list("descendant_id", "depth")]
+
+
+def attach(task_id, parent_id, subtree=None):
+    """Link the subtree of ``task_id`` to ``parent_id`` and everything
+    above it. The subtree must not have ancestors yet."""
+    if parent_id is None:
+        return
+    if subtree is None:
+        subtree = _subtree(task_id)
+    above = [(parent_id, 1), *(
+        (ancestor_id, depth + 1)
+        for ancestor_id, depth in TaskClosure.objects.filter(
+            descendant_id=parent_id
+        ).values_list("ancestor_id", "depth")
+    )]
+    TaskClosure.objects.bulk_create(
+        (
+            TaskClosure(
+                ancestor_id=ancestor_id,
+                descendant_id=descendant_id,
+                depth=up + down,
+            )
+            for ancestor_id, up in above
+            for descendant_id, down in subtree
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+def move(task_id, parent_id):
+    """Re-link the subtree of ``task_id`` below ``parent_id``, or make it
+    top-level if that is ``None``. Links inside the subtree are kept."""
+    subtree = _subtree(task_id)
+    inside = [pk for pk, _ in subtree]
+    TaskClosure.objects.filter(descendant_id__in=inside).exclude(
+        ancestor_id__in=inside
+    ).delete()
+    attach(task_id, parent_id, subtree)
+
+
+def detach(task_ids):
+    """Cut tasks that are about to be removed out of the hierarchy.
+
+    Their subtasks become top-level tasks; ``parent`` is cleared, and
+    they are marked as changed for ``core.sync``. Returns the number of
+    subtasks cleared.
+    """
+    # Paths from above a removed task to below it; only tasks with both
+    # a parent and subtasks have them.
+    middles = Task.objects.filter(
+        pk__in=task_ids, parent__isnull=False, subtasks__isnull=False
+    ).values_list("pk", flat=True).distinct()
+    for pk in list(middles):
+        TaskClosure.objects.filter(
+            ancestor_id__in=TaskClosure.objects.filter(
+                descendant_id=pk
+            ).values("ancestor_id"),
+            descendant_id__in=TaskClosure.objects.filter(
+                ancestor_id=pk
+            ).values("descendant_id"),
+        ).delete()
+    TaskClosure.objects.filter(
+        Q(ancestor_id__in=task_ids) | Q(descendant_id__in=task_ids)
+    ).delete()
+    subtask_ids = list(
+        Task.objects.filter(parent_id__in=task_ids).exclude(
+            pk__in=task_ids
+        ).values_list("pk", flat=True)
+    )
+    Task.objects.filter(pk__in=subtask_ids).update(
+        parent=None, updated_at=timezone.now(), version=F("version") + 1
+    )
+    log_changes(subtask_ids)
+    return len(subtask_ids)
@@ -0,0 +1,113 @@
+"""iCalendar (RFC 5545) feeds of open task deadlines.
+
+Calendar apps subscribe with a per-worker token and poll every few
+minutes. The ETag of a feed is derived from the tasks data version, so
+an unchanged feed is answered with ``304 Not Modified`` after two small
+lookups. A changed feed is streamed in chunks from a column-limited
+``.iterator()`` and is never held in memory as a whole.
+"""
+import datetime
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.urls import reverse
+
+from core.models import Task
+
+SCOPE_WORKER = "worker"
+SCOPE_TEAM = "team"
+
+# RFC 5545 PRIORITY: 1 is the highest, 9 the lowest.
+PRIORITIES = {"urgent": 1, "high": 3, "medium": 5, "low": 7}
+
+_COLUMNS = ("pk", "name", "deadline", "priority")
+
+
+def new_token():
+    return secrets.token_urlsafe(24)
+
+
+def feed_tasks(scope, worker=None):
+    tasks = Task.objects.filter(is_completed=False)
+    if scope == SCOPE_WORKER:
+        tasks = tasks.filter(
+            pk__in=Task.assignees.through.objects.filter(
+                worker=worker
+            ).values("task_id")
+        )
+    return tasks.order_by("deadline", "pk").values_list(*_COLUMNS)
+
+
+def feed_etag(scope, worker, name, tasks_version):
+    parts = [scope, str(worker.pk), name, str(tasks_version)]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+def escape(text):
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Split a content line into 75-octet pieces, CRLF terminated."""
+    data = line.encode()
+    if len(data) <= 75:
+        return line + "\r\n"
+    pieces = []
+    start = 0
+    limit = 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Never split a multi-byte character.
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        pieces.append(data[start:end].decode())
+        start = end
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(pieces) + "\r\n"
+
+
+def render_feed(rows, name, stamp, chunk_size=200):
+    """Yield the calendar in chunks of ``chunk_size`` events.
+
+    ``stamp`` (the time the data last changed) is used as DTSTAMP, so
+    the same data always renders to the same bytes.
+    """
+    host = settings.SITE_URL.split("://")[-1]
+    dtstamp = stamp.astimezone(datetime.timezone.utc).strftime(
+        "%Y%m%dT%H%M%SZ"
+    )
+
+    yield "".join(fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Pulseboard//Task deadlines//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape(name)}",
+    ))
+    chunk = []
+    for pk, task_name, deadline, priority in rows:
+        url = settings.SITE_URL + reverse("core:task-detail", args=[pk])
+        chunk.extend(fold(line) for line in (
+            "BEGIN:VEVENT",
+            f"UID:task-{pk}@{host}",
+            f"DTSTAMP:{dtstamp}",
+            f"DTSTART;VALUE=DATE:{deadline:%Y%m%d}",
+            f"SUMMARY:{escape(task_name)}",
+            f"PRIORITY:{PRIORITIES.get(priority, 0)}",
+            f"URL:{url}",
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        ))
+        if len(chunk) >= chunk_size * 9:
+            yield "".join(chunk)
+            chunk = []
+    chunk.append("END:VCALENDAR\r\n")
+    yield "".join(chunk)
@@ -0,0 +1,369 @@
+"""A database-backed queue for work that is too slow for a request.
+
+Views and admin actions call :func:`enqueue` and return at once.
+``manage.py run_workers`` claims queued jobs and runs the handler
+registered under the job's name with :func:`job`. Claims use
+``SELECT ... FOR UPDATE SKIP LOCKED`` where the database supports it, so
+any number of workers can poll the same table without waiting on each
+other. Nothing but the database is needed.
+"""
+import datetime
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.db import (
+    DatabaseError,
+    close_old_connections,
+    connections,
+    router,
+    transaction,
+)
+from django.db.models import F
+from django.utils import timezone
+
+from core import metrics
+from core.archive import archive_tasks, archivable_tasks
+from core.bulk import bulk_update_tasks
+from core.counters import reconcile_task_counts
+from core.deadlines import rebucket_tasks
+from core.digests import AlreadySent, send_deadline_digests
+from core.models import Job, Task, Worker
+from core.stats import take_snapshot
+from core.sync import prune_change_log
+
+logger = logging.getLogger(__name__)
+
+# Queued jobs a worker tries per poll where rows cannot be locked.
+CLAIM_CANDIDATES = 5
+
+_handlers = {}
+
+
+def job(name, label=None):
+    """Register the decorated function as the handler for ``name``.
+
+    Handlers receive a :class:`JobContext` and the job's payload as
+    keyword arguments; their return value is stored as the result and
+    must be JSON serializable. ``label`` offers the job on the status
+    page to staff users; such handlers must not require a payload.
+    """
+    def decorator(func):
+        _handlers[name] = func
+        func.job_label = label
+        return func
+    return decorator
+
+
+def menu():
+    """Return ``(name, label)`` pairs of the jobs staff can start."""
+    return [
+        (name, func.job_label)
+        for name, func in _handlers.items()
+        if func.job_label
+    ]
+
+
+def enqueue(name, payload=None, user=None, delay=0, max_attempts=None):
+    """Queue the job ``name`` and return its ``Job`` row."""
+    if name not in _handlers:
+        raise ValueError(f"No job is registered as {name!r}.")
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        created_by=user if user and user.is_authenticated else None,
+        run_after=timezone.now() + datetime.timedelta(seconds=delay),
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(worker, now=None):
+    """Mark the next due job as running by ``worker`` and return it."""
+    if now is None:
+        now = timezone.now()
+    queued = Job.objects.filter(
+        status=Job.STATUS_QUEUED, run_after__lte=now
+    ).order_by("run_after", "pk").values_list("pk", flat=True)
+
+    db = router.db_for_write(Job)
+    if connections[db].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=db):
+            pk = queued.select_for_update(skip_locked=True).using(db).first()
+            if pk is not None and _mark_running(pk, worker, now):
+                return Job.objects.get(pk=pk)
+        return None
+
+    # Without row locks (SQLite) another worker may take the same row
+    # first. Each claim is a single conditional UPDATE in autocommit
+    # mode; a read inside a transaction could not be upgraded to the
+    # write lock SQLite needs.
+    for pk in queued.using(db)[:CLAIM_CANDIDATES]:
+        if _mark_running(pk, worker, now):
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def _mark_running(pk, worker, now):
+    return Job.objects.filter(pk=pk, status=Job.STATUS_QUEUED).update(
+        status=Job.STATUS_RUNNING,
+        attempts=F("attempts") + 1,
+        locked_by=worker,
+        started_at=now,
+        heartbeat_at=now,
+    )
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt, doubling each time."""
+    delay = min(
+        settings.JOB_RETRY_BACKOFF * 2 ** max(attempts - 1, 0),
+        settings.JOB_RETRY_BACKOFF_MAX,
+    )
+    # Jitter spreads out retries of jobs that failed together.
+    return delay * random.uniform(0.75, 1.25)
+
+
+class JobContext:
+    """Passed to handlers to report progress on the running job."""
+
+    def __init__(self, job_row):
+        self.job = job_row
+
+    def progress(self, done, total=None, message=None):
+        """Store progress; also tells the queue the worker is alive."""
+        fields = {"progress": done, "heartbeat_at": timezone.now()}
+        if total is not None:
+            fields["total"] = total
+        if message is not None:
+            fields["message"] = message[:255]
+        Job.objects.filter(pk=self.job.pk).update(**fields)
+        for name, value in fields.items():
+            setattr(self.job, name, value)
+
+
+class Heartbeat(threading.Thread):
+    """Moves ``heartbeat_at`` of a running job on while in use.
+
+    Runs beside the handler, so that a job busy in one long query or
+    call is not taken for one whose worker died (see
+    :func:`requeue_stale`).
+    """
+
+    def __init__(self, job_row, interval=None):
+        super().__init__(name=f"job-heartbeat-{job_row.pk}", daemon=True)
+        self.job = job_row
+        if interval is None:
+            interval = settings.JOB_HEARTBEAT_INTERVAL
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stopped.wait(self.interval):
+                self.beat()
+        finally:
+            # Connections are per thread; this one's would leak.
+            connections.close_all()
+
+    def beat(self):
+        try:
+            Job.objects.filter(
+                pk=self.job.pk,
+                status=Job.STATUS_RUNNING,
+                locked_by=self.job.locked_by,
+            ).update(heartbeat_at=timezone.now())
+        except DatabaseError as error:
+            # E.g. SQLite busy with the handler's writes; retry later.
+            logger.warning("No heartbeat recorded for %s: %s", self.job, error)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self.join()
+
+
+def run_job(job_row):
+    """Run a claimed job and record its outcome.
+
+    Returns ``True`` if the handler succeeded.
+    """
+    handler = _handlers.get(job_row.name)
+    start = time.perf_counter()
+    try:
+        if handler is None:
+            raise LookupError(f"No job is registered as {job_row.name!r}.")
+        with Heartbeat(job_row):
+            result = handler(JobContext(job_row), **job_row.payload)
+    except Exception:
+        logger.exception("Job %s failed.", job_row)
+        retry = handler is not None and (
+            job_row.attempts < job_row.max_attempts
+        )
+        _fail(job_row, traceback.format_exc(), retry)
+        outcome = "retried" if retry else "failed"
+    else:
+        Job.objects.filter(pk=job_row.pk).update(
+            status=Job.STATUS_SUCCEEDED,
+            result=result,
+            error="",
+            finished_at=timezone.now(),
+        )
+        outcome = "succeeded"
+
+    label = job_row.name if handler is not None else "<unknown>"
+    metrics.JOB_DURATION.labels(label).observe(time.perf_counter() - start)
+    metrics.JOBS.labels(label, outcome).inc()
+    return outcome == "succeeded"
+
+
+def _fail(job_row, error, retry):
+    now = timezone.now()
+    if retry:
+        Job.objects.filter(pk=job_row.pk).update(
+            status=Job.STATUS_QUEUED,
+            error=error,
+            locked_by="",
+            run_after=now + datetime.timedelta(
+                seconds=retry_delay(job_row.attempts)
+            ),
+        )
+    else:
+        Job.objects.filter(pk=job_row.pk).update(
+            status=Job.STATUS_FAILED,
+            error=error,
+            finished_at=now,
+        )
+
+
+def requeue_stale(now=None):
+    """Recover jobs whose worker stopped sending heartbeats.
+
+    A worker that was killed mid-job leaves its row running. Such jobs
+    are queued again, or failed once they are out of attempts. Returns
+    the number of jobs recovered.
+    """
+    if now is None:
+        now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.STATUS_RUNNING,
+        heartbeat_at__lt=now - datetime.timedelta(
+            seconds=settings.JOB_STALE_AFTER
+        ),
+    )
+    error = "The worker running this job stopped responding."
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.STATUS_FAILED, error=error, finished_at=now
+    )
+    requeued = stale.update(
+        status=Job.STATUS_QUEUED, error=error, locked_by="", run_after=now
+    )
+    return failed + requeued
+
+
+def work(should_stop, poll_interval=None, burst=False, wait=time.sleep):
+    """Claim and run jobs until ``should_stop()`` is true.
+
+    With ``burst`` the loop also ends once no job is due. ``wait`` is
+    called with ``poll_interval`` while the queue is empty. Returns the
+    number of jobs run.
+    """
+    if poll_interval is None:
+        poll_interval = settings.JOB_POLL_INTERVAL
+    name = worker_name()
+    processed = 0
+    next_sweep = 0
+    while not should_stop():
+        close_old_connections()
+        try:
+            if time.monotonic() >= next_sweep:
+                requeue_stale()
+                next_sweep = time.monotonic() + settings.JOB_STALE_AFTER / 4
+            job_row = claim(name)
+        except DatabaseError:
+            # E.g. the database restarting; keep the worker alive.
+            logger.exception("Could not claim a job.")
+            wait(poll_interval)
+            continue
+        if job_row is None:
+            if burst:
+                break
+            wait(poll_interval)
+            continue
+        run_job(job_row)
+        processed += 1
+    close_old_connections()
+    return processed
+
+
+@job("stats.snapshot", label="Record today's task statistics")
+def snapshot_stats(context):
+    return {"rows": take_snapshot()}
+
+
+@job("tasks.rebucket", label="Recompute deadline buckets")
+def rebucket(context, full=True):
+    return {"updated": rebucket_tasks(full=full)}
+
+
+@job("workers.reconcile_counts", label="Reconcile worker task counters")
+def reconcile_counts(context):
+    return {"fixed": reconcile_task_counts()}
+
+
+@job("tasks.archive", label="Archive tasks completed over a year ago")
+def archive(context, older_than_days=365, batch_size=500):
+    total = archivable_tasks(older_than_days).count()
+    context.progress(0, total)
+    archived = archive_tasks(
+        older_than_days, batch_size,
+        progress=lambda done: context.progress(done),
+    )
+    return {"archived": archived}
+
+
+@job("tasks.deadline_digests", label="Email deadline digests")
+def deadline_digests(context, force=False):
+    try:
+        sent = send_deadline_digests(
+            progress=lambda done: context.progress(done), force=force
+        )
+    except AlreadySent:
+        return {"sent": 0, "already_sent": True}
+    return {"sent": sent}
+
+
+@job("sync.prune_change_log", label="Prune the old task change log")
+def prune_sync_change_log(context):
+    return {"deleted": prune_change_log()}
+
+
+@job("tasks.bulk_update")
+def bulk_update(context, task_ids, changes, actor_id=None,
+                batch_size=500):
+    """Apply ``changes`` to ``task_ids`` in batches of ``batch_size``."""
+    changes = {
+        name: Task._meta.get_field(name).to_python(value)
+        for name, value in changes.items()
+    }
+    actor = Worker.objects.filter(pk=actor_id).first()
+    context.progress(0, len(task_ids))
+    updated = 0
+    for offset in range(0, len(task_ids), batch_size):
+        batch = task_ids[offset:offset + batch_size]
+        updated += bulk_update_tasks(
+            Task.objects.filter(pk__in=batch), actor=actor, **changes
+        )
+        context.progress(offset + len(batch))
+    return {"updated": updated}
@@ -0,0 +1,550 @@
+"""Closed-loop HTTP load generator behind ``manage.py load_test``.
+
+Every virtual user is an asyncio task with its own keep-alive connection
+and cookies. It logs in through the login form and then repeats a
+journey until the run ends: dashboard, a filtered task list, a task,
+sometimes an edit of that task through its form, and a worker profile.
+Requests are timed one by one and grouped by URL name.
+
+Journeys only touch the ``loadtest*`` workers and tasks created by
+:func:`seed_data`, and the random choices of each user come from a fixed
+seed, so runs against different servers or settings replay the same
+traffic. The workers have no usable password outside a run; each run
+sets a new random one with :func:`set_password`.
+"""
+import asyncio
+import datetime
+import html.parser
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.parse
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.urls import Resolver404, resolve, reverse
+from django.utils import timezone
+
+from core.counters import reconcile_task_counts
+from core.models import DataVersion, Task, Worker
+
+USERNAME_PREFIX = "loadtest"
+TASK_PREFIX = "Load test task"
+
+ASGI_WORKER_CLASS = "uvicorn.workers.UvicornWorker"
+
+PRIORITIES = [value for value, _ in Task._meta.get_field("priority").choices]
+TASK_FILTERS = {
+    "status": ["all", "pending", "completed"],
+    "priority": ["all", *PRIORITIES],
+    "deadline_filter": ["all", "overdue", "today", "next_3_days"],
+}
+
+
+def seed_data(user_count, task_count, seed=0):
+    """Create load test workers and tasks up to the given counts.
+
+    Tasks get one to three random assignees. Workers cannot sign in
+    until :func:`set_password` gives them a password. Returns the number
+    of workers and tasks created.
+    """
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    workers = Worker.objects.filter(username__startswith=USERNAME_PREFIX)
+    tasks = Task.objects.filter(name__startswith=TASK_PREFIX)
+    first_worker, first_task = workers.count(), tasks.count()
+
+    password = make_password(None)
+    new_workers = []
+    for i in range(first_worker, user_count):
+        worker = Worker(
+            username=f"{USERNAME_PREFIX}{i}",
+            first_name="Load",
+            last_name=f"Tester {i}",
+            password=password,
+        )
+        new_workers.append(worker)
+    Worker.objects.bulk_create(new_workers, batch_size=500)
+
+    worker_ids = list(workers.values_list("pk", flat=True))
+    new_tasks = []
+    for i in range(first_task, task_count):
+        task = Task(
+            name=f"{TASK_PREFIX} {i}",
+            description="Generated by manage.py load_test --seed.",
+            deadline=today + datetime.timedelta(days=rng.randint(-30, 60)),
+            is_completed=rng.random() < 0.4,
+            priority=rng.choice(PRIORITIES),
+        )
+        new_tasks.append(task)
+    new_tasks = Task.objects.bulk_create(new_tasks, batch_size=500)
+    if new_tasks and worker_ids:
+        Task.assignees.through.objects.bulk_create(
+            (
+                Task.assignees.through(task_id=task.pk, worker_id=worker_id)
+                for task in new_tasks
+                for worker_id in rng.sample(
+                    worker_ids, min(len(worker_ids), rng.randint(1, 3))
+                )
+            ),
+            batch_size=2000,
+        )
+
+    reconcile_task_counts()
+    DataVersion.bump(DataVersion.TASKS, DataVersion.WORKERS)
+    return len(new_workers), len(new_tasks)
+
+
+def set_password(password):
+    """Give every load test worker ``password``.
+
+    ``None`` makes their passwords unusable again. Returns the number of
+    workers changed.
+    """
+    hashed = make_password(password)
+    workers = list(Worker.objects.filter(username__startswith=USERNAME_PREFIX))
+    for worker in workers:
+        worker.password = hashed
+        # save() rather than update() drops the cached users too.
+        worker.save(update_fields=["password"])
+    return len(workers)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, app="pulseboard.wsgi", workers=2, env=None):
+    """Start gunicorn with ``gunicorn.conf.py`` on ``127.0.0.1:port``.
+
+    ``env`` is added to this process's environment; the config reads
+    its settings from there.
+    """
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", app,
+            "--config", str(settings.BASE_DIR / "gunicorn.conf.py"),
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers),
+        ],
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+            **(env or {}),
+        },
+        cwd=settings.BASE_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_until_ready(server, port, timeout):
+    """Wait for ``server`` to accept connections.
+
+    Returns ``False`` if it exited or did not listen within ``timeout``.
+    """
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if server.poll() is not None:
+            return False
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def stop_server(server):
+    server.terminate()
+    server.wait()
+
+
+class RequestFailed(Exception):
+    """No usable response; the virtual user starts over."""
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self):
+        return self.body.decode("utf-8", "replace")
+
+
+class HttpClient:
+    """Minimal HTTP/1.1 client: one keep-alive connection and cookies.
+
+    Redirects are not followed; journeys request the next page
+    themselves, as its timing is reported separately anyway.
+    """
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.cookies = {}
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, data=None):
+        body = b""
+        headers = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "User-Agent: pulseboard-load-test",
+        ]
+        if data is not None:
+            body = urllib.parse.urlencode(data, doseq=True).encode()
+            headers.append("Content-Type: application/x-www-form-urlencoded")
+        headers.append(f"Content-Length: {len(body)}")
+        if self.cookies:
+            headers.append("Cookie: " + "; ".join(
+                f"{name}={value}" for name, value in self.cookies.items()
+            ))
+        message = ("\r\n".join(headers) + "\r\n\r\n").encode() + body
+
+        # A kept-alive connection may have been closed by the server
+        # while idle; retry once on a new one.
+        for retry in (True, False):
+            reused = self.writer is not None
+            if not reused:
+                self.reader, self.writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port),
+                    self.timeout,
+                )
+            try:
+                self.writer.write(message)
+                await self.writer.drain()
+                return await asyncio.wait_for(
+                    self.read_response(), self.timeout
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if not (retry and reused):
+                    raise
+
+    async def read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by the server")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = (await self.reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            name, value = name.strip().lower(), value.strip()
+            if name == "set-cookie":
+                cookie_name, _, rest = value.partition("=")
+                self.cookies[cookie_name] = rest.split(";", 1)[0]
+            headers[name] = value
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if not size:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await self.reader.readexactly(
+                int(headers["content-length"])
+            )
+        else:
+            body = await self.reader.read()
+            headers["connection"] = "close"
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return Response(status, headers, body)
+
+
+class FormParser(html.parser.HTMLParser):
+    """Collect the fields a browser would submit with one POST form."""
+
+    def __init__(self, action):
+        super().__init__()
+        self.action = action
+        self.fields = []
+        self.in_form = False
+        self.textarea = None
+        self.select = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self.in_form = (
+                (attrs.get("method") or "").lower() == "post"
+                and attrs.get("action") == self.action
+            )
+        if not self.in_form:
+            return
+        name = attrs.get("name")
+        if tag == "input" and name:
+            kind = (attrs.get("type") or "text").lower()
+            if kind in ("submit", "button", "image", "reset", "file"):
+                return
+            if kind in ("checkbox", "radio"):
+                if "checked" in attrs:
+                    self.fields.append((name, attrs.get("value") or "on"))
+                return
+            self.fields.append((name, attrs.get("value") or ""))
+        elif tag == "textarea" and name:
+            self.textarea = [name, ""]
+        elif tag == "select" and name:
+            self.select = {
+                "name": name,
+                "multiple": "multiple" in attrs,
+                "first": None,
+                "selected": [],
+            }
+        elif tag == "option" and self.select is not None:
+            value = attrs.get("value") or ""
+            if self.select["first"] is None:
+                self.select["first"] = value
+            if "selected" in attrs:
+                self.select["selected"].append(value)
+
+    def handle_data(self, data):
+        if self.textarea is not None:
+            self.textarea[1] += data
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self.in_form = False
+        elif tag == "textarea" and self.textarea is not None:
+            name, value = self.textarea
+            # Browsers drop the newline that follows ``<textarea>``.
+            if value.startswith("\n"):
+                value = value[1:]
+            self.fields.append((name, value))
+            self.textarea = None
+        elif tag == "select" and self.select is not None:
+            select = self.select
+            values = select["selected"]
+            if not values and not select["multiple"] and select["first"]:
+                values = [select["first"]]
+            self.fields.extend((select["name"], value) for value in values)
+            self.select = None
+
+
+def parse_form(page, action):
+    """Return ``{name: [values]}`` of the POST form posting to ``action``."""
+    parser = FormParser(action)
+    parser.feed(page)
+    parser.close()
+    fields = defaultdict(list)
+    for name, value in parser.fields:
+        fields[name].append(value)
+    return dict(fields)
+
+
+def url_name(method, path):
+    try:
+        name = resolve(urllib.parse.urlsplit(path).path).url_name
+    except Resolver404:
+        name = path
+    return name if method == "GET" else f"{method} {name}"
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    def add(self, name, seconds, status, ok):
+        self.latencies[name].append(seconds)
+        self.statuses[name][status] += 1
+        if not ok:
+            self.errors[name] += 1
+
+    @staticmethod
+    def percentile(ordered, percent):
+        """Nearest-rank percentile of a sorted list."""
+        rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def rows(self, elapsed):
+        """One summary dict per URL name, then one for all requests."""
+        groups = sorted(self.latencies.items())
+        groups.append(
+            ("total", [s for _, samples in groups for s in samples])
+        )
+        rows = []
+        for name, samples in groups:
+            ordered = sorted(samples)
+            errors = (
+                sum(self.errors.values()) if name == "total"
+                else self.errors[name]
+            )
+            rows.append({
+                "name": name,
+                "requests": len(ordered),
+                "errors": errors,
+                "error_rate": errors / len(ordered) if ordered else 0,
+                "throughput": len(ordered) / elapsed if elapsed else 0,
+                "p50_ms": self.percentile(ordered, 50) * 1000,
+                "p90_ms": self.percentile(ordered, 90) * 1000,
+                "p99_ms": self.percentile(ordered, 99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+                "statuses": (
+                    {} if name == "total"
+                    else {str(k): v for k, v in self.statuses[name].items()}
+                ),
+            })
+        return rows
+
+
+class VirtualUser:
+    def __init__(self, client, stats, rng, username, password, task_ids,
+                 worker_ids, think_time, update_ratio):
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        self.username = username
+        self.password = password
+        self.task_ids = task_ids
+        self.worker_ids = worker_ids
+        self.think_time = think_time
+        self.update_ratio = update_ratio
+        self.logged_in = False
+
+    async def request(self, method, path, data=None, expect=200):
+        name = url_name(method, path)
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, data)
+        except (OSError, asyncio.TimeoutError,
+                asyncio.IncompleteReadError, ValueError) as error:
+            await self.client.close()
+            self.stats.add(
+                name, time.perf_counter() - started,
+                type(error).__name__, ok=False,
+            )
+            raise RequestFailed(name) from error
+        self.stats.add(
+            name, time.perf_counter() - started,
+            response.status, ok=response.status == expect,
+        )
+        return response
+
+    async def think(self):
+        if self.think_time > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think_time))
+
+    async def log_in(self):
+        url = reverse("login")
+        await self.request("GET", url)
+        response = await self.request("POST", url, {
+            "username": self.username,
+            "password": self.password,
+            "csrfmiddlewaretoken": self.client.cookies.get("csrftoken", ""),
+        }, expect=302)
+        if response.status != 302:
+            raise RequestFailed("login")
+        self.logged_in = True
+
+    async def journey(self):
+        rng = self.rng
+        await self.request("GET", reverse("core:dashboard"))
+        await self.think()
+
+        filters = {
+            key: rng.choice(values) for key, values in TASK_FILTERS.items()
+        }
+        await self.request(
+            "GET",
+            reverse("core:task-list") + "?" + urllib.parse.urlencode(filters),
+        )
+        await self.think()
+
+        task_id = rng.choice(self.task_ids)
+        await self.request("GET", reverse("core:task-detail", args=[task_id]))
+        await self.think()
+
+        if rng.random() < self.update_ratio:
+            url = reverse("core:task-update", args=[task_id])
+            response = await self.request("GET", url)
+            form = parse_form(response.text, url)
+            form["priority"] = [rng.choice(PRIORITIES)]
+            await self.think()
+            # 200 means the form came back with an error, e.g. an edit
+            # conflict with another virtual user.
+            await self.request("POST", url, form, expect=302)
+            await self.think()
+
+        await self.request("GET", reverse(
+            "core:worker-detail", args=[rng.choice(self.worker_ids)]
+        ))
+        await self.think()
+
+    async def run(self, deadline):
+        loop = asyncio.get_running_loop()
+        try:
+            while loop.time() < deadline:
+                try:
+                    if not self.logged_in:
+                        await self.log_in()
+                    await self.journey()
+                except RequestFailed:
+                    # Back off like a person retrying, then start over.
+                    await asyncio.sleep(1)
+        finally:
+            await self.client.close()
+
+
+async def run_load(host, port, usernames, password, task_ids, worker_ids,
+                   users, duration, ramp_up=0, think_time=0,
+                   update_ratio=0.25, timeout=30, seed=0):
+    """Run ``users`` virtual users for ``duration`` seconds.
+
+    Users sign in as ``usernames`` with ``password`` and start evenly
+    spread over ``ramp_up`` seconds. Returns the
+    :class:`Stats` and the elapsed seconds.
+    """
+    stats = Stats()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+
+    async def virtual_user(number):
+        await asyncio.sleep(ramp_up * number / users)
+        user = VirtualUser(
+            HttpClient(host, port, timeout),
+            stats,
+            random.Random(seed * 100003 + number),
+            usernames[number % len(usernames)],
+            password,
+            task_ids,
+            worker_ids,
+            think_time,
+            update_ratio,
+        )
+        await user.run(deadline)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user(n) for n in range(users)))
+    return stats, time.perf_counter() - started
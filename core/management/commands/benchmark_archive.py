@@ -0,0 +1,136 @@
+import datetime
+import random
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from core.archive import archive_tasks
+from core.benchmarks import measure, scratch_database
+from core.deadlines import deadline_q, rebucket_tasks
+from core.models import Task, Worker
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Compare hot-table query times before and after archiving old "
+        "completed tasks. Runs against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=50000)
+        parser.add_argument("--workers", type=int, default=50)
+        parser.add_argument(
+            "--archived-share",
+            type=float,
+            default=0.9,
+            help="Share of tasks old enough to be archived.",
+        )
+        parser.add_argument("--rounds", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            workers = self.seed(
+                options["tasks"], options["workers"],
+                options["archived_share"],
+            )
+            queries = self.queries(workers[0])
+
+            before = self.run(queries, options["rounds"])
+            with measure() as result:
+                archived = archive_tasks(older_than_days=365)
+            self.stdout.write(
+                f"Archived {archived} task(s) in {result['seconds']:.2f}s "
+                f"({result['queries']} queries)\n"
+            )
+            after = self.run(queries, options["rounds"])
+
+            self.stdout.write(
+                f"{'query':<22}{'before ms':>11}{'after ms':>10}"
+                f"{'speedup':>9}"
+            )
+            for name in queries:
+                self.stdout.write(
+                    f"{name:<22}{before[name] * 1000:>11.2f}"
+                    f"{after[name] * 1000:>10.2f}"
+                    f"{before[name] / after[name]:>8.1f}x"
+                )
+
+    @staticmethod
+    def seed(count, worker_count, archived_share):
+        rng = random.Random(0)
+        today = timezone.localdate()
+        workers = Worker.objects.bulk_create(
+            Worker(username=f"benchmark{i}") for i in range(worker_count)
+        )
+        old = int(count * archived_share)
+        tasks = Task.objects.bulk_create(
+            (
+                Task(
+                    name=f"Benchmark {i}",
+                    description="-",
+                    deadline=today - datetime.timedelta(
+                        days=rng.randint(400, 2000)
+                    ),
+                    is_completed=True,
+                    priority=rng.choice(["urgent", "high", "medium", "low"]),
+                )
+                if i < old else
+                Task(
+                    name=f"Benchmark {i}",
+                    description="-",
+                    deadline=today + datetime.timedelta(
+                        days=rng.randint(-30, 60)
+                    ),
+                    is_completed=rng.random() < 0.3,
+                    priority=rng.choice(["urgent", "high", "medium", "low"]),
+                )
+                for i in range(count)
+            ),
+            batch_size=2000,
+        )
+        Task.assignees.through.objects.bulk_create(
+            (
+                Task.assignees.through(
+                    task_id=task.pk, worker_id=rng.choice(workers).pk
+                )
+                for task in tasks
+            ),
+            batch_size=2000,
+        )
+        rebucket_tasks(full=True)
+        return workers
+
+    @staticmethod
+    def queries(worker):
+        return {
+            "task count": lambda: Task.objects.count(),
+            "completed count": lambda: Task.objects.filter(
+                is_completed=True
+            ).count(),
+            "overdue count": lambda: Task.objects.filter(
+                deadline_q("overdue")
+            ).count(),
+            "priority breakdown": lambda: list(
+                Task.objects.values("priority").annotate(count=Count("id"))
+            ),
+            "name search": lambda: Task.objects.filter(
+                name__icontains="99"
+            ).count(),
+            "worker's tasks": lambda: Task.objects.filter(
+                assignees=worker
+            ).count(),
+        }
+
+    @staticmethod
+    def run(queries, rounds):
+        results = {}
+        for name, query in queries.items():
+            best = None
+            for _ in range(rounds):
+                with measure() as result:
+                    query()
+                if best is None or result["seconds"] < best:
+                    best = result["seconds"]
+            results[name] = best
+        return results
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from core.audit import audit_context
+from core.benchmarks import measure, scratch_database
+from core.models import Task, TaskAuditEvent
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Measure how much the task audit log adds to task saves. Runs "
+        "against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=500)
+        parser.add_argument("--rounds", type=int, default=3)
+
+    def handle(self, *args, **options):
+        modes = (
+            ("audit disabled", False, False),
+            ("audit, unbuffered", True, False),
+            ("audit, buffered", True, True),
+        )
+        count = options["tasks"]
+        with scratch_database():
+            Task.objects.bulk_create(
+                Task(name=f"Benchmark {i}", description="-",
+                     deadline=timezone.localdate())
+                for i in range(count)
+            )
+            tasks = list(Task.objects.all())
+
+            for label, enabled, buffered in modes:
+                best = None
+                for _ in range(options["rounds"]):
+                    with override_settings(TASK_AUDIT_ENABLED=enabled), \
+                            measure() as result:
+                        if buffered:
+                            with audit_context():
+                                self.save_all(tasks)
+                        else:
+                            self.save_all(tasks)
+                    if best is None or result["seconds"] < best["seconds"]:
+                        best = result
+                self.stdout.write(
+                    f"{label:<18} "
+                    f"{best['seconds'] / count * 1e6:8.1f} us/save  "
+                    f"{best['queries'] / count:5.2f} queries/save"
+                )
+            self.stdout.write(
+                f"{TaskAuditEvent.objects.count()} audit events written"
+            )
+
+    @staticmethod
+    def save_all(tasks):
+        for task in tasks:
+            task.priority = "low" if task.priority == "urgent" else "urgent"
+            task.save()
@@ -0,0 +1,149 @@
+import datetime
+import random
+
+from django.conf import settings
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.benchmarks import measure, scratch_database
+from core.digests import TEMPLATE_NAME, digest_subject, send_deadline_digests
+from core.models import Task, Worker
+
+
+class CountingBackend(EmailBackend):
+    """In-memory backend that counts connections like SMTP would open."""
+
+    opened = 0
+    connected = False
+
+    def open(self):
+        if self.connected:
+            return False
+        CountingBackend.opened += 1
+        self.connected = True
+        return True
+
+    def close(self):
+        self.connected = False
+
+    def send_messages(self, messages):
+        new_connection = self.open()
+        try:
+            return super().send_messages(messages)
+        finally:
+            if new_connection:
+                self.close()
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Compare sending deadline digests one worker at a time with the "
+        "batched send_deadline_digests. Runs against a throwaway test "
+        "database with an in-memory mail backend."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=10000)
+        parser.add_argument("--tasks-per-worker", type=int, default=5)
+
+    def handle(self, *args, **options):
+        backend = f"{__name__}.CountingBackend"
+        with scratch_database(), override_settings(EMAIL_BACKEND=backend):
+            self.seed(options["workers"], options["tasks_per_worker"])
+            for label, send in (
+                ("per worker", self.send_per_worker),
+                ("batched", send_deadline_digests),
+            ):
+                mail.outbox = []
+                CountingBackend.opened = 0
+                with measure() as result:
+                    send()
+                self.stdout.write(
+                    f"{label:<12}{result['seconds']:8.2f}s "
+                    f"{result['queries']:>7} queries "
+                    f"{CountingBackend.opened:>7} connections "
+                    f"{len(mail.outbox):>7} emails"
+                )
+
+    @staticmethod
+    def seed(worker_count, tasks_per_worker):
+        rng = random.Random(0)
+        today = timezone.localdate()
+        workers = Worker.objects.bulk_create(
+            (
+                Worker(
+                    username=f"benchmark{i}",
+                    first_name=f"Worker {i}",
+                    email=f"benchmark{i}@example.com",
+                )
+                for i in range(worker_count)
+            ),
+            batch_size=2000,
+        )
+        tasks = Task.objects.bulk_create(
+            (
+                Task(
+                    name=f"Benchmark {i}",
+                    description="-",
+                    deadline=today + datetime.timedelta(
+                        days=rng.randint(-10, 30)
+                    ),
+                    is_completed=rng.random() < 0.3,
+                )
+                for i in range(worker_count * tasks_per_worker)
+            ),
+            batch_size=2000,
+        )
+        Task.assignees.through.objects.bulk_create(
+            (
+                Task.assignees.through(
+                    task_id=task.pk,
+                    worker_id=workers[i // tasks_per_worker].pk,
+                )
+                for i, task in enumerate(tasks)
+            ),
+            batch_size=2000,
+        )
+
+    @staticmethod
+    def send_per_worker():
+        """The straightforward version: a query and a send per worker."""
+        today = timezone.localdate()
+        due_within = settings.DIGEST_DUE_WITHIN_DAYS
+        for worker in Worker.objects.filter(is_active=True).exclude(
+            email=""
+        ):
+            tasks = Task.objects.filter(
+                assignees=worker,
+                is_completed=False,
+                deadline__lte=today + datetime.timedelta(days=due_within),
+            ).order_by("deadline", "pk")
+            context = {
+                "name": worker.first_name or worker.username,
+                "today": today,
+                "due_within": due_within,
+                "overdue": [],
+                "due_soon": [],
+            }
+            for task in tasks:
+                key = "overdue" if task.deadline < today else "due_soon"
+                context[key].append({
+                    "name": task.name,
+                    "deadline": task.deadline,
+                    "priority": task.priority,
+                    "url": settings.SITE_URL + reverse(
+                        "core:task-detail", args=[task.pk]
+                    ),
+                })
+            if context["overdue"] or context["due_soon"]:
+                mail.send_mail(
+                    digest_subject(context),
+                    render_to_string(TEMPLATE_NAME, context),
+                    None,
+                    [worker.email],
+                )
@@ -0,0 +1,78 @@
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.benchmarks import measure, scratch_database
+from core.models import Position, Task, Worker
+
+BASELINE = {
+    "SESSION_ENGINE": "django.contrib.sessions.backends.db",
+    "AUTHENTICATION_BACKENDS": [
+        "django.contrib.auth.backends.ModelBackend",
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Compare database queries per authenticated request with and "
+        "without session/user caching. Runs against a throwaway test "
+        "database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with scratch_database(), override_settings(
+            ALLOWED_HOSTS=["testserver"]
+        ):
+            worker = self.seed()
+            urls = {
+                "dashboard": reverse("core:dashboard"),
+                "task-list": reverse("core:task-list"),
+                "worker-detail": reverse(
+                    "core:worker-detail", args=[worker.pk]
+                ),
+            }
+            baseline = self.run(worker, urls, options["requests"], BASELINE)
+            cached = self.run(worker, urls, options["requests"], {})
+
+            self.stdout.write(
+                f"{'view':<16}{'baseline':>10}{'cached':>10}  queries/request"
+            )
+            for name in urls:
+                self.stdout.write(
+                    f"{name:<16}{baseline[name]:>10.1f}{cached[name]:>10.1f}"
+                )
+
+    @staticmethod
+    def seed():
+        position = Position.objects.create(name="Developer")
+        worker = Worker.objects.create_user(
+            username="benchmark", password="benchmark", position=position
+        )
+        task = Task.objects.create(
+            name="Task", description="-", deadline=timezone.localdate()
+        )
+        task.assignees.add(worker)
+        return worker
+
+    @staticmethod
+    def run(worker, urls, requests, overrides):
+        for cache in caches.all():
+            cache.clear()
+        results = {}
+        with override_settings(**overrides):
+            client = Client()
+            client.login(username=worker.username, password="benchmark")
+            for name, url in urls.items():
+                client.get(url)  # warm up caches
+                with measure() as result:
+                    for _ in range(requests):
+                        client.get(url)
+                results[name] = result["queries"] / requests
+        return results
@@ -0,0 +1,174 @@
+import asyncio
+import contextlib
+import secrets
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.loadtest import (
+    TASK_PREFIX,
+    USERNAME_PREFIX,
+    free_port,
+    run_load,
+    seed_data,
+    set_password,
+    start_server,
+    stop_server,
+    wait_until_ready,
+)
+from core.models import Task, Worker
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Compare SQLite connection profiles (SQLITE_PROFILES) under "
+        "concurrent load: for each profile and gunicorn worker count, "
+        "serve a copy of a freshly seeded database and report read and "
+        "write throughput and latency. Never touches the configured "
+        "database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles", default="default,tuned",
+            help="Comma-separated SQLITE_PROFILES to compare.",
+        )
+        parser.add_argument(
+            "--workers", default="1,2,4",
+            help="Comma-separated gunicorn worker counts.",
+        )
+        parser.add_argument("--worker-class")
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--duration", type=float, default=15)
+        parser.add_argument(
+            "--update-ratio", type=float, default=0.5,
+            help="Share of journeys that edit the task they open.",
+        )
+        parser.add_argument("--seed-users", type=int, default=50)
+        parser.add_argument("--seed-tasks", type=int, default=5000)
+        parser.add_argument("--random-seed", type=int, default=0)
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The default database is not SQLite.")
+        profiles = options["profiles"].split(",")
+        unknown = set(profiles) - set(settings.SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profile(s): {', '.join(unknown)}")
+        worker_counts = [int(count) for count in options["workers"].split(",")]
+
+        with tempfile.TemporaryDirectory() as directory:
+            pristine = Path(directory) / "seed.sqlite3"
+            with self.database_at(pristine):
+                call_command("migrate", verbosity=0)
+                seed_data(
+                    options["seed_users"], options["seed_tasks"],
+                    options["random_seed"],
+                )
+                password = secrets.token_urlsafe()
+                set_password(password)
+                workers = Worker.objects.filter(
+                    username__startswith=USERNAME_PREFIX
+                ).order_by("pk")
+                usernames = list(workers.values_list("username", flat=True))
+                worker_ids = list(workers.values_list("pk", flat=True))
+                task_ids = list(
+                    Task.objects.filter(name__startswith=TASK_PREFIX)
+                    .order_by("pk").values_list("pk", flat=True)
+                )
+                # Every run starts from a rollback-journal file and gets
+                # whatever mode its profile sets.
+                with connection.cursor() as cursor:
+                    cursor.execute("PRAGMA journal_mode = delete")
+            self.stdout.write(
+                f"Seeded {len(usernames)} worker(s), {len(task_ids)} "
+                f"task(s); {options['users']} user(s), "
+                f"{options['duration']:g}s per run.\n"
+            )
+
+            self.stdout.write(
+                f"{'profile':<10}{'workers':>8}{'req/s':>8}{'reads/s':>9}"
+                f"{'writes/s':>10}{'read p50':>10}{'read p99':>10}"
+                f"{'write p50':>11}{'write p99':>11}{'errors':>8}"
+            )
+            for profile in profiles:
+                for worker_count in worker_counts:
+                    path = Path(directory) / f"{profile}-{worker_count}.db"
+                    shutil.copyfile(pristine, path)
+                    stats, elapsed = self.run(
+                        path, profile, worker_count, options,
+                        usernames, password, task_ids, worker_ids,
+                    )
+                    self.report(profile, worker_count, stats, elapsed)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def database_at(path):
+        """Point the default connection at another SQLite file."""
+        old_name = connection.settings_dict["NAME"]
+        connection.close()
+        connection.settings_dict["NAME"] = str(path)
+        try:
+            yield
+        finally:
+            connection.close()
+            connection.settings_dict["NAME"] = old_name
+
+    @staticmethod
+    def run(path, profile, worker_count, options, usernames, password,
+            task_ids, worker_ids):
+        env = {
+            "SQLITE_PATH": str(path),
+            "SQLITE_PROFILE": profile,
+            "SQLITE_REPLICA_PATH": "",
+        }
+        if options["worker_class"]:
+            env["GUNICORN_WORKER_CLASS"] = options["worker_class"]
+        port = free_port()
+        server = start_server(port, workers=worker_count, env=env)
+        try:
+            if not wait_until_ready(server, port, options["timeout"]):
+                raise CommandError("gunicorn did not start.")
+            return asyncio.run(run_load(
+                "127.0.0.1", port, usernames, password, task_ids,
+                worker_ids,
+                users=options["users"],
+                duration=options["duration"],
+                ramp_up=0,
+                update_ratio=options["update_ratio"],
+                timeout=options["timeout"],
+                seed=options["random_seed"],
+            ))
+        finally:
+            stop_server(server)
+
+    def report(self, profile, worker_count, stats, elapsed):
+        reads, writes = [], []
+        for name, samples in stats.latencies.items():
+            (reads if " " not in name else writes).extend(samples)
+        reads.sort()
+        writes.sort()
+
+        def ms(samples, percent):
+            if not samples:
+                return "-"
+            return f"{stats.percentile(samples, percent) * 1000:.1f}"
+
+        errors = sum(stats.errors.values())
+        line = (
+            f"{profile:<10}{worker_count:>8}"
+            f"{(len(reads) + len(writes)) / elapsed:>8.1f}"
+            f"{len(reads) / elapsed:>9.1f}{len(writes) / elapsed:>10.1f}"
+            f"{ms(reads, 50):>10}{ms(reads, 99):>10}"
+            f"{ms(writes, 50):>11}{ms(writes, 99):>11}{errors:>8}"
+        )
+        self.stdout.write(self.style.ERROR(line) if errors else line)
+        for name, count in stats.errors.items():
+            statuses = dict(stats.statuses[name])
+            self.stdout.write(f"  {name}: {count} error(s), {statuses}")
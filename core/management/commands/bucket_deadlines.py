@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from core.deadlines import rebucket_tasks
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Shift tasks into the deadline horizons for the current date. "
+        "Schedule it daily shortly after midnight, e.g. "
+        "'5 0 * * * python manage.py bucket_deadlines'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute the bucket of every task, not only those "
+                 "whose horizon can have changed. Needed after changing "
+                 "TIME_ZONE.",
+        )
+
+    def handle(self, *args, **options):
+        updated = rebucket_tasks(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebucketed {updated} task(s).")
+        )
@@ -0,0 +1,225 @@
+import asyncio
+import importlib.util
+import json
+import secrets
+import urllib.parse
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.loadtest import (
+    ASGI_WORKER_CLASS,
+    TASK_PREFIX,
+    USERNAME_PREFIX,
+    free_port,
+    run_load,
+    seed_data,
+    set_password,
+    start_server,
+    stop_server,
+    wait_until_ready,
+)
+from core.models import Task, Worker
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Load test the site end to end: start gunicorn (WSGI, or ASGI "
+        "with uvicorn workers), replay scripted user journeys with N "
+        "concurrent virtual users and report throughput, latency "
+        "percentiles and error rates per URL name. Uses the configured "
+        "database; create the load test users and tasks with --seed. "
+        "Refuses to run with DEBUG off unless "
+        "--i-know-this-is-not-production is passed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--users", type=int, default=20,
+            help="Concurrent virtual users.",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=30,
+            help="Seconds to run for.",
+        )
+        parser.add_argument(
+            "--ramp-up", type=float, default=5,
+            help="Seconds over which users start.",
+        )
+        parser.add_argument(
+            "--think-time", type=float, default=0,
+            help="Mean pause between pages in seconds; 0 sends the next "
+                 "request right away.",
+        )
+        parser.add_argument(
+            "--update-ratio", type=float, default=0.25,
+            help="Share of journeys that edit the task they open.",
+        )
+        parser.add_argument("--random-seed", type=int, default=0)
+        parser.add_argument("--timeout", type=float, default=30)
+        parser.add_argument(
+            "--server", choices=("wsgi", "asgi"), default="wsgi",
+            help="Interface to serve the site with.",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=2,
+            help="gunicorn worker processes.",
+        )
+        parser.add_argument(
+            "--worker-class",
+            help="gunicorn worker class for WSGI (default: from "
+                 "gunicorn.conf.py).",
+        )
+        parser.add_argument("--threads", type=int)
+        parser.add_argument(
+            "--env", action="append", default=[], metavar="NAME=VALUE",
+            help="Extra environment for the server, e.g. database "
+                 "settings. May be repeated.",
+        )
+        parser.add_argument(
+            "--url",
+            help="Load test an already running server instead of "
+                 "starting one.",
+        )
+        parser.add_argument(
+            "--seed", action="store_true",
+            help="Create the load test users and tasks first.",
+        )
+        parser.add_argument(
+            "--i-know-this-is-not-production", action="store_true",
+            dest="not_production",
+            help="Run with DEBUG off. The run signs in as the active "
+                 "loadtest* workers with a password set for it.",
+        )
+        parser.add_argument("--seed-users", type=int, default=50)
+        parser.add_argument("--seed-tasks", type=int, default=5000)
+        parser.add_argument(
+            "--json", dest="json_path",
+            help="Also write the results to this file.",
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["duration"] <= 0:
+            raise CommandError("--users and --duration must be positive.")
+        if not settings.DEBUG and not options["not_production"]:
+            raise CommandError(
+                "DEBUG is off, so this may be a production database. "
+                "load_test creates workers and signs in as them; pass "
+                "--i-know-this-is-not-production if it is not."
+            )
+        if options["seed"]:
+            workers, tasks = seed_data(
+                options["seed_users"], options["seed_tasks"],
+                options["random_seed"],
+            )
+            self.stdout.write(f"Seeded {workers} worker(s), {tasks} task(s).")
+
+        workers = Worker.objects.filter(
+            username__startswith=USERNAME_PREFIX, is_active=True
+        ).order_by("pk")
+        usernames = list(workers.values_list("username", flat=True))
+        worker_ids = list(workers.values_list("pk", flat=True))
+        task_ids = list(
+            Task.objects.filter(name__startswith=TASK_PREFIX)
+            .order_by("pk").values_list("pk", flat=True)
+        )
+        if not usernames or not task_ids:
+            raise CommandError("No load test data; run with --seed first.")
+
+        server = None
+        if options["url"]:
+            target = urllib.parse.urlsplit(options["url"])
+            host, port = target.hostname, target.port or 80
+        else:
+            host, port = "127.0.0.1", free_port()
+            app, env = self.server_config(options)
+            server = start_server(port, app, options["workers"], env)
+        # A new password per run; the workers are locked again afterwards.
+        password = secrets.token_urlsafe()
+        set_password(password)
+        try:
+            if server is not None and not wait_until_ready(
+                server, port, options["timeout"]
+            ):
+                raise CommandError("gunicorn did not start.")
+            self.stdout.write(
+                f"Running {options['users']} user(s) for "
+                f"{options['duration']:g}s against {host}:{port}..."
+            )
+            stats, elapsed = asyncio.run(run_load(
+                host, port, usernames, password, task_ids, worker_ids,
+                users=options["users"],
+                duration=options["duration"],
+                ramp_up=options["ramp_up"],
+                think_time=options["think_time"],
+                update_ratio=options["update_ratio"],
+                timeout=options["timeout"],
+                seed=options["random_seed"],
+            ))
+        finally:
+            if server is not None:
+                stop_server(server)
+            set_password(None)
+
+        rows = stats.rows(elapsed)
+        self.report(rows)
+        if options["json_path"]:
+            config = {
+                key: options[key] for key in (
+                    "users", "duration", "ramp_up", "think_time",
+                    "update_ratio", "random_seed", "server", "workers",
+                    "worker_class", "threads", "env", "url",
+                )
+            }
+            with open(options["json_path"], "w") as output:
+                json.dump(
+                    {"config": config, "elapsed": elapsed, "results": rows},
+                    output, indent=2,
+                )
+
+    @staticmethod
+    def server_config(options):
+        """Return the application module and environment for gunicorn."""
+        env = {}
+        for item in options["env"]:
+            name, sep, value = item.partition("=")
+            if not sep:
+                raise CommandError(f"--env expects NAME=VALUE, not {item!r}")
+            env[name] = value
+        if options["server"] == "asgi":
+            if importlib.util.find_spec("uvicorn") is None:
+                raise CommandError(
+                    "--server asgi needs uvicorn: pip install uvicorn"
+                )
+            env["GUNICORN_WORKER_CLASS"] = ASGI_WORKER_CLASS
+        elif options["worker_class"]:
+            env["GUNICORN_WORKER_CLASS"] = options["worker_class"]
+        if options["threads"]:
+            env["GUNICORN_THREADS"] = str(options["threads"])
+        app = "pulseboard.asgi" if options["server"] == "asgi" else (
+            "pulseboard.wsgi"
+        )
+        return app, env
+
+    def report(self, rows):
+        self.stdout.write(
+            f"\n{'URL name':<24}{'requests':>9}{'errors':>8}{'err %':>7}"
+            f"{'req/s':>8}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+            f"{'max ms':>9}"
+        )
+        for row in rows:
+            line = (
+                f"{row['name']:<24}{row['requests']:>9}{row['errors']:>8}"
+                f"{row['error_rate'] * 100:>7.1f}{row['throughput']:>8.1f}"
+                f"{row['p50_ms']:>9.1f}{row['p90_ms']:>9.1f}"
+                f"{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}"
+            )
+            if row["name"] == "total":
+                line = self.style.SUCCESS(line)
+            self.stdout.write(line)
+        failing = {
+            row["name"]: row["statuses"] for row in rows if row["errors"]
+        }
+        for name, statuses in failing.items():
+            if statuses:
+                self.stdout.write(f"  {name}: responses {statuses}")
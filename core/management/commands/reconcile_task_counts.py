@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from core.counters import reconcile_task_counts
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Recount open and completed tasks for every worker and repair "
+        "any drift in the denormalized counters."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted workers without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        drifted = reconcile_task_counts(dry_run=dry_run)
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("All counters are correct."))
+        elif dry_run:
+            self.stdout.write(
+                self.style.WARNING(f"{drifted} worker(s) have drifted.")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Repaired {drifted} worker(s).")
+            )
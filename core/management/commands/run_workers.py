@@ -0,0 +1,99 @@
+import multiprocessing
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.jobs import work
+
+
+def _worker_main(stop, poll_interval, burst):
+    # Ctrl+C reaches the whole process group; let the parent decide.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Signal handlers must not touch ``stop``: its lock may be held by
+    # the interrupted code.
+    terminated = []
+    signal.signal(
+        signal.SIGTERM, lambda signum, frame: terminated.append(signum)
+    )
+    work(
+        lambda: bool(terminated) or stop.is_set(),
+        poll_interval, burst, wait=stop.wait,
+    )
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Run queued background jobs. Starts --concurrency worker "
+        "processes that each claim and run one job at a time. On "
+        "SIGTERM or Ctrl+C, running jobs are finished before exiting."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.JOB_WORKER_CONCURRENCY,
+            help="Number of worker processes.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOB_POLL_INTERVAL,
+            help="Seconds to wait between polls of an empty queue.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no job is due instead of waiting for more.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        poll_interval = options["poll_interval"]
+        burst = options["burst"]
+
+        # Workers are forked like gunicorn's, so they share the loaded
+        # code but must not share database connections.
+        context = multiprocessing.get_context("fork")
+        stop = context.Event()
+        connections.close_all()
+
+        def start(number):
+            process = context.Process(
+                target=_worker_main,
+                args=(stop, poll_interval, burst),
+                name=f"job-worker-{number}",
+            )
+            process.start()
+            return process
+
+        processes = [start(number) for number in range(concurrency)]
+        self.stdout.write(
+            f"Started {concurrency} job worker(s) "
+            f"(pids {', '.join(str(p.pid) for p in processes)})."
+        )
+
+        stopping = []
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda signum, frame: stopping.append(1))
+
+        while not stopping:
+            if burst and not any(p.is_alive() for p in processes):
+                break
+            for number, process in enumerate(processes):
+                if not burst and not process.is_alive():
+                    self.stderr.write(
+                        f"Job worker {process.pid} exited with code "
+                        f"{process.exitcode}; starting a new one."
+                    )
+                    processes[number] = start(number)
+            time.sleep(1)
+
+        self.stdout.write("Stopping; waiting for running jobs to finish.")
+        stop.set()
+        for process in processes:
+            process.join()
+        self.stdout.write(self.style.SUCCESS("Job workers stopped."))
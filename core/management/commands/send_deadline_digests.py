@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.digests import AlreadySent, build_digests, send_deadline_digests
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Email every active worker a digest of their overdue tasks and "
+        "tasks due within --due-within days. Schedule it once a day; "
+        "a second run on the same date does nothing without --force."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--due-within",
+            type=int,
+            default=settings.DIGEST_DUE_WITHIN_DAYS,
+            help="Days ahead counted as due soon.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.DIGEST_BATCH_SIZE,
+            help="Messages handed to the mail connection at a time.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many digests would be sent.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Send even if today's digests have already gone out.",
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        if options["dry_run"]:
+            count = sum(1 for _ in build_digests(today, options["due_within"]))
+            self.stdout.write(f"{count} digest(s) would be sent.")
+            return
+        try:
+            sent = send_deadline_digests(
+                today, options["due_within"], options["batch_size"],
+                force=options["force"],
+            )
+        except AlreadySent:
+            self.stdout.write("Today's digests have already been sent.")
+            return
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} digest(s)."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.stats import take_snapshot
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Record today's team and per-worker task statistics for trend "
+        "charts. Schedule it once a day; re-running replaces the rows "
+        "for the current date."
+    )
+
+    def handle(self, *args, **options):
+        written = take_snapshot()
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {written} snapshot row(s).")
+        )
@@ -0,0 +1,193 @@
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter so nothing is imported yet.
+PHASES_SCRIPT = """
+import json
+import time
+
+start = time.perf_counter()
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+settings_loaded = time.perf_counter()
+django.setup()
+apps_loaded = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+urls_loaded = time.perf_counter()
+
+print(json.dumps({
+    "settings": settings_loaded - start,
+    "app loading": apps_loaded - settings_loaded,
+    "URLconf": urls_loaded - apps_loaded,
+    "total": urls_loaded - start,
+}))
+"""
+
+SERVE_CONFIGS = {
+    "sync, lazy": {
+        "GUNICORN_WORKER_CLASS": "sync",
+        "GUNICORN_PRELOAD": "false",
+        "GUNICORN_WARMUP": "false",
+    },
+    "sync, preload": {
+        "GUNICORN_WORKER_CLASS": "sync",
+        "GUNICORN_PRELOAD": "true",
+        "GUNICORN_WARMUP": "false",
+    },
+    "sync, preload + warm-up": {
+        "GUNICORN_WORKER_CLASS": "sync",
+        "GUNICORN_PRELOAD": "true",
+        "GUNICORN_WARMUP": "true",
+    },
+    "gthread, preload + warm-up": {
+        "GUNICORN_WORKER_CLASS": "gthread",
+        "GUNICORN_PRELOAD": "true",
+        "GUNICORN_WARMUP": "true",
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Profile process start-up: import time per top-level package and "
+        "the time spent loading settings, apps and the URLconf. With "
+        "--serve, also compare time-to-first-response across gunicorn "
+        "configurations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument(
+            "--serve",
+            action="store_true",
+            help="Start gunicorn with each configuration and time the "
+                 "first response.",
+        )
+        parser.add_argument("--path", default="/login/")
+
+    def handle(self, *args, **options):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+        }
+        phases = defaultdict(list)
+        packages = defaultdict(list)
+        for _ in range(max(options["repeat"], 1)):
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", PHASES_SCRIPT],
+                env=env,
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode:
+                raise CommandError(result.stderr.strip().splitlines()[-1])
+            for name, seconds in json.loads(result.stdout).items():
+                phases[name].append(seconds)
+            for name, seconds in self.import_times(result.stderr).items():
+                packages[name].append(seconds)
+
+        self.stdout.write(f"{'phase':<28}{'ms':>10}")
+        for name, samples in phases.items():
+            self.stdout.write(
+                f"{name:<28}{statistics.median(samples) * 1000:>10.1f}"
+            )
+
+        self.stdout.write(f"\n{'package':<28}{'import ms':>10}")
+        totals = sorted(
+            ((statistics.median(samples), name)
+             for name, samples in packages.items()),
+            reverse=True,
+        )
+        for seconds, name in totals[:options["top"]]:
+            self.stdout.write(f"{name:<28}{seconds * 1000:>10.1f}")
+
+        if options["serve"]:
+            self.stdout.write(
+                f"\n{'gunicorn':<28}{'first response ms':>18}"
+                f"{'next request ms':>16}"
+            )
+            for name, overrides in SERVE_CONFIGS.items():
+                first, following = self.time_to_first_response(
+                    {**env, **overrides}, options["path"]
+                )
+                self.stdout.write(
+                    f"{name:<28}{first * 1000:>18.0f}"
+                    f"{following * 1000:>16.1f}"
+                )
+
+    @staticmethod
+    def import_times(stderr):
+        """Sum ``-X importtime`` self times by top-level package."""
+        totals = defaultdict(float)
+        for line in stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            self_us, _, name = line[len("import time:"):].split("|")
+            if not self_us.strip().isdigit():
+                continue  # header line
+            totals[name.strip().split(".")[0]] += int(self_us) / 1e6
+        return totals
+
+    @staticmethod
+    def fetch(url, timeout):
+        try:
+            urllib.request.urlopen(url, timeout=timeout).close()
+        except urllib.error.HTTPError:
+            pass  # any response counts
+
+    def time_to_first_response(self, env, path, timeout=30):
+        """Seconds from launching gunicorn to its first response, and the
+        duration of the request after it."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        url = f"http://127.0.0.1:{port}{path}"
+
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn", "pulseboard.wsgi",
+                "--config", str(settings.BASE_DIR / "gunicorn.conf.py"),
+                "--bind", f"127.0.0.1:{port}",
+                "--workers", "1",
+            ],
+            env=env,
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            while True:
+                if time.perf_counter() - started > timeout:
+                    raise CommandError(
+                        f"gunicorn did not answer within {timeout}s"
+                    )
+                try:
+                    self.fetch(url, timeout)
+                except OSError:
+                    time.sleep(0.01)
+                    continue
+                first = time.perf_counter() - started
+                break
+
+            request_started = time.perf_counter()
+            self.fetch(url, timeout)
+            return first, time.perf_counter() - request_started
+        finally:
+            server.terminate()
+            server.wait()
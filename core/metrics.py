@@ -0,0 +1,127 @@
+"""Prometheus metrics for capacity planning.
+
+Every process accumulates its own samples. Under gunicorn, set
+``PROMETHEUS_MULTIPROC_DIR`` to an empty writable directory. Each worker
+then writes its samples to memory-mapped files there, and ``/metrics``
+sums them across workers (see ``gunicorn.conf.py``).
+"""
+import os
+
+from django.apps import apps
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+# Label for requests that did not resolve to a named URL (404s).
+UNRESOLVED = "<unresolved>"
+
+REQUEST_LATENCY = Histogram(
+    "pulseboard_request_duration_seconds",
+    "Time spent handling a request, by URL name.",
+    ["view", "method"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    "pulseboard_requests_total",
+    "Responses sent, by URL name and status class.",
+    ["view", "method", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "pulseboard_request_db_queries",
+    "Database queries run while handling a request, by URL name.",
+    ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+REQUEST_DB_TIME = Histogram(
+    "pulseboard_request_db_duration_seconds",
+    "Time spent in the database while handling a request, by URL name.",
+    ["view"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+QUERY_LATENCY = Histogram(
+    "pulseboard_db_query_duration_seconds",
+    "Duration of single database queries, by database alias.",
+    ["alias"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1),
+)
+QUERY_ERRORS = Counter(
+    "pulseboard_db_query_errors_total",
+    "Database queries that raised, by database alias.",
+    ["alias"],
+)
+CACHE_REQUESTS = Counter(
+    "pulseboard_cache_requests_total",
+    "Cache lookups, by cached object and result.",
+    ["cache", "result"],
+)
+WORKER_EVENTS = Counter(
+    "pulseboard_gunicorn_worker_events_total",
+    "Gunicorn worker lifecycle events (boot, exit, abort).",
+    ["event"],
+)
+JOBS = Counter(
+    "pulseboard_jobs_total",
+    "Background job runs, by job name and outcome.",
+    ["job", "outcome"],
+)
+JOB_DURATION = Histogram(
+    "pulseboard_job_duration_seconds",
+    "Time spent running a background job, by job name.",
+    ["job"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 300, 900, 3600),
+)
+
+# Models whose row counts are exported on every scrape.
+SIZED_MODELS = ("core.Task", "core.ArchivedTask", "core.Worker")
+
+
+def cache_lookup(cache, hit):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+class TableSizeCollector:
+    """Row counts of ``SIZED_MODELS``, read at scrape time."""
+
+    def describe(self):
+        return [self.family()]
+
+    def collect(self):
+        family = self.family()
+        for label in SIZED_MODELS:
+            model = apps.get_model(label)
+            family.add_metric(
+                [model._meta.db_table], model._default_manager.count()
+            )
+        yield family
+
+    @staticmethod
+    def family():
+        return GaugeMetricFamily(
+            "pulseboard_table_rows",
+            "Number of rows per table.",
+            labels=["table"],
+        )
+
+
+def multiprocess_enabled():
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render():
+    """Return ``(body, content_type)`` for the ``/metrics`` response."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(TableSizeCollector())
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    table_sizes = CollectorRegistry()
+    table_sizes.register(TableSizeCollector())
+    body = generate_latest(REGISTRY) + generate_latest(table_sizes)
+    return body, CONTENT_TYPE_LATEST
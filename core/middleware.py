@@ -0,0 +1,111 @@
+import time
+
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.cache import add_never_cache_headers
+
+from core import dbmetrics, metrics, profiling
+from core.audit import audit_context
+from core.mixins import pin_to_primary
+from core.routers import replica_configured
+from core.models import TaskAuditEvent
+
+
+class TaskAuditMiddleware:
+    """Collect task audit events per request and write them in one go."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD", "OPTIONS"):
+            return self.get_response(request)
+
+        if request.path.startswith(reverse("admin:index")):
+            source = TaskAuditEvent.SOURCE_ADMIN
+        else:
+            source = TaskAuditEvent.SOURCE_WEB
+
+        with audit_context(actor=request.user, source=source):
+            return self.get_response(request)
+
+
+class ReplicaPinMiddleware:
+    """Pin a session to the primary database after it writes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (replica_configured()
+                and request.method not in ("GET", "HEAD", "OPTIONS", "TRACE")
+                and hasattr(request, "session")
+                and response.status_code < 400):
+            pin_to_primary(request)
+        return response
+
+
+class RequestMetricsMiddleware:
+    """Record latency and database usage of each request by URL name."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with dbmetrics.track_queries() as queries:
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else metrics.UNRESOLVED
+        metrics.REQUEST_LATENCY.labels(view, request.method).observe(elapsed)
+        metrics.REQUESTS.labels(
+            view, request.method, f"{response.status_code // 100}xx"
+        ).inc()
+        metrics.REQUEST_QUERIES.labels(view).observe(queries["queries"])
+        metrics.REQUEST_DB_TIME.labels(view).observe(queries["seconds"])
+        return response
+
+
+class RequestProfilerMiddleware:
+    """Profile a single view for staff on request (see core.profiling).
+
+    Must come last so that every other ``process_view`` hook, CSRF
+    checks included, still runs.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        mode = profiling.requested_mode(request)
+        if mode is None:
+            return None
+
+        # A 304 would skip exactly the work that is being profiled.
+        request.META.pop("HTTP_IF_NONE_MATCH", None)
+        request.META.pop("HTTP_IF_MODIFIED_SINCE", None)
+
+        def call_view():
+            response = view_func(request, *view_args, **view_kwargs)
+            if callable(getattr(response, "render", None)):
+                response = response.render()
+            return response
+
+        summary = profiling.profile_call(request, mode, call_view)
+        if summary is None:
+            return HttpResponse(
+                "Another request is being profiled, try again.",
+                status=409,
+                content_type="text/plain",
+            )
+        response = HttpResponse(
+            summary, content_type="text/plain; charset=utf-8"
+        )
+        add_never_cache_headers(response)
+        return response
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:00
+
+import django.db.models.expressions
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_task_counts(apps, schema_editor):
+    Worker = apps.get_model("core", "Worker")
+    workers = Worker.objects.annotate(
+        actual_open=Count("tasks", filter=Q(tasks__is_completed=False)),
+        actual_completed=Count("tasks", filter=Q(tasks__is_completed=True)),
+    )
+    batch = []
+    for worker in workers.iterator(chunk_size=2000):
+        worker.open_task_count = worker.actual_open
+        worker.completed_task_count = worker.actual_completed
+        batch.append(worker)
+    Worker.objects.bulk_update(
+        batch, ["open_task_count", "completed_task_count"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("core", "0002_dataversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="worker",
+            name="completed_task_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Completed Tasks"
+            ),
+        ),
+        migrations.AddField(
+            model_name="worker",
+            name="open_task_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Open Tasks"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="worker",
+            index=models.Index(
+                models.OrderBy(
+                    django.db.models.expressions.CombinedExpression(
+                        models.F("open_task_count"),
+                        "+",
+                        models.F("completed_task_count"),
+                    ),
+                    descending=True,
+                ),
+                name="core_worker_task_count_idx",
+            ),
+        ),
+        migrations.RunPython(populate_task_counts, migrations.RunPython.noop),
+    ]
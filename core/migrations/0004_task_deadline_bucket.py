@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:01
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+from django.utils import timezone
+
+
+def populate_deadline_buckets(apps, schema_editor):
+    Task = apps.get_model("core", "Task")
+    today = timezone.localdate()
+    Task.objects.update(
+        deadline_bucket=Case(
+            When(deadline__lt=today, is_completed=False, then=Value("overdue")),
+            When(deadline__lt=today, then=Value("past")),
+            When(deadline=today, then=Value("today")),
+            When(
+                deadline__lte=today + datetime.timedelta(days=3),
+                then=Value("next_3_days"),
+            ),
+            When(
+                deadline__lte=today + datetime.timedelta(days=7),
+                then=Value("next_week"),
+            ),
+            default=Value("later"),
+        )
+    )
+    # Buckets are not marked as current: rows loaded after this migration
+    # (fixtures, imports) are only trusted once ``bucket_deadlines`` has
+    # run.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_worker_task_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="deadline_bucket",
+            field=models.CharField(
+                choices=[
+                    ("past", "Past"),
+                    ("overdue", "Overdue"),
+                    ("today", "Today"),
+                    ("next_3_days", "In 1-3 days"),
+                    ("next_week", "In 4-7 days"),
+                    ("later", "Later"),
+                ],
+                db_index=True,
+                default="later",
+                editable=False,
+                max_length=16,
+                verbose_name="Deadline Bucket",
+            ),
+        ),
+        migrations.RunPython(populate_deadline_buckets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_task_deadline_bucket"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskStatsSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                ("total", models.PositiveIntegerField(default=0, verbose_name="Total")),
+                (
+                    "completed",
+                    models.PositiveIntegerField(default=0, verbose_name="Completed"),
+                ),
+                (
+                    "overdue",
+                    models.PositiveIntegerField(default=0, verbose_name="Overdue"),
+                ),
+                (
+                    "by_priority",
+                    models.JSONField(default=dict, verbose_name="By Priority"),
+                ),
+                ("by_type", models.JSONField(default=dict, verbose_name="By Type")),
+                (
+                    "worker",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats_snapshots",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Worker",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Task Stats Snapshot",
+                "verbose_name_plural": "Task Stats Snapshots",
+                "ordering": ["date"],
+                "indexes": [
+                    models.Index(
+                        fields=["worker", "date"], name="core_stats_worker_date_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("worker__isnull", True)),
+                        fields=("date",),
+                        name="core_stats_unique_team_date",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("worker__isnull", False)),
+                        fields=("worker", "date"),
+                        name="core_stats_unique_worker_date",
+                    ),
+                ],
+            },
+        ),
+    ]
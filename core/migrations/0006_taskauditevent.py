@@ -0,0 +1,85 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:04
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_taskstatssnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskAuditEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("web", "Web"),
+                            ("admin", "Admin"),
+                            ("bulk", "Bulk"),
+                            ("system", "System"),
+                        ],
+                        default="system",
+                        max_length=16,
+                        verbose_name="Source",
+                    ),
+                ),
+                ("field", models.CharField(max_length=64, verbose_name="Field")),
+                ("old_value", models.TextField(blank=True, verbose_name="Old Value")),
+                ("new_value", models.TextField(blank=True, verbose_name="New Value")),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Changed At"
+                    ),
+                ),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="task_audit_events",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Changed By",
+                    ),
+                ),
+                (
+                    "task",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="audit_events",
+                        to="core.task",
+                        verbose_name="Task",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Task Audit Event",
+                "verbose_name_plural": "Task Audit Events",
+                "ordering": ["-created_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["task", "created_at"],
+                        name="core_audit_task_created_idx",
+                    )
+                ],
+            },
+        ),
+    ]
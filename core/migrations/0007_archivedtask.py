@@ -0,0 +1,79 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:13
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_taskauditevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(
+                        primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, verbose_name="Task Name")),
+                ("description", models.TextField(verbose_name="Task Description")),
+                ("deadline", models.DateField(verbose_name="Task Deadline")),
+                (
+                    "is_completed",
+                    models.BooleanField(default=True, verbose_name="Is Completed"),
+                ),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("urgent", "Urgent"),
+                            ("high", "High"),
+                            ("medium", "Medium"),
+                            ("low", "Low"),
+                        ],
+                        default="medium",
+                        max_length=255,
+                        verbose_name="Task Priority",
+                    ),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Archived At"
+                    ),
+                ),
+                (
+                    "assignees",
+                    models.ManyToManyField(
+                        blank=True,
+                        related_name="archived_tasks",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Assigned To",
+                    ),
+                ),
+                (
+                    "task_type",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_tasks",
+                        to="core.tasktype",
+                        verbose_name="Task Type",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived Task",
+                "verbose_name_plural": "Archived Tasks",
+                "ordering": ["-id"],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:19
+
+from django.db import migrations, models
+
+TRIGRAM_INDEX = "core_worker_search_trgm_idx"
+
+
+def populate_search_name(apps, schema_editor):
+    Worker = apps.get_model("core", "Worker")
+    batch = []
+    for worker in Worker.objects.iterator(chunk_size=2000):
+        worker.search_name = " ".join(
+            " ".join(
+                [worker.first_name, worker.last_name, worker.username]
+            ).casefold().split()
+        )
+        batch.append(worker)
+    Worker.objects.bulk_update(batch, ["search_name"], batch_size=500)
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} "
+        "ON core_worker USING gin (search_name gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_archivedtask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="worker",
+            name="search_name",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=512,
+                verbose_name="Search Name",
+            ),
+        ),
+        migrations.RunPython(
+            populate_search_name, migrations.RunPython.noop
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:22
+
+from django.db import migrations, models
+from django.db.models import Case, Max, Value, When
+
+BATCH_SIZE = 10000
+
+
+def populate_priority_ranks(apps, schema_editor):
+    # New rows default to "medium"; walk the table in id ranges so each
+    # UPDATE stays short on large tables.
+    Task = apps.get_model("core", "Task")
+    rank = Case(
+        When(priority="urgent", then=Value(0)),
+        When(priority="high", then=Value(1)),
+        When(priority="low", then=Value(3)),
+        default=Value(2),
+    )
+    last_id = Task.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        Task.objects.filter(
+            id__gte=start,
+            id__lt=start + BATCH_SIZE,
+        ).exclude(priority="medium").update(priority_rank=rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_worker_search_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="priority_rank",
+            field=models.PositiveSmallIntegerField(
+                default=2, editable=False, verbose_name="Priority Rank"
+            ),
+        ),
+        migrations.RunPython(
+            populate_priority_ranks, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["priority_rank", "id"], name="core_task_priority_rank_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["deadline", "id"], name="core_task_deadline_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["name", "id"], name="core_task_name_idx"),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_job"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["priority_rank", "deadline", "id"],
+                name="core_task_board_idx",
+            ),
+        ),
+    ]
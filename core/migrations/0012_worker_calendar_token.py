@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_task_board_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="worker",
+            name="calendar_token",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=64,
+                null=True,
+                unique=True,
+                verbose_name="Calendar Token",
+            ),
+        ),
+    ]
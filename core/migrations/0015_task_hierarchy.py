@@ -0,0 +1,76 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_task_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="subtasks",
+                to="core.task",
+                verbose_name="Parent Task",
+            ),
+        ),
+        migrations.CreateModel(
+            name="TaskClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("depth", models.PositiveIntegerField(verbose_name="Depth")),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_links",
+                        to="core.task",
+                        verbose_name="Ancestor",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_links",
+                        to="core.task",
+                        verbose_name="Descendant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Task Closure",
+                "verbose_name_plural": "Task Closures",
+                "indexes": [
+                    models.Index(
+                        fields=["descendant", "depth"], name="core_taskclosure_up_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ancestor", "descendant"),
+                        name="core_taskclosure_pair_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
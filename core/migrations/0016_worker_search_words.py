@@ -0,0 +1,83 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_search_words(apps, schema_editor):
+    # Also fills ``search_name`` for workers loaded from fixtures, which
+    # never went through ``save()``.
+    Worker = apps.get_model("core", "Worker")
+    WorkerSearchWord = apps.get_model("core", "WorkerSearchWord")
+    workers, words = [], []
+    for worker in Worker.objects.iterator(chunk_size=2000):
+        worker.search_name = " ".join(
+            " ".join(
+                [worker.first_name, worker.last_name, worker.username]
+            ).casefold().split()
+        )
+        workers.append(worker)
+        words.extend(
+            WorkerSearchWord(worker_id=worker.pk, word=word)
+            for word in set(worker.search_name.split())
+        )
+    Worker.objects.bulk_update(workers, ["search_name"], batch_size=500)
+    WorkerSearchWord.objects.bulk_create(words, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0015_task_hierarchy"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="worker",
+            managers=[],
+        ),
+        migrations.AlterField(
+            model_name="worker",
+            name="search_name",
+            field=models.CharField(
+                default="", editable=False, max_length=512, verbose_name="Search Name"
+            ),
+        ),
+        migrations.CreateModel(
+            name="WorkerSearchWord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("word", models.CharField(max_length=512, verbose_name="Word")),
+                (
+                    "worker",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_words",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Worker",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Worker Search Word",
+                "verbose_name_plural": "Worker Search Words",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("word", "worker"), name="core_workersearchword_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            populate_search_words, migrations.RunPython.noop
+        ),
+    ]
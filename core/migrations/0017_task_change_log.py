@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:14
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0016_worker_search_words"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_id", models.BigIntegerField(verbose_name="Task ID")),
+                (
+                    "changed_at",
+                    models.DateTimeField(
+                        db_index=True,
+                        default=django.utils.timezone.now,
+                        verbose_name="Changed At",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Task Change",
+                "verbose_name_plural": "Task Changes",
+            },
+        ),
+        migrations.DeleteModel(
+            name="TaskTombstone",
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="core_task_updated_idx",
+        ),
+    ]
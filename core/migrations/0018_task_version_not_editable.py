@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0017_task_change_log"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="task",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1, editable=False, verbose_name="Version"
+            ),
+        ),
+    ]
@@ -0,0 +1,109 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.middleware.csrf import get_token
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from core.models import DataVersion
+from core.routers import replica_reads
+
+PRIMARY_PIN_SESSION_KEY = "_primary_pinned_until"
+
+
+def pin_to_primary(request):
+    request.session[PRIMARY_PIN_SESSION_KEY] = (
+        time.time() + settings.REPLICA_PIN_SECONDS
+    )
+
+
+def is_pinned_to_primary(request):
+    pinned_until = request.session.get(PRIMARY_PIN_SESSION_KEY)
+    return pinned_until is not None and pinned_until > time.time()
+
+
+class ConditionalGetMixin:
+    """Answer repeated GETs with ``304 Not Modified`` without rendering.
+
+    The ETag is derived from the ``DataVersion`` counters the page
+    depends on, so checking it costs a single primary-key lookup.
+    """
+
+    version_keys = (
+        DataVersion.TASKS,
+        DataVersion.WORKERS,
+        DataVersion.CATALOG,
+    )
+
+    def get_etag_parts(self, versions):
+        request = self.request
+        # Make sure the CSRF secret exists before it is hashed below, so
+        # the first response carries the same ETag as later ones.
+        get_token(request)
+        return [
+            request.resolver_match.view_name if request.resolver_match
+            else request.path,
+            request.get_full_path(),
+            str(request.user.pk),
+            # A new CSRF secret (e.g. after logging in again) must not
+            # revive a cached page carrying a token for the old one.
+            request.META.get("CSRF_COOKIE", ""),
+            # Overdue and deadline badges depend on the current date.
+            timezone.localdate().isoformat(),
+            *(f"{key}:{versions[key]}" for key in sorted(versions)),
+        ]
+
+    def get(self, request, *args, **kwargs):
+        versions, last_modified = DataVersion.snapshot(self.version_keys)
+        # Kept for views that key their own caches on the same counters.
+        self.data_versions = versions
+        # Pages change at midnight even when the data does not.
+        start_of_day = timezone.localtime().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        if last_modified is None or last_modified < start_of_day:
+            last_modified = start_of_day
+        digest = hashlib.sha1(
+            "|".join(self.get_etag_parts(versions)).encode()
+        ).hexdigest()
+        etag = quote_etag(digest)
+        last_modified_ts = int(last_modified.timestamp())
+
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified_ts,
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+            response.headers.setdefault(
+                "Last-Modified", http_date(last_modified_ts)
+            )
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ReplicaReadMixin:
+    """Serve safe requests from the read replica.
+
+    A user who has just written something is pinned to the primary for
+    ``REPLICA_PIN_SECONDS`` (see ``ReplicaPinMiddleware``) so they always
+    read their own writes.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if (request.method not in ("GET", "HEAD")
+                or is_pinned_to_primary(request)):
+            return super().dispatch(request, *args, **kwargs)
+
+        with replica_reads():
+            response = super().dispatch(request, *args, **kwargs)
+            # Template responses run their queries while rendering.
+            if hasattr(response, "render") and callable(response.render):
+                response.render()
+        return response
@@ -1,5 +1,12 @@
-from django.contrib.auth.models import AbstractUser
-from django.db import models
+import contextlib
+
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.core.exceptions import ValidationError
+from django.db import models, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.search import normalize_search_text
 
 
 class Position(models.Model):
@@ -34,6 +41,21 @@ class TaskType(models.Model):
         return self.name
 
 
+class WorkerManager(UserManager):
+    # Historical models in migrations lack ``build_search_name()``, so
+    # they keep the plain manager.
+    use_in_migrations = False
+
+    def bulk_create(self, workers, *args, **kwargs):
+        # Neither ``save()`` nor its signals run for these.
+        workers = list(workers)
+        for worker in workers:
+            worker.search_name = worker.build_search_name()
+        workers = super().bulk_create(workers, *args, **kwargs)
+        WorkerSearchWord.index(workers)
+        return workers
+
+
 class Worker(AbstractUser):
     position = models.ForeignKey(
         Position,
@@ -43,6 +65,38 @@ class Worker(AbstractUser):
         verbose_name="Position",
         related_name="workers"
     )
+    open_task_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Open Tasks"
+    )
+    completed_task_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Completed Tasks"
+    )
+    # Backs ``core.search``. The trigram index it needs on PostgreSQL is
+    # created by migration 0008 rather than declared here, because other
+    # backends cannot build it; they search ``WorkerSearchWord`` instead.
+    search_name = models.CharField(
+        max_length=512,
+        default="",
+        editable=False,
+        verbose_name="Search Name"
+    )
+    # Secret part of the worker's calendar feed URLs; see ``core.ical``.
+    calendar_token = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Calendar Token"
+    )
+
+    SEARCH_NAME_FIELDS = ("first_name", "last_name", "username")
+
+    objects = WorkerManager()
 
     class Meta:
         verbose_name = "Worker"
@@ -52,6 +106,12 @@ class Worker(AbstractUser):
             "first_name",
             "username"
         ]
+        indexes = [
+            models.Index(
+                (F("open_task_count") + F("completed_task_count")).desc(),
+                name="core_worker_task_count_idx",
+            ),
+        ]
 
     def __str__(self):
         first_name = self.first_name or "N/A"
@@ -60,8 +120,129 @@ class Worker(AbstractUser):
 
         return f"{first_name} {last_name} ({self.username}) - {position}"
 
+    @property
+    def task_count(self):
+        return self.open_task_count + self.completed_task_count
+
+    def save(self, *args, **kwargs):
+        # ``search_name`` is set by the ``pre_save`` receiver, and its
+        # words indexed by the ``post_save`` one.
+        update_fields = kwargs.get("update_fields")
+        if (update_fields is not None
+                and set(update_fields) & set(self.SEARCH_NAME_FIELDS)):
+            kwargs["update_fields"] = {*update_fields, "search_name"}
+        super().save(*args, **kwargs)
+
+    def build_search_name(self):
+        return normalize_search_text(
+            *(getattr(self, name) or "" for name in self.SEARCH_NAME_FIELDS)
+        )
+
+
+class WorkerSearchWord(models.Model):
+    """One word of a worker's ``search_name``.
+
+    Prefix searches become a range scan of the ``(word, worker)`` index,
+    which a ``LIKE`` on the whole name cannot use.
+    """
+
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.CASCADE,
+        verbose_name="Worker",
+        related_name="search_words"
+    )
+    word = models.CharField(
+        max_length=512,
+        verbose_name="Word"
+    )
+
+    class Meta:
+        verbose_name = "Worker Search Word"
+        verbose_name_plural = "Worker Search Words"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["word", "worker"],
+                name="core_workersearchword_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return self.word
+
+    @classmethod
+    def index(cls, workers):
+        """Replace the words of ``workers`` with those of their names."""
+        cls.objects.filter(worker__in=[w.pk for w in workers]).delete()
+        cls.objects.bulk_create(
+            (
+                cls(worker_id=worker.pk, word=word)
+                for worker in workers
+                for word in set(worker.search_name.split())
+            ),
+            batch_size=1000,
+        )
+
+
+class VersionConflict(Exception):
+    """A compare-and-swap save found the row at another version."""
+
+    def __init__(self, task_id, expected_version):
+        super().__init__(
+            f"Task {task_id} is no longer at version {expected_version}"
+        )
+        self.task_id = task_id
+
+
+class TaskManager(models.Manager):
+    def bulk_create(self, tasks, *args, **kwargs):
+        # Neither ``pre_save`` nor ``post_save`` is sent for these.
+        # Imported here: core.sync imports this module.
+        from core.sync import log_changes
+
+        tasks = list(tasks)
+        for task in tasks:
+            task.derive_columns()
+        with transaction.atomic(using=self.db, savepoint=False):
+            tasks = super().bulk_create(tasks, *args, **kwargs)
+            log_changes(task.pk for task in tasks)
+        return tasks
+
 
 class Task(models.Model):
+    BUCKET_PAST = "past"
+    BUCKET_OVERDUE = "overdue"
+    BUCKET_TODAY = "today"
+    BUCKET_NEXT_3_DAYS = "next_3_days"
+    BUCKET_NEXT_WEEK = "next_week"
+    BUCKET_LATER = "later"
+
+    DEADLINE_BUCKET_CHOICES = [
+        (BUCKET_PAST, "Past"),
+        (BUCKET_OVERDUE, "Overdue"),
+        (BUCKET_TODAY, "Today"),
+        (BUCKET_NEXT_3_DAYS, "In 1-3 days"),
+        (BUCKET_NEXT_WEEK, "In 4-7 days"),
+        (BUCKET_LATER, "Later"),
+    ]
+
+    # Severity order for sorting; lower ranks are more urgent.
+    PRIORITY_RANKS = {
+        "urgent": 0,
+        "high": 1,
+        "medium": 2,
+        "low": 3,
+    }
+
+    TRACKED_FIELDS = (
+        "name",
+        "deadline",
+        "is_completed",
+        "priority",
+        "task_type_id",
+        "parent_id",
+    )
+
     name = models.CharField(
         max_length=255,
         verbose_name="Task Name"
@@ -76,6 +257,16 @@ class Task(models.Model):
         default=False,
         verbose_name="Is Completed"
     )
+    # Subtasks of a deleted or archived task become top-level tasks. The
+    # full hierarchy is kept in ``TaskClosure`` (see ``core.hierarchy``).
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name="Parent Task",
+        related_name="subtasks"
+    )
     priority = models.CharField(
         max_length=255,
         choices=[
@@ -87,6 +278,11 @@ class Task(models.Model):
         default="medium",
         verbose_name="Task Priority"
     )
+    priority_rank = models.PositiveSmallIntegerField(
+        default=2,
+        editable=False,
+        verbose_name="Priority Rank"
+    )
     task_type = models.ForeignKey(
         TaskType,
         on_delete=models.SET_NULL,
@@ -101,12 +297,666 @@ class Task(models.Model):
         verbose_name="Assigned To",
         related_name="tasks"
     )
+    deadline_bucket = models.CharField(
+        max_length=16,
+        choices=DEADLINE_BUCKET_CHOICES,
+        default=BUCKET_LATER,
+        editable=False,
+        db_index=True,
+        verbose_name="Deadline Bucket"
+    )
+    # Set on every save, bulk edit and assignee change, which are also
+    # logged for ``core.sync``. Deadline bucket updates do not count as
+    # changes.
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        verbose_name="Updated At"
+    )
+    # Moved on by every change to the row or its assignees; see ``save``.
+    version = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        verbose_name="Version"
+    )
+
+    objects = TaskManager()
 
     class Meta:
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
         ordering = ["-id"]
+        # One per sortable task list column, with the id as tie-breaker so
+        # that pages are stable; scanned backwards for descending sorts.
+        indexes = [
+            models.Index(
+                fields=["priority_rank", "id"],
+                name="core_task_priority_rank_idx",
+            ),
+            models.Index(
+                fields=["deadline", "id"],
+                name="core_task_deadline_idx",
+            ),
+            models.Index(
+                fields=["name", "id"],
+                name="core_task_name_idx",
+            ),
+            # Open task columns of the board (core.board).
+            models.Index(
+                fields=["priority_rank", "deadline", "id"],
+                condition=models.Q(is_completed=False),
+                name="core_task_board_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_tracked_values()
+        return instance
+
+    def remember_tracked_values(self):
+        # Kept so that signal handlers can diff a save against the row as
+        # it was loaded without re-reading it.
+        self._loaded_values = {
+            attname: self.__dict__[attname]
+            for attname in self.TRACKED_FIELDS
+            if attname in self.__dict__
+        }
+
+    def changed_tracked_values(self):
+        """Return ``{attname: (old, new)}`` for tracked fields."""
+        loaded = getattr(self, "_loaded_values", {})
+        return {
+            attname: (old, getattr(self, attname))
+            for attname, old in loaded.items()
+            if old != getattr(self, attname)
+        }
+
+    def save(self, *args, expected_version=None, **kwargs):
+        """Save the task, moving ``version`` on in the same ``UPDATE``.
+
+        With ``expected_version`` the update is a compare-and-swap: it
+        only applies if the row is still at that version, and raises
+        ``VersionConflict`` otherwise. Without it the stored version is
+        incremented in SQL and ``self.version`` is left as it was.
+        """
+        moved = "parent_id" in self.changed_tracked_values()
+        if moved and self.parent_would_cycle():
+            raise ValueError(
+                f"Task {self.parent_id} is task {self.pk} or one of its "
+                f"subtasks"
+            )
+        # ``deadline_bucket`` and ``priority_rank`` are set by the
+        # ``pre_save`` receiver (see ``derive_columns``).
+        self.updated_at = timezone.now()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields, "deadline_bucket", "priority_rank",
+                "updated_at", "version",
+            }
+        self._expected_version = expected_version
+        # ``post_save`` logs the change for ``core.sync`` and relinks the
+        # subtree of a new parent; they commit together with the row.
+        relinked = moved or (self._state.adding and self.parent_id)
+        using = kwargs.get("using") or router.db_for_write(
+            type(self), instance=self
+        )
+        block = contextlib.nullcontext()
+        if relinked or not transaction.get_connection(using).in_atomic_block:
+            block = transaction.atomic(using=using)
+        try:
+            with block:
+                super().save(*args, **kwargs)
+        finally:
+            self._expected_version = None
+        if expected_version is not None:
+            self.version = expected_version + 1
+        self.remember_tracked_values()
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields,
+                   forced_update):
+        expected = getattr(self, "_expected_version", None)
+        if expected is not None:
+            base_qs = base_qs.filter(version=expected)
+        values = [
+            (field, model, F("version") + 1)
+            if field.attname == "version" else (field, model, value)
+            for field, model, value in values
+        ]
+        updated = super()._do_update(
+            base_qs, using, pk_val, values, update_fields, forced_update
+        )
+        if not updated and expected is not None:
+            raise VersionConflict(pk_val, expected)
+        return updated
+
+    def parent_would_cycle(self):
+        """Whether ``parent`` is this task or lies in its subtree."""
+        if self.parent_id is None or self.pk is None:
+            return False
+        return self.parent_id == self.pk or TaskClosure.objects.filter(
+            ancestor_id=self.pk, descendant_id=self.parent_id
+        ).exists()
+
+    def clean(self):
+        if self.parent_would_cycle():
+            raise ValidationError({
+                "parent": "A task cannot be a subtask of itself or of "
+                          "one of its subtasks.",
+            })
+
+    def derive_columns(self, today=None):
+        """Set the columns computed from other fields.
+
+        Runs on every save, raw ones from ``loaddata`` included, and for
+        ``Task.objects.bulk_create``.
+        """
+        self.deadline_bucket = self.compute_deadline_bucket(today)
+        self.priority_rank = self.PRIORITY_RANKS.get(self.priority, 2)
+
+    def compute_deadline_bucket(self, today=None):
+        """Place the task into a deadline horizon relative to ``today``.
+
+        Must agree with ``core.deadlines.bucket_expression``.
+        """
+        if today is None:
+            today = timezone.localdate()
+        deadline = self._meta.get_field("deadline").to_python(self.deadline)
+        days_left = (deadline - today).days
+        if days_left < 0:
+            if self.is_completed:
+                return self.BUCKET_PAST
+            return self.BUCKET_OVERDUE
+        if days_left == 0:
+            return self.BUCKET_TODAY
+        if days_left <= 3:
+            return self.BUCKET_NEXT_3_DAYS
+        if days_left <= 7:
+            return self.BUCKET_NEXT_WEEK
+        return self.BUCKET_LATER
+
+    is_archived = False
 
     def __str__(self):
         task_type_str = self.task_type.name if self.task_type else "N/A"
         return f"{self.name} [{self.priority}] - {task_type_str}"
+
+
+class TaskClosure(models.Model):
+    """Links a task to one of its ancestors, ``depth`` levels up.
+
+    Holds a row for every ancestor at any depth, and none for top-level
+    tasks; maintained by ``core.hierarchy``.
+    """
+
+    # Not indexed on their own: the unique pair and the ``up`` index
+    # lead with them.
+    ancestor = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name="Ancestor",
+        related_name="descendant_links"
+    )
+    descendant = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name="Descendant",
+        related_name="ancestor_links"
+    )
+    depth = models.PositiveIntegerField(
+        verbose_name="Depth"
+    )
+
+    class Meta:
+        verbose_name = "Task Closure"
+        verbose_name_plural = "Task Closures"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"],
+                name="core_taskclosure_pair_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["descendant", "depth"],
+                name="core_taskclosure_up_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"Task #{self.descendant_id} is {self.depth} level(s) below "
+            f"#{self.ancestor_id}"
+        )
+
+
+class ArchivedTask(models.Model):
+    """A completed task moved out of ``Task`` by ``archive_tasks``.
+
+    Keeps the id it had as a task, so links and audit history still
+    resolve. Rows are read-only; nothing moves them back.
+    """
+
+    id = models.BigIntegerField(  # noqa: VNE003
+        primary_key=True,
+        verbose_name="ID"
+    )
+    name = models.CharField(
+        max_length=255,
+        verbose_name="Task Name"
+    )
+    description = models.TextField(
+        verbose_name="Task Description"
+    )
+    deadline = models.DateField(
+        verbose_name="Task Deadline"
+    )
+    is_completed = models.BooleanField(
+        default=True,
+        verbose_name="Is Completed"
+    )
+    priority = models.CharField(
+        max_length=255,
+        choices=Task._meta.get_field("priority").choices,
+        default="medium",
+        verbose_name="Task Priority"
+    )
+    task_type = models.ForeignKey(
+        TaskType,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name="Task Type",
+        related_name="archived_tasks"
+    )
+    assignees = models.ManyToManyField(
+        Worker,
+        blank=True,
+        verbose_name="Assigned To",
+        related_name="archived_tasks"
+    )
+    archived_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Archived At"
+    )
+
+    # Columns copied verbatim from ``Task``.
+    COPIED_FIELDS = (
+        "id",
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "priority",
+        "task_type_id",
+    )
+
+    is_archived = True
+
+    class Meta:
+        verbose_name = "Archived Task"
+        verbose_name_plural = "Archived Tasks"
+        ordering = ["-id"]
+
+    def __str__(self):
+        task_type_str = self.task_type.name if self.task_type else "N/A"
+        return f"{self.name} [{self.priority}] - {task_type_str}"
+
+
+class TaskChange(models.Model):
+    """A write to a task, or its removal; the log ``core.sync`` reads.
+
+    Rows are added in the transaction that changes the task, and their
+    ids are the cursors of mirrors. Rows older than
+    ``SYNC_CHANGE_LOG_DAYS`` are pruned.
+    """
+
+    task_id = models.BigIntegerField(
+        verbose_name="Task ID"
+    )
+    changed_at = models.DateTimeField(
+        default=timezone.now,
+        db_index=True,
+        verbose_name="Changed At"
+    )
+
+    class Meta:
+        verbose_name = "Task Change"
+        verbose_name_plural = "Task Changes"
+
+    def __str__(self):
+        return f"Task #{self.task_id} changed at {self.changed_at}"
+
+
+class DataVersion(models.Model):
+    """Monotonic change counter for a group of tables.
+
+    Views use these counters as cheap HTTP validators instead of
+    rendering a page to find out whether it has changed.
+    """
+
+    TASKS = "tasks"
+    WORKERS = "workers"
+    CATALOG = "catalog"
+
+    key = models.CharField(
+        max_length=64,
+        primary_key=True,
+        verbose_name="Key"
+    )
+    version = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Version"
+    )
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Updated At"
+    )
+
+    class Meta:
+        verbose_name = "Data Version"
+        verbose_name_plural = "Data Versions"
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+
+    @classmethod
+    def bump(cls, *keys):
+        now = timezone.now()
+        for key in keys:
+            updated = cls.objects.filter(key=key).update(
+                version=F("version") + 1,
+                updated_at=now,
+            )
+            if not updated:
+                cls.objects.get_or_create(
+                    key=key,
+                    defaults={"version": 1, "updated_at": now},
+                )
+
+    @classmethod
+    def snapshot(cls, keys):
+        """Return ``({key: version}, latest updated_at)`` for ``keys``."""
+        versions = {key: 0 for key in keys}
+        last_modified = None
+        for row in cls.objects.filter(key__in=keys):
+            versions[row.key] = row.version
+            if last_modified is None or row.updated_at > last_modified:
+                last_modified = row.updated_at
+        return versions, last_modified
+
+
+class TaskStatsSnapshot(models.Model):
+    """Daily task counters for the whole team or a single worker.
+
+    Rows with an empty ``worker`` hold team totals. Priority and type
+    breakdowns are stored as ``{label: count}`` maps to keep a year of
+    history at a few hundred rows per scope.
+    """
+
+    date = models.DateField(
+        verbose_name="Date"
+    )
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name="Worker",
+        related_name="stats_snapshots"
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Total"
+    )
+    completed = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Completed"
+    )
+    overdue = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Overdue"
+    )
+    by_priority = models.JSONField(
+        default=dict,
+        verbose_name="By Priority"
+    )
+    by_type = models.JSONField(
+        default=dict,
+        verbose_name="By Type"
+    )
+
+    class Meta:
+        verbose_name = "Task Stats Snapshot"
+        verbose_name_plural = "Task Stats Snapshots"
+        ordering = ["date"]
+        indexes = [
+            models.Index(
+                fields=["worker", "date"],
+                name="core_stats_worker_date_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date"],
+                condition=models.Q(worker__isnull=True),
+                name="core_stats_unique_team_date",
+            ),
+            models.UniqueConstraint(
+                fields=["worker", "date"],
+                condition=models.Q(worker__isnull=False),
+                name="core_stats_unique_worker_date",
+            ),
+        ]
+
+    def __str__(self):
+        scope = self.worker.username if self.worker else "team"
+        return f"{scope} @ {self.date}"
+
+
+class TaskAuditEvent(models.Model):
+    """A single field-level change to a task.
+
+    Rows are only ever appended. The task link carries no database
+    constraint so that history outlives deleted tasks.
+    """
+
+    SOURCE_WEB = "web"
+    SOURCE_ADMIN = "admin"
+    SOURCE_BULK = "bulk"
+    SOURCE_SYSTEM = "system"
+
+    SOURCE_CHOICES = [
+        (SOURCE_WEB, "Web"),
+        (SOURCE_ADMIN, "Admin"),
+        (SOURCE_BULK, "Bulk"),
+        (SOURCE_SYSTEM, "System"),
+    ]
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        verbose_name="Task",
+        related_name="audit_events"
+    )
+    actor = models.ForeignKey(
+        Worker,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name="Changed By",
+        related_name="task_audit_events"
+    )
+    source = models.CharField(
+        max_length=16,
+        choices=SOURCE_CHOICES,
+        default=SOURCE_SYSTEM,
+        verbose_name="Source"
+    )
+    field = models.CharField(
+        max_length=64,
+        verbose_name="Field"
+    )
+    old_value = models.TextField(
+        blank=True,
+        verbose_name="Old Value"
+    )
+    new_value = models.TextField(
+        blank=True,
+        verbose_name="New Value"
+    )
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Changed At"
+    )
+
+    class Meta:
+        verbose_name = "Task Audit Event"
+        verbose_name_plural = "Task Audit Events"
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(
+                fields=["task", "created_at"],
+                name="core_audit_task_created_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"#{self.task_id} {self.field}: "
+            f"{self.old_value!r} -> {self.new_value!r}"
+        )
+
+
+class Job(models.Model):
+    """A unit of background work for ``manage.py run_workers``.
+
+    ``name`` selects a handler registered in ``core.jobs``, which is
+    called with ``payload`` as keyword arguments. Failed runs go back
+    to the queue with a growing delay until ``max_attempts`` is used up.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    name = models.CharField(
+        max_length=100,
+        verbose_name="Job"
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Payload"
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_QUEUED,
+        verbose_name="Status"
+    )
+    progress = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Progress"
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Total"
+    )
+    message = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="Message"
+    )
+    result = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name="Result"
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name="Last Error"
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Attempts"
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=3,
+        verbose_name="Max Attempts"
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Run After"
+    )
+    created_by = models.ForeignKey(
+        Worker,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name="Created By",
+        related_name="jobs"
+    )
+    locked_by = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="Locked By"
+    )
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Created At"
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Started At"
+    )
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Heartbeat At"
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Finished At"
+    )
+
+    class Meta:
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        ordering = ["-id"]
+        indexes = [
+            models.Index(
+                fields=["status", "run_after"],
+                name="core_job_status_run_after_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.name} ({self.status})"
+
+    @property
+    def is_active(self):
+        return self.status in (self.STATUS_QUEUED, self.STATUS_RUNNING)
+
+    @property
+    def percent(self):
+        if self.status == self.STATUS_SUCCEEDED:
+            return 100
+        if not self.total:
+            return 0
+        return min(100, self.progress * 100 // self.total)
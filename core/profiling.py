@@ -0,0 +1,103 @@
+"""On-demand profiling of a single request.
+
+Staff users add ``?_profile=cpu`` (or ``alloc`` to also trace memory
+allocations) to any URL, or send the same value in an ``X-Profile``
+header. The view runs under ``cProfile``; the raw data is written to
+``PROFILE_DIR`` and a plain-text summary replaces the page.
+"""
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+MODES = ("cpu", "alloc")
+QUERY_PARAM = "_profile"
+
+# cProfile and tracemalloc are per process, so one request at a time.
+_lock = threading.Lock()
+
+
+def requested_mode(request):
+    """Return the profiling mode asked for by ``request``, if allowed."""
+    if not settings.PROFILING_ENABLED:
+        return None
+    mode = request.GET.get(QUERY_PARAM) or request.headers.get("X-Profile")
+    if mode not in MODES:
+        return None
+    user = getattr(request, "user", None)
+    if user is None or not user.is_staff:
+        return None
+    return mode
+
+
+def profile_call(request, mode, callback):
+    """Run ``callback()`` under the profiler and return a text summary.
+
+    Returns ``None`` if another request is already being profiled.
+    """
+    if not _lock.acquire(blocking=False):
+        return None
+    try:
+        return _profile_call(request, mode, callback)
+    finally:
+        _lock.release()
+
+
+def _profile_call(request, mode, callback):
+    trace_memory = mode == "alloc"
+    started_tracing = False
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(settings.PROFILE_TRACEMALLOC_FRAMES)
+            started_tracing = True
+        tracemalloc.reset_peak()
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        response = profiler.runcall(callback)
+        elapsed = time.perf_counter() - start
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    match = request.resolver_match
+    view = match.view_name if match else "unresolved"
+    stem = "{:%Y%m%d-%H%M%S}-{}-{}".format(
+        timezone.now(), view.replace(":", "-"), request.user.pk
+    )
+    profile_dir = Path(settings.PROFILE_DIR)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    profile_path = profile_dir / f"{stem}.prof"
+    profiler.dump_stats(profile_path)
+
+    out = io.StringIO()
+    out.write(f"{request.method} {request.get_full_path()}\n")
+    out.write(f"view: {view}  status: {response.status_code}  "
+              f"time: {elapsed * 1000:.1f} ms\n")
+    out.write(f"profile: {profile_path}\n")
+
+    if trace_memory:
+        snapshot_path = profile_dir / f"{stem}.tracemalloc"
+        snapshot.dump(str(snapshot_path))
+        out.write(f"allocations: {snapshot_path}\n")
+        out.write(f"peak allocated: {peak / 1024:.1f} KiB\n\n")
+        out.write("Top allocations by line:\n")
+        for stat in snapshot.statistics("lineno")[:settings.PROFILE_TOP]:
+            out.write(f"  {stat}\n")
+
+    out.write("\n")
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+        settings.PROFILE_TOP
+    )
+    return out.getvalue()
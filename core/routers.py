@@ -0,0 +1,74 @@
+"""Send reads from selected views to a read replica.
+
+Reads only go to ``DATABASES["replica"]`` inside :func:`replica_reads`
+(entered by ``ReplicaReadMixin``) and only while the replica passes a
+periodic health check. Everything else, including all writes, uses the
+primary.
+"""
+import contextlib
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+REPLICA_ALIAS = "replica"
+
+logger = logging.getLogger(__name__)
+
+_replica_reads = ContextVar("replica_reads", default=False)
+_health = {"healthy": True, "checked_at": None}
+
+
+@contextlib.contextmanager
+def replica_reads():
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def replica_healthy():
+    """Return the cached result of a trivial query on the replica."""
+    now = time.monotonic()
+    checked_at = _health["checked_at"]
+    if (checked_at is not None
+            and now - checked_at < settings.REPLICA_HEALTH_CHECK_INTERVAL):
+        return _health["healthy"]
+
+    _health["checked_at"] = now
+    try:
+        with connections[REPLICA_ALIAS].cursor() as cursor:
+            cursor.execute("SELECT 1 FROM django_migrations LIMIT 1")
+    except DatabaseError:
+        if _health["healthy"]:
+            logger.warning("Read replica is unavailable, using primary.")
+        _health["healthy"] = False
+    else:
+        if not _health["healthy"]:
+            logger.info("Read replica is available again.")
+        _health["healthy"] = True
+    return _health["healthy"]
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (_replica_reads.get() and replica_configured()
+                and replica_healthy()):
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
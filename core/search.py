@@ -0,0 +1,56 @@
+"""Worker name search over the denormalized ``Worker.search_name``.
+
+On PostgreSQL the column has a ``pg_trgm`` GIN index (see migration
+0008), so matches tolerate typos and are ranked by similarity. Other
+backends match word prefixes against ``WorkerSearchWord``, one range
+scan of its ``(word, worker)`` index per word of the term.
+"""
+from django.db import connections
+from django.db.models import F, Q
+
+
+# Sorts after any character that can follow a prefix.
+PREFIX_END = "\U0010ffff"
+
+
+def normalize_search_text(*parts):
+    """Case-fold and join ``parts`` into single-spaced words."""
+    return " ".join(" ".join(parts).casefold().split())
+
+
+def uses_trigrams(queryset):
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def search_workers(queryset, term):
+    """Filter a worker ``queryset`` down to names matching ``term``.
+
+    Results are ordered best match first where the backend can rank.
+    """
+    term = normalize_search_text(term)
+    if not term:
+        return queryset
+
+    if uses_trigrams(queryset):
+        # Imported here: both need psycopg, and neither needs
+        # django.contrib.postgres in INSTALLED_APPS when used directly.
+        from django.contrib.postgres.lookups import TrigramWordSimilar
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        return queryset.annotate(
+            search_rank=TrigramWordSimilarity(term, "search_name"),
+        ).filter(
+            TrigramWordSimilar(F("search_name"), term)
+            | Q(search_name__contains=term)
+        ).order_by("-search_rank", *queryset.model._meta.ordering)
+
+    # Imported here: core.models imports this module.
+    from core.models import WorkerSearchWord
+
+    for word in term.split():
+        # A range rather than ``startswith``: SQLite's LIKE is case
+        # insensitive, so it cannot use a case-sensitive index.
+        queryset = queryset.filter(pk__in=WorkerSearchWord.objects.filter(
+            word__gte=word, word__lt=word + PREFIX_END,
+        ).values("worker_id"))
+    return queryset
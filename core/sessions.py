@@ -0,0 +1,16 @@
+"""Cached database sessions that report cache hits and misses."""
+from django.contrib.sessions.backends import cached_db
+
+from core.metrics import cache_lookup
+
+
+class SessionStore(cached_db.SessionStore):
+    def load(self):
+        self._cache_missed = False
+        data = super().load()
+        cache_lookup("session", hit=not self._cache_missed)
+        return data
+
+    def _get_session_from_db(self):
+        self._cache_missed = True
+        return super()._get_session_from_db()
@@ -0,0 +1,228 @@
+import contextlib
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from core import audit, counters, dbmetrics, hierarchy, sqlite, sync
+from core.backends import invalidate_cached_users
+from core.models import (
+    DataVersion,
+    Position,
+    Task,
+    TaskType,
+    Worker,
+    WorkerSearchWord,
+)
+
+_bulk_task_delete = ContextVar("bulk_task_delete", default=False)
+
+
+@contextlib.contextmanager
+def bulk_task_delete():
+    """Skip the per-task work of the ``Task`` delete signals.
+
+    For a ``delete()`` whose caller detaches the tasks, removes their
+    assignments, logs the changes and bumps the data version for the
+    whole batch itself.
+    """
+    token = _bulk_task_delete.set(True)
+    try:
+        yield
+    finally:
+        _bulk_task_delete.reset(token)
+
+
+@receiver(pre_save, sender=Task)
+def derive_task_columns(sender, instance, **kwargs):
+    # Raw saves too, so that fixtures get them.
+    instance.derive_columns()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def bump_tasks_version(sender, **kwargs):
+    if _bulk_task_delete.get():
+        return
+    DataVersion.bump(DataVersion.TASKS)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def bump_assignees_version(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        DataVersion.bump(DataVersion.TASKS)
+
+
+@receiver(pre_save, sender=Worker)
+def derive_worker_search_name(sender, instance, **kwargs):
+    # Raw saves too, so that fixtures get it.
+    instance.search_name = instance.build_search_name()
+
+
+@receiver(post_save, sender=Worker)
+def index_worker_search_words(sender, instance, update_fields=None,
+                              **kwargs):
+    if (update_fields is not None
+            and not set(update_fields) & set(Worker.SEARCH_NAME_FIELDS)):
+        return
+    WorkerSearchWord.index([instance])
+
+
+@receiver(post_save, sender=Worker)
+def bump_workers_version_on_save(sender, update_fields=None, **kwargs):
+    # Logging in only touches ``last_login``, which no page displays.
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    DataVersion.bump(DataVersion.WORKERS)
+
+
+@receiver(post_delete, sender=Worker)
+def bump_workers_version_on_delete(sender, **kwargs):
+    DataVersion.bump(DataVersion.WORKERS, DataVersion.TASKS)
+
+
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+@receiver(post_save, sender=TaskType)
+@receiver(post_delete, sender=TaskType)
+def bump_catalog_version(sender, **kwargs):
+    DataVersion.bump(DataVersion.CATALOG)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def track_assignee_changes(sender, instance, action, reverse, pk_set,
+                           **kwargs):
+    through = Task.assignees.through
+    if reverse:
+        links = through.objects.filter(worker_id=instance.pk)
+        linked_field = "task_id"
+    else:
+        links = through.objects.filter(task_id=instance.pk)
+        linked_field = "worker_id"
+
+    # Only links that really exist are removed, so collect them up front.
+    if action == "pre_remove":
+        instance._removed_link_ids = set(
+            links.filter(**{f"{linked_field}__in": pk_set})
+            .values_list(linked_field, flat=True)
+        )
+        return
+    if action == "pre_clear":
+        instance._removed_link_ids = set(
+            links.values_list(linked_field, flat=True)
+        )
+        return
+
+    if action == "post_add":
+        changed_ids, sign = pk_set, 1
+    elif action in ("post_remove", "post_clear"):
+        changed_ids, sign = instance.__dict__.pop("_removed_link_ids", ()), -1
+    else:
+        return
+
+    if reverse:
+        counters.worker_assigned(instance, changed_ids, sign)
+        audit.record_assignee_changes(
+            changed_ids, [instance.pk], added=sign > 0
+        )
+        sync.touch_tasks(changed_ids)
+    else:
+        counters.task_assigned(instance, changed_ids, sign)
+        audit.record_assignee_changes(
+            [instance.pk], changed_ids, added=sign > 0
+        )
+        if changed_ids:
+            sync.touch_tasks([instance.pk])
+
+
+@receiver(post_save, sender=Task)
+def track_task_changes(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    changed_values = instance.changed_tracked_values()
+    if "is_completed" in changed_values:
+        counters.completion_toggled(instance)
+    audit.record(instance.pk, audit.field_changes(changed_values))
+
+
+@receiver(post_save, sender=Task)
+def maintain_task_closure(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        hierarchy.attach(
+            instance.pk, instance.parent_id, subtree=[(instance.pk, 0)]
+        )
+    elif "parent_id" in instance.changed_tracked_values():
+        hierarchy.move(instance.pk, instance.parent_id)
+
+
+@receiver(pre_delete, sender=Task)
+def detach_deleted_task(sender, instance, **kwargs):
+    if _bulk_task_delete.get():
+        return
+    hierarchy.detach([instance.pk])
+
+
+@receiver(pre_delete, sender=Task)
+def update_worker_counts_on_delete(sender, instance, **kwargs):
+    if _bulk_task_delete.get():
+        return
+    # Assignment rows are removed by cascade, which sends no m2m_changed.
+    counters.task_assigned(
+        instance,
+        list(instance.assignees.values_list("pk", flat=True)),
+        sign=-1,
+    )
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def log_task_change(sender, instance, **kwargs):
+    if _bulk_task_delete.get():
+        return
+    # Raw saves too, so that mirrors get loaded fixtures.
+    sync.log_changes([instance.pk])
+
+
+# Cascades and ``SET_NULL`` change tasks with plain SQL, which sends no
+# signals, so mirrors would never hear about them.
+@receiver(pre_delete, sender=Worker)
+def touch_tasks_of_deleted_worker(sender, instance, **kwargs):
+    sync.touch_tasks(instance.tasks.values("pk"))
+
+
+@receiver(pre_delete, sender=TaskType)
+def touch_tasks_of_deleted_type(sender, instance, **kwargs):
+    sync.touch_tasks(instance.tasks.values("pk"))
+
+
+@receiver(post_save, sender=Worker)
+@receiver(post_delete, sender=Worker)
+def invalidate_cached_worker(sender, instance, **kwargs):
+    invalidate_cached_users(instance.pk)
+
+
+@receiver(post_save, sender=Position)
+def invalidate_cached_position_workers(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_cached_users(
+            *instance.workers.values_list("pk", flat=True)
+        )
+
+
+@receiver(connection_created)
+def install_query_metrics(sender, connection, **kwargs):
+    dbmetrics.install(connection)
+
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    sqlite.apply_pragmas(connection)
@@ -0,0 +1,26 @@
+"""Connection tuning for SQLite, used by single-node deployments.
+
+``SQLITE_PRAGMAS`` are applied to every new SQLite connection. The
+``tuned`` profile switches the database to write-ahead logging, so
+readers no longer block the writer or each other, and syncs the log
+only at checkpoints (``synchronous=NORMAL``: a power loss can drop the
+last commits but never corrupts the file). ``busy_timeout`` makes a
+connection wait for the write lock instead of failing at once, and is
+set first so the switch to WAL waits too.
+
+Writers still take turns. With ``transaction_mode="IMMEDIATE"`` in the
+database ``OPTIONS`` a transaction takes the write lock when it begins
+rather than on its first write, so two transactions that read and then
+write cannot deadlock on the upgrade; the loser would otherwise fail
+with "database is locked" without waiting.
+"""
+from django.conf import settings
+
+
+def apply_pragmas(connection):
+    if connection.vendor != "sqlite":
+        return
+    # Straight on the driver connection: these are not queries worth
+    # counting or logging.
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,110 @@
+"""Daily task statistics history used by the dashboard trend charts."""
+import math
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from core.models import Task, TaskStatsSnapshot
+
+SERIES_FIELDS = ("total", "completed", "overdue")
+
+
+def _counters(prefix, today):
+    return {
+        "total": Count("pk"),
+        "completed": Count("pk", filter=Q(**{f"{prefix}is_completed": True})),
+        "overdue": Count("pk", filter=Q(**{
+            f"{prefix}is_completed": False,
+            f"{prefix}deadline__lt": today,
+        })),
+    }
+
+
+def take_snapshot(today=None):
+    """Store today's team and per-worker counters, replacing old ones.
+
+    Uses a fixed number of grouped queries regardless of team size.
+    Returns the number of rows written.
+    """
+    if today is None:
+        today = timezone.localdate()
+
+    links = Task.assignees.through.objects.values("worker_id").order_by()
+    snapshots = {
+        None: TaskStatsSnapshot(
+            date=today,
+            **Task.objects.aggregate(**_counters("", today)),
+        ),
+    }
+    for row in links.annotate(**_counters("task__", today)):
+        snapshots[row["worker_id"]] = TaskStatsSnapshot(date=today, **row)
+
+    breakdowns = (
+        ("by_priority", "priority"),
+        ("by_type", "task_type__name"),
+    )
+    for attr, field in breakdowns:
+        team_rows = Task.objects.filter(
+            **{f"{field}__isnull": False}
+        ).values(field).annotate(count=Count("pk")).order_by()
+        for row in team_rows:
+            getattr(snapshots[None], attr)[row[field]] = row["count"]
+
+        worker_field = f"task__{field}"
+        worker_rows = links.filter(
+            **{f"{worker_field}__isnull": False}
+        ).values("worker_id", worker_field).annotate(count=Count("pk"))
+        for row in worker_rows:
+            snapshot = snapshots[row["worker_id"]]
+            getattr(snapshot, attr)[row[worker_field]] = row["count"]
+
+    with transaction.atomic():
+        TaskStatsSnapshot.objects.filter(date=today).delete()
+        TaskStatsSnapshot.objects.bulk_create(
+            snapshots.values(), batch_size=500
+        )
+    return len(snapshots)
+
+
+def trend_series(start, end, worker=None, points=60):
+    """Return snapshot series between ``start`` and ``end``, downsampled.
+
+    The range is split into at most ``points`` equal windows and each
+    window reports its latest snapshot, which suits the cumulative
+    counters stored here.
+    """
+    snapshots = TaskStatsSnapshot.objects.filter(
+        worker=worker,
+        date__gte=start,
+        date__lte=end,
+    ).only("date", *SERIES_FIELDS, "by_priority").order_by("date")
+
+    days = (end - start).days + 1
+    window = max(1, math.ceil(days / points))
+
+    latest = {}
+    for snapshot in snapshots:
+        latest[(snapshot.date - start).days // window] = snapshot
+
+    series = {
+        "labels": [],
+        **{field: [] for field in SERIES_FIELDS},
+        "by_priority": defaultdict(list),
+    }
+    priorities = [value for value, _ in Task._meta.get_field(
+        "priority"
+    ).choices]
+    for index in sorted(latest):
+        snapshot = latest[index]
+        series["labels"].append(snapshot.date.isoformat())
+        for field in SERIES_FIELDS:
+            series[field].append(getattr(snapshot, field))
+        for priority in priorities:
+            series["by_priority"][priority].append(
+                snapshot.by_priority.get(priority, 0)
+            )
+    series["by_priority"] = dict(series["by_priority"])
+    series["window_days"] = window
+    return series
@@ -0,0 +1,182 @@
+"""Change feed of tasks for clients that keep a local mirror.
+
+A client pages through every task once, then only asks for what changed
+after the cursor of its last page: the tasks still there, with their
+assignee ids, and the ids of tasks that left the table. A page costs
+three or four queries however many tasks there are.
+
+Every write to a task adds a ``TaskChange`` row in the same
+transaction, and cursors are positions in that log. Its ids come from
+the database, and they become visible in order: SQLite runs one writer
+at a time, and on PostgreSQL writers take a transaction-level advisory
+lock before logging, so a later id never commits before an earlier one.
+Reads go to the primary, as a lagging replica would skip changes.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from core.models import Task, TaskChange
+
+# Key of the ``pg_advisory_xact_lock`` taken by transactions that log
+# changes ("sync" in ASCII).
+LOCK_KEY = 0x7379_6E63
+
+_COLUMNS = (
+    "id",
+    "name",
+    "description",
+    "deadline",
+    "is_completed",
+    "priority",
+    "task_type_id",
+    "parent_id",
+    "updated_at",
+)
+
+
+class CursorExpired(Exception):
+    """The cursor is older than the change log kept; resync from scratch."""
+
+
+def encode_cursor(since, last_task_id=None):
+    """``since`` is the last change seen; ``last_task_id`` the last task
+    sent by a full download that is not finished yet."""
+    if last_task_id is None:
+        return str(since)
+    return f"{since}_{last_task_id}"
+
+
+def decode_cursor(value):
+    """Return the change and download positions of a cursor.
+
+    Raises ``ValueError`` for a malformed cursor.
+    """
+    parts = [int(part) for part in value.split("_")]
+    if len(parts) not in (1, 2) or min(parts) < 0:
+        raise ValueError("Cursor must have one or two parts")
+    return parts[0], (parts[1] if len(parts) == 2 else None)
+
+
+def log_changes(task_ids):
+    """Log that tasks changed or left the table.
+
+    Must run in the transaction that makes the change.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+    using = router.db_for_write(TaskChange)
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [LOCK_KEY])
+    TaskChange.objects.using(using).bulk_create(
+        (TaskChange(task_id=task_id) for task_id in task_ids),
+        batch_size=settings.SYNC_BATCH_MAX,
+    )
+
+
+def touch_tasks(task_ids):
+    """Mark tasks as changed without running ``save()``."""
+    with transaction.atomic(using=router.db_for_write(Task),
+                            savepoint=False):
+        task_ids = list(
+            Task.objects.filter(pk__in=task_ids).values_list("pk", flat=True)
+        )
+        Task.objects.filter(pk__in=task_ids).update(
+            updated_at=timezone.now(), version=F("version") + 1
+        )
+        log_changes(task_ids)
+
+
+def prune_change_log(now=None):
+    """Delete changes older than ``SYNC_CHANGE_LOG_DAYS``.
+
+    The newest change is always kept, so that the cursor pointing at it
+    stays valid.
+    """
+    cutoff = (now or timezone.now()) - datetime.timedelta(
+        days=settings.SYNC_CHANGE_LOG_DAYS
+    )
+    newest = TaskChange.objects.aggregate(newest=Max("pk"))["newest"]
+    deleted, _ = TaskChange.objects.filter(
+        changed_at__lt=cutoff, pk__lt=newest or 0
+    ).delete()
+    return deleted
+
+
+def changes(cursor=None, limit=None):
+    """Return one page of changes after ``cursor``.
+
+    Without a cursor the page starts a full download: every task, then
+    what changed since it started. The result holds the changed
+    ``tasks``, the ``deleted`` task ids, the ``cursor`` of the next page
+    and whether there is more to fetch right away (``has_more``).
+    """
+    if limit is None:
+        limit = settings.SYNC_BATCH_SIZE
+    if cursor is None:
+        since = TaskChange.objects.aggregate(since=Max("pk"))["since"] or 0
+        cursor = (since, 0)
+    since, last_task_id = cursor
+
+    if last_task_id is not None:
+        tasks = list(
+            Task.objects.filter(pk__gt=last_task_id)
+            .order_by("pk").values(*_COLUMNS)[:limit + 1]
+        )
+        deleted = []
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            last_task_id = tasks[-1]["id"]
+            has_more = True
+        else:
+            last_task_id = None
+            has_more = TaskChange.objects.filter(pk__gt=since).exists()
+    else:
+        # From the entry the cursor points at, which is only pruned once
+        # later ones may have been too (see ``prune_change_log``).
+        log = list(
+            TaskChange.objects.filter(pk__gte=since)
+            .order_by("pk").values_list("pk", "task_id")[:limit + 2]
+        )
+        if since:
+            if not log or log[0][0] != since:
+                raise CursorExpired
+            log = log[1:]
+        elif log and log[0][0] != 1:
+            # The download started before anything was logged, so the
+            # log must still begin with its first entry.
+            raise CursorExpired
+        has_more = len(log) > limit
+        log = log[:limit]
+        if log:
+            since = log[-1][0]
+        task_ids = list(dict.fromkeys(task_id for _, task_id in log))
+        tasks = list(
+            Task.objects.filter(pk__in=task_ids)
+            .order_by("pk").values(*_COLUMNS)
+        ) if task_ids else []
+        present = {task["id"] for task in tasks}
+        deleted = [pk for pk in task_ids if pk not in present]
+
+    if tasks:
+        assignees = {task["id"]: [] for task in tasks}
+        links = Task.assignees.through.objects.filter(
+            task_id__in=list(assignees)
+        ).order_by("task_id", "worker_id").values_list("task_id", "worker_id")
+        for task_id, worker_id in links:
+            assignees[task_id].append(worker_id)
+        for task in tasks:
+            task["assignees"] = assignees[task["id"]]
+
+    return {
+        "tasks": tasks,
+        "deleted": deleted,
+        "cursor": encode_cursor(since, last_task_id),
+        "has_more": has_more,
+    }
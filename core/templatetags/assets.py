@@ -0,0 +1,29 @@
+import os
+
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+register = template.Library()
+
+
+@register.simple_tag
+def bundle_scripts(name):
+    """Script tags that load the ``ASSET_BUNDLES`` bundle ``name``.
+
+    With DEBUG on and the bundle not built yet, the sources are loaded
+    one by one instead, from the ``assets/`` prefix the dev settings
+    serve them under.
+    """
+    built = os.path.exists(
+        os.path.join(settings.ASSET_BUNDLES_OUTPUT_DIR, name)
+    )
+    if settings.DEBUG and not built:
+        paths = [f"assets/{source}" for source in settings.ASSET_BUNDLES[name]]
+    else:
+        paths = [f"dist/{name}"]
+    return format_html_join(
+        "\n", '<script src="{}" defer></script>',
+        ((static(path),) for path in paths),
+    )
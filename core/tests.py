@@ -1,3 +1,1723 @@
-from django.test import TestCase
+import datetime
+import io
+import os
+import runpy
+import sqlite3
+import tempfile
+import time
+import zoneinfo
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.admin.models import LogEntry
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.core.cache import caches
+from django.db import connection, connections, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.template import Context, Template
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from prometheus_client import REGISTRY
+
+from core import hierarchy, jobs, routers
+from core.admin import TaskAdminForm
+from core.backends import CachedModelBackend
+from core.checks import check_asset_bundles, check_auth_cache
+from core.archive import archive_batch, archive_tasks
+from core.digests import send_deadline_digests
+from core.facets import count_facets
+from core.loadtest import Stats, parse_form, seed_data, set_password
+from core.filters import task_filter_q
+from core.pagecache import CACHE_ALIAS, CachedTaskList
+from core.search import search_workers
+from core.sync import prune_change_log
+from core.sessions import SessionStore
+from core.deadlines import buckets_are_current, deadline_q, rebucket_tasks
+from core.counters import reconcile_task_counts
+from core.stats import take_snapshot, trend_series
+from core.audit import audit_context
+from core.mixins import PRIMARY_PIN_SESSION_KEY
+from core.routers import REPLICA_ALIAS, replica_reads
+from core.models import (
+    ArchivedTask,
+    Job,
+    Task,
+    TaskAuditEvent,
+    TaskClosure,
+    TaskStatsSnapshot,
+    TaskType,
+    VersionConflict,
+    Worker,
+    WorkerManager,
+)
+
+KYIV = zoneinfo.ZoneInfo("Europe/Kyiv")
+
+
+def frozen_now(moment):
+    return mock.patch("django.utils.timezone.now", return_value=moment)
+
+
+class DeadlineBucketTests(TestCase):
+    def create_task(self, deadline, is_completed=False):
+        return Task.objects.create(
+            name="Task",
+            description="Description",
+            deadline=deadline,
+            is_completed=is_completed,
+        )
+
+    def filtered_ids(self, deadline_filter, use_buckets=None):
+        return set(
+            Task.objects.filter(
+                deadline_q(deadline_filter, use_buckets=use_buckets)
+            ).values_list("pk", flat=True)
+        )
+
+    def test_task_due_today_becomes_overdue_after_midnight(self):
+        before_midnight = datetime.datetime(
+            2026, 3, 1, 23, 59, 59, tzinfo=datetime.timezone.utc
+        )
+        after_midnight = before_midnight + datetime.timedelta(seconds=2)
+
+        with frozen_now(before_midnight):
+            task = self.create_task(datetime.date(2026, 3, 1))
+            rebucket_tasks()
+            self.assertEqual(task.deadline_bucket, Task.BUCKET_TODAY)
+            self.assertEqual(self.filtered_ids("today"), {task.pk})
+            self.assertEqual(self.filtered_ids("overdue"), set())
+
+        with frozen_now(after_midnight):
+            rebucket_tasks()
+            task.refresh_from_db()
+            self.assertEqual(task.deadline_bucket, Task.BUCKET_OVERDUE)
+            self.assertEqual(self.filtered_ids("today"), set())
+            self.assertEqual(self.filtered_ids("overdue"), {task.pk})
+
+    def test_stale_buckets_fall_back_to_date_comparison(self):
+        yesterday = datetime.datetime(
+            2026, 3, 1, 12, tzinfo=datetime.timezone.utc
+        )
+        with frozen_now(yesterday):
+            task = self.create_task(datetime.date(2026, 3, 1))
+            rebucket_tasks()
+
+        # The daily job has not run yet for the new date.
+        with frozen_now(yesterday + datetime.timedelta(days=1)):
+            self.assertFalse(buckets_are_current())
+            self.assertEqual(self.filtered_ids("overdue"), {task.pk})
+            self.assertEqual(self.filtered_ids("today"), set())
+
+    @override_settings(TIME_ZONE="Europe/Kyiv")
+    def test_buckets_follow_the_configured_time_zone(self):
+        # 22:30 UTC on March 1st is already March 2nd in Kyiv.
+        moment = datetime.datetime(
+            2026, 3, 1, 22, 30, tzinfo=datetime.timezone.utc
+        )
+        self.assertEqual(moment.astimezone(KYIV).date().day, 2)
+
+        with frozen_now(moment):
+            due_march_1 = self.create_task(datetime.date(2026, 3, 1))
+            due_march_2 = self.create_task(datetime.date(2026, 3, 2))
+            rebucket_tasks()
+            self.assertEqual(self.filtered_ids("overdue"), {due_march_1.pk})
+            self.assertEqual(self.filtered_ids("today"), {due_march_2.pk})
+
+        # Moving the clock back to an earlier date needs a full pass.
+        with override_settings(TIME_ZONE="UTC"), frozen_now(moment):
+            rebucket_tasks(full=True)
+            self.assertEqual(self.filtered_ids("overdue"), set())
+            self.assertEqual(self.filtered_ids("today"), {due_march_1.pk})
+
+    def test_buckets_match_date_comparison_across_horizons(self):
+        today = datetime.date(2026, 3, 1)
+        moment = datetime.datetime(
+            2026, 3, 1, 0, 0, tzinfo=datetime.timezone.utc
+        )
+        with frozen_now(moment):
+            for offset in range(-3, 11):
+                deadline = today + datetime.timedelta(days=offset)
+                self.create_task(deadline)
+                self.create_task(deadline, is_completed=True)
+            rebucket_tasks(full=True)
+
+            for task in Task.objects.all():
+                self.assertEqual(
+                    task.deadline_bucket,
+                    task.compute_deadline_bucket(today),
+                )
+            for deadline_filter in ("today", "next_3_days", "next_week",
+                                    "overdue"):
+                self.assertEqual(
+                    self.filtered_ids(deadline_filter, use_buckets=True),
+                    self.filtered_ids(deadline_filter, use_buckets=False),
+                    deadline_filter,
+                )
+
+    def test_loaded_fixtures_are_filtered_by_date_until_rebucketed(self):
+        # Migrations do not vouch for rows loaded after them.
+        self.assertFalse(buckets_are_current())
+        call_command("loaddata", "initial_data", verbosity=0)
+        self.assertGreater(len(self.filtered_ids("overdue")), 0)
+        self.assertEqual(
+            self.filtered_ids("overdue"),
+            self.filtered_ids("overdue", use_buckets=False),
+        )
+
+    def test_completion_moves_overdue_task_to_past(self):
+        moment = datetime.datetime(
+            2026, 3, 1, 12, tzinfo=datetime.timezone.utc
+        )
+        with frozen_now(moment):
+            task = self.create_task(datetime.date(2026, 2, 1))
+            self.assertEqual(task.deadline_bucket, Task.BUCKET_OVERDUE)
+
+            task.is_completed = True
+            task.save(update_fields=["is_completed"])
+            task.refresh_from_db()
+            self.assertEqual(task.deadline_bucket, Task.BUCKET_PAST)
+
+
+class ArchiveTaskTests(TestCase):
+    def setUp(self):
+        self.worker = Worker.objects.create_user(
+            username="worker", password="password"
+        )
+        self.old = Task.objects.create(
+            name="Old", description="-",
+            deadline=datetime.date(2020, 1, 1), is_completed=True,
+        )
+        self.pending = Task.objects.create(
+            name="Pending", description="-",
+            deadline=datetime.date(2020, 1, 1),
+        )
+        self.old.assignees.add(self.worker)
+        self.pending.assignees.add(self.worker)
+
+    def test_only_old_completed_tasks_are_moved(self):
+        self.assertEqual(archive_tasks(older_than_days=30, batch_size=1), 1)
+
+        archived = ArchivedTask.objects.get()
+        self.assertEqual(archived.pk, self.old.pk)
+        self.assertEqual(list(archived.assignees.all()), [self.worker])
+        self.assertEqual(list(Task.objects.all()), [self.pending])
+
+        self.worker.refresh_from_db()
+        self.assertEqual(self.worker.open_task_count, 1)
+        self.assertEqual(self.worker.completed_task_count, 0)
+
+    def test_batch_queries_do_not_grow_with_its_size(self):
+        def archive(count):
+            tasks = Task.objects.bulk_create(
+                Task(
+                    name="Done", description="-",
+                    deadline=datetime.date(2020, 1, 1), is_completed=True,
+                )
+                for _ in range(count)
+            )
+            self.worker.tasks.add(*tasks)
+            with CaptureQueriesContext(connection) as queries:
+                archive_batch([task.pk for task in tasks])
+            self.assertFalse(Task.objects.filter(name="Done").exists())
+            return len(queries)
+
+        self.assertEqual(archive(2), archive(20))
+        self.worker.refresh_from_db()
+        self.assertEqual(self.worker.open_task_count, 1)
+
+    def test_archived_task_stays_reachable(self):
+        archive_tasks(older_than_days=30)
+        self.client.force_login(self.worker)
+
+        response = self.client.get(
+            reverse("core:task-detail", args=[self.old.pk])
+        )
+        self.assertContains(response, "Archived")
+        self.assertNotContains(
+            response, reverse("core:task-update", args=[self.old.pk])
+        )
+
+        response = self.client.get(
+            reverse("core:worker-detail", args=[self.worker.pk])
+        )
+        self.assertEqual(list(response.context["archived_tasks"]), [
+            ArchivedTask.objects.get(),
+        ])
+
+
+class TaskFacetTests(TestCase):
+    def test_each_group_ignores_its_own_filter(self):
+        today = datetime.date(2026, 3, 1)
+        worker = Worker.objects.create_user(username="worker")
+        for priority, is_completed in (("urgent", False), ("urgent", True),
+                                       ("low", False)):
+            task = Task.objects.create(
+                name="Task", description="-", deadline=today,
+                priority=priority, is_completed=is_completed,
+            )
+            task.assignees.add(worker)
+
+        facets = count_facets(
+            {"priority": "urgent", "status": "pending"}, today
+        )
+        # Pending tasks by priority, urgent tasks by status.
+        self.assertEqual(facets["priority"]["urgent"], 1)
+        self.assertEqual(facets["priority"]["low"], 1)
+        self.assertEqual(facets["status"], {"completed": 1, "pending": 1})
+        self.assertEqual(facets["assignee"], {str(worker.pk): 1})
+        self.assertEqual(facets["deadline_filter"]["today"], 1)
+
+    def test_list_pages_render(self):
+        worker = Worker.objects.create_user(username="worker")
+        self.client.force_login(worker)
+        for name in ("core:task-list", "core:worker-list"):
+            response = self.client.get(reverse(name), {"status": "pending"})
+            self.assertEqual(response.status_code, 200)
+
+
+class WorkerSearchTests(TestCase):
+    def setUp(self):
+        self.olena = Worker.objects.create_user(
+            username="o.koval", first_name="Olena", last_name="Koval"
+        )
+        self.petro = Worker.objects.create_user(
+            username="petro", first_name="Petro", last_name="Shevchenko"
+        )
+
+    def search(self, term):
+        return set(search_workers(Worker.objects.all(), term))
+
+    def test_migrations_use_the_plain_manager(self):
+        state = MigrationLoader(connection).project_state()
+        historical = state.apps.get_model("core", "Worker")
+        self.assertNotIsInstance(historical.objects, WorkerManager)
+
+    def test_search_name_follows_renames(self):
+        self.assertEqual(self.olena.search_name, "olena koval o.koval")
+        self.olena.last_name = "Bondar"
+        self.olena.save(update_fields=["last_name"])
+        self.olena.refresh_from_db()
+        self.assertEqual(self.olena.search_name, "olena bondar o.koval")
+
+    def test_matches_word_prefixes_case_insensitively(self):
+        self.assertEqual(self.search("KOV"), {self.olena})
+        self.assertEqual(self.search("shev"), {self.petro})
+        self.assertEqual(self.search("  "), {self.olena, self.petro})
+        self.assertEqual(self.search("hevchenko"), set())
+        self.assertEqual(self.search("petro shev"), {self.petro})
+        self.assertEqual(self.search("petro kov"), set())
+
+    def test_fixtures_and_bulk_creates_are_searchable(self):
+        call_command("loaddata", "initial_data", verbosity=0)
+        Worker.objects.bulk_create([
+            Worker(username="z.bondar", first_name="Zoryana"),
+        ])
+        self.assertEqual(
+            Worker.objects.filter(search_name="").count(), 0
+        )
+        self.assertEqual(
+            {worker.username for worker in self.search("zory")},
+            {"z.bondar"},
+        )
+
+    def test_word_prefix_is_an_index_range(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Checks SQLite query plans.")
+        plan = search_workers(Worker.objects.all(), "kov").explain()
+        # SQLite names the index of the unique constraint itself.
+        self.assertRegex(
+            plan,
+            r"SEARCH \w+ USING COVERING INDEX \w*workersearchword\w* "
+            r"\(word>\? AND word<\?\)",
+        )
+        self.assertNotIn("SCAN", plan)
+
+    def test_assignee_filter_accepts_a_name(self):
+        task = Task.objects.create(
+            name="Task", description="-", deadline=datetime.date(2026, 3, 1)
+        )
+        task.assignees.add(self.petro)
+        matches = Task.objects.filter(task_filter_q({"assignee": "petro"}))
+        self.assertEqual(list(matches), [task])
+        matches = Task.objects.filter(task_filter_q({"assignee": "olena"}))
+        self.assertEqual(list(matches), [])
+
+
+@override_settings(TASK_PAGE_CACHE_CHUNK=10)
+class CachedTaskListTests(TestCase):
+    def setUp(self):
+        caches[CACHE_ALIAS].clear()
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {i}", description="-",
+                deadline=datetime.date(2026, 3, 1),
+            )
+            for i in range(25)
+        ]
+
+    def cached_list(self, version=1):
+        return CachedTaskList(
+            Task.objects.all(), Task.objects.all(), key_parts=[version]
+        )
+
+    def test_pages_come_from_cached_id_chunks(self):
+        expected = [task.pk for task in reversed(self.tasks)][8:13]
+
+        # Ids for both chunks the slice spans, then the rows.
+        with self.assertNumQueries(3):
+            page = self.cached_list()[8:13]
+        self.assertEqual([task.pk for task in page], expected)
+
+        with self.assertNumQueries(1):
+            page = self.cached_list()[8:13]
+        self.assertEqual([task.pk for task in page], expected)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.cached_list().count(), 25)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.cached_list().count(), 25)
+
+    def test_new_data_version_misses_the_cache(self):
+        self.cached_list()[0:5]
+        with self.assertNumQueries(2):
+            self.cached_list(version=2)[0:5]
+
+
+class TaskListSortTests(TestCase):
+    def test_priority_sort_uses_severity_order(self):
+        worker = Worker.objects.create_user(username="worker")
+        self.client.force_login(worker)
+        for priority in ("low", "urgent", "medium", "high"):
+            Task.objects.create(
+                name=priority, description="-",
+                deadline=datetime.date(2026, 3, 1), priority=priority,
+            )
+
+        response = self.client.get(
+            reverse("core:task-list"), {"sort": "priority"}
+        )
+        self.assertEqual(
+            [task.priority for task in response.context["tasks"]],
+            ["urgent", "high", "medium", "low"],
+        )
+        response = self.client.get(
+            reverse("core:task-list"), {"sort": "-priority"}
+        )
+        self.assertEqual(
+            [task.priority for task in response.context["tasks"]],
+            ["low", "medium", "high", "urgent"],
+        )
+
+    def test_fixtures_and_bulk_creates_get_derived_columns(self):
+        call_command("loaddata", "initial_data", verbosity=0)
+        Task.objects.bulk_create([Task(
+            name="Bulk", description="-", priority="urgent",
+            deadline=timezone.localdate() - datetime.timedelta(days=1),
+        )])
+        self.assertEqual(
+            set(Task.objects.values_list("priority_rank", flat=True)),
+            set(Task.PRIORITY_RANKS.values()),
+        )
+        for task in Task.objects.all():
+            self.assertEqual(
+                (task.priority_rank, task.deadline_bucket),
+                (Task.PRIORITY_RANKS[task.priority],
+                 task.compute_deadline_bucket()),
+            )
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.worker = Worker.objects.create_user(username="worker")
+        self.task = Task.objects.create(
+            name="Task", description="-", deadline=datetime.date(2026, 3, 1),
+        )
+        self.task.assignees.add(self.worker)
+
+    def run_queue(self):
+        return jobs.work(lambda: False, burst=True)
+
+    def test_bulk_update_runs_in_the_background(self):
+        job = jobs.enqueue("tasks.bulk_update", {
+            "task_ids": [self.task.pk],
+            "changes": {"is_completed": True},
+            "actor_id": self.worker.pk,
+        }, user=self.worker)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.run_queue(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual((job.progress, job.total), (1, 1))
+        self.assertEqual(job.result, {"updated": 1})
+        self.worker.refresh_from_db()
+        self.assertEqual(self.worker.completed_task_count, 1)
+        self.assertEqual(
+            self.task.audit_events.get().actor_id, self.worker.pk
+        )
+
+    def test_failed_job_is_retried_with_backoff(self):
+        def fail(context):
+            raise RuntimeError("boom")
+
+        handlers = mock.patch.dict(jobs._handlers, {"test.fail": fail})
+        with handlers, self.assertLogs("core.jobs", "ERROR"):
+            job = jobs.enqueue("test.fail", max_attempts=2)
+            self.run_queue()
+            job.refresh_from_db()
+            self.assertEqual(job.status, Job.STATUS_QUEUED)
+            self.assertEqual(job.attempts, 1)
+            self.assertIn("boom", job.error)
+            self.assertGreater(job.run_after, job.started_at)
+            # Not due yet, so a burst run leaves it alone.
+            self.assertEqual(self.run_queue(), 0)
+
+            Job.objects.update(run_after=job.started_at)
+            self.run_queue()
+            job.refresh_from_db()
+            self.assertEqual(job.status, Job.STATUS_FAILED)
+            self.assertEqual(job.attempts, 2)
+
+    def test_stale_running_job_is_queued_again(self):
+        job = jobs.enqueue("stats.snapshot")
+        self.assertEqual(jobs.claim("gone:1").pk, job.pk)
+        later = job.created_at + datetime.timedelta(hours=1)
+
+        self.assertEqual(jobs.requeue_stale(now=later), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+
+    def test_status_page(self):
+        self.client.force_login(self.worker)
+        response = self.client.post(
+            reverse("core:job-list"), {"name": "stats.snapshot"}
+        )
+        self.assertEqual(response.status_code, 403)
+
+        self.worker.is_staff = True
+        self.worker.save()
+        response = self.client.post(
+            reverse("core:job-list"), {"name": "stats.snapshot"}
+        )
+        self.assertRedirects(response, reverse("core:job-list"))
+        response = self.client.get(reverse("core:job-list"))
+        self.assertContains(response, "stats.snapshot")
+        self.assertTrue(response.context["has_active_jobs"])
+
+
+@override_settings(JOB_HEARTBEAT_INTERVAL=0.01)
+class JobHeartbeatTests(TransactionTestCase):
+    def test_heartbeat_moves_on_while_the_handler_runs(self):
+        beats = []
+
+        def block(context):
+            # Writing keeps SQLite's job table locked for a while, so the
+            # first beats fail.
+            with transaction.atomic():
+                Job.objects.filter(pk=context.job.pk).update(progress=0)
+                time.sleep(0.1)
+            # Never reports progress, like a single long query.
+            deadline = time.monotonic() + 5
+            while len(beats) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+                heartbeat_at = Job.objects.get(pk=context.job.pk).heartbeat_at
+                if heartbeat_at > (beats or [context.job.started_at])[-1]:
+                    beats.append(heartbeat_at)
+
+        with mock.patch.dict(jobs._handlers, {"test.block": block}):
+            job = jobs.enqueue("test.block")
+            with self.assertLogs("core.jobs", "WARNING") as logs:
+                self.assertEqual(jobs.work(lambda: False, burst=True), 1)
+        self.assertEqual(len(beats), 2)
+        for record in logs.records:
+            self.assertTrue(
+                record.getMessage().startswith("No heartbeat recorded")
+            )
+            self.assertIsNone(record.exc_info)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+
+
+class DeadlineDigestTests(TestCase):
+    def setUp(self):
+        self.today = datetime.date(2026, 3, 10)
+        self.tasks = {
+            name: Task.objects.create(
+                name=name, description="-",
+                deadline=self.today + datetime.timedelta(days=days),
+                is_completed=completed,
+            )
+            for name, days, completed in (
+                ("Overdue", -2, False),
+                ("Tomorrow", 1, False),
+                ("Next month", 30, False),
+                ("Done", -2, True),
+            )
+        }
+
+    def add_worker(self, username, email, *task_names):
+        worker = Worker.objects.create_user(username=username, email=email)
+        worker.tasks.add(*(self.tasks[name] for name in task_names))
+        return worker
+
+    def test_one_digest_per_worker_in_constant_queries(self):
+        self.add_worker("ann", "ann@example.com", "Overdue", "Tomorrow")
+        self.add_worker("bob", "bob@example.com", "Next month", "Done")
+        self.add_worker("cat", "", "Overdue")
+        # Checking the date, one read, and recording the date (created on
+        # the first run).
+        with self.assertNumQueries(8):
+            sent = send_deadline_digests(today=self.today, batch_size=1)
+        self.assertEqual(sent, 1)
+
+        for i in range(5):
+            self.add_worker(f"w{i}", f"w{i}@example.com", "Tomorrow")
+        mail.outbox = []
+        with self.assertNumQueries(5):
+            sent = send_deadline_digests(
+                today=self.today, batch_size=2, force=True
+            )
+        self.assertEqual(sent, 6)
+
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ["ann@example.com"])
+        self.assertEqual(
+            message.subject, "Pulseboard: 1 overdue, 1 due soon task(s)"
+        )
+        self.assertIn("Overdue", message.body)
+        self.assertIn("Tomorrow", message.body)
+        self.assertIn(
+            reverse("core:task-detail", args=[self.tasks["Tomorrow"].pk]),
+            message.body,
+        )
+        self.assertNotIn("Next month", message.body)
+
+    def test_job_and_command_send_once_a_day(self):
+        self.add_worker("ann", "ann@example.com", "Overdue")
+        job = jobs.enqueue("tasks.deadline_digests")
+        jobs.work(lambda: False, burst=True)
+        job.refresh_from_db()
+        self.assertEqual(job.result, {"sent": 1})
+
+        call_command("send_deadline_digests", stdout=io.StringIO())
+        job = jobs.enqueue("tasks.deadline_digests")
+        jobs.work(lambda: False, burst=True)
+        job.refresh_from_db()
+        self.assertEqual(job.result, {"sent": 0, "already_sent": True})
+        self.assertEqual(len(mail.outbox), 1)
+
+
+@override_settings(TASK_BOARD_PAGE_SIZE=2)
+class TaskBoardTests(TestCase):
+    def setUp(self):
+        self.worker = Worker.objects.create_user(username="worker")
+        self.client.force_login(self.worker)
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {day}", description="-", priority="high",
+                deadline=datetime.date(2026, 3, day),
+            )
+            for day in (3, 1, 2, 1, 5)
+        ]
+        self.tasks[0].assignees.add(self.worker)
+
+    def test_columns_load_more_by_keyset(self):
+        # Session, user, data versions, counts, the one non-empty column
+        # and its assignees.
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse("core:task-board"))
+        high = response.context["columns"][1]
+        self.assertEqual(high["count"], 5)
+        self.assertEqual(
+            [task.pk for task in high["cards"]],
+            [self.tasks[1].pk, self.tasks[3].pk],
+        )
+
+        seen = []
+        url = reverse("core:task-board-column", args=["high"])
+        cursor = high["next_cursor"]
+        while cursor:
+            response = self.client.get(url, {"after": cursor})
+            seen += [task.pk for task in response.context["cards"]]
+            cursor = response.context["next_cursor"]
+        self.assertEqual(
+            seen, [self.tasks[i].pk for i in (2, 0, 4)]
+        )
+
+        response = self.client.get(url, {"after": "yesterday"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_move_updates_task_counters_and_audit(self):
+        task = self.tasks[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("core:task-move", args=[task.pk]), {"column": "done"}
+            )
+        self.assertEqual(response.json(), {"task": task.pk, "column": "done"})
+        task.refresh_from_db()
+        self.assertTrue(task.is_completed)
+        self.worker.refresh_from_db()
+        self.assertEqual(self.worker.completed_task_count, 1)
+        self.assertEqual(task.audit_events.get().source, "web")
+
+        response = self.client.get(reverse("core:task-board"))
+        self.assertEqual(response.context["columns"][-1]["count"], 1)
+
+    def test_counts_match_the_cards_shown(self):
+        # A rank out of step with the priority, as rows written without
+        # ``save()`` can have.
+        Task.objects.filter(pk=self.tasks[0].pk).update(priority_rank=0)
+        with override_settings(TASK_BOARD_PAGE_SIZE=10):
+            response = self.client.get(reverse("core:task-board"))
+        for column in response.context["columns"]:
+            self.assertEqual(
+                column["count"], len(column["cards"]), column["column"].key
+            )
+
+
+@override_settings(SITE_URL="https://pulse.example")
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        self.worker = Worker.objects.create_user(
+            username="worker", first_name="Ann", calendar_token="secret"
+        )
+        self.mine = Task.objects.create(
+            name="Ship it, today", description="-", priority="urgent",
+            deadline=datetime.date(2026, 3, 2),
+        )
+        self.mine.assignees.add(self.worker)
+        Task.objects.create(
+            name="Someone else's", description="-", priority="low",
+            deadline=datetime.date(2026, 3, 1),
+        )
+        Task.objects.create(
+            name="Done", description="-", priority="low",
+            deadline=datetime.date(2026, 3, 1), is_completed=True,
+        )
+        self.url = reverse("core:calendar-worker", args=["secret"])
+
+    def feed(self, url):
+        response = self.client.get(url)
+        self.assertEqual(
+            response["Content-Type"], "text/calendar; charset=utf-8"
+        )
+        return b"".join(response.streaming_content).decode()
+
+    def test_feeds_list_open_tasks(self):
+        body = self.feed(self.url)
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertTrue(body.endswith("END:VCALENDAR\r\n"))
+        self.assertEqual(body.count("BEGIN:VEVENT"), 1)
+        self.assertIn(f"UID:task-{self.mine.pk}@pulse.example\r\n", body)
+        self.assertIn("DTSTART;VALUE=DATE:20260302\r\n", body)
+        self.assertIn("SUMMARY:Ship it\\, today\r\n", body)
+        self.assertIn("PRIORITY:1\r\n", body)
+
+        body = self.feed(reverse("core:calendar-team", args=["secret"]))
+        self.assertEqual(body.count("BEGIN:VEVENT"), 2)
+        self.assertLess(body.index("Someone else"), body.index("Ship it"))
+
+    def test_unchanged_feed_is_not_modified(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        # Worker and data version.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.mine.name = "Renamed"
+        self.mine.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_reset_revokes_old_links(self):
+        self.client.force_login(self.worker)
+        self.client.post(reverse("core:calendar-reset"))
+        self.worker.refresh_from_db()
+        self.assertNotEqual(self.worker.calendar_token, "secret")
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        response = self.client.get(
+            reverse("core:calendar-worker", args=[self.worker.calendar_token])
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(SYNC_TOKEN="sync-secret")
+class TaskSyncTests(TestCase):
+    def setUp(self):
+        self.worker = Worker.objects.create_user(username="worker")
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {number}", description="-",
+                deadline=datetime.date(2026, 3, 1),
+            )
+            for number in range(4)
+        ]
+        self.tasks[1].assignees.add(self.worker)
+        self.tasks[3].is_completed = True
+        self.tasks[3].save()
+
+    def fetch(self, **params):
+        response = self.client.get(
+            reverse("core:task-changes"), params,
+            HTTP_AUTHORIZATION="Bearer sync-secret",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_full_download_then_only_changes(self):
+        mirror = {}
+        cursor = None
+        pages = 0
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            page = self.fetch(**params)
+            mirror.update((task["id"], task) for task in page["tasks"])
+            cursor = page["cursor"]
+            pages += 1
+            if not page["has_more"]:
+                break
+        self.assertEqual(pages, 2)
+        self.assertEqual(len(mirror), 4)
+        self.assertEqual(
+            mirror[self.tasks[1].pk]["assignees"], [self.worker.pk]
+        )
+        self.assertEqual(self.fetch(cursor=cursor)["tasks"], [])
+
+        self.tasks[0].name = "Renamed"
+        self.tasks[0].save()
+        self.worker.tasks.remove(self.tasks[1])
+        deleted_id = self.tasks[2].pk
+        self.tasks[2].delete()
+        archive_batch([self.tasks[3].pk])
+
+        # The change log, tasks and their assignees.
+        with self.assertNumQueries(3):
+            page = self.fetch(cursor=cursor)
+        changed = {task["id"]: task for task in page["tasks"]}
+        self.assertEqual(set(changed), {self.tasks[0].pk, self.tasks[1].pk})
+        self.assertEqual(changed[self.tasks[0].pk]["name"], "Renamed")
+        self.assertEqual(changed[self.tasks[1].pk]["assignees"], [])
+        self.assertEqual(
+            page["deleted"], [deleted_id, self.tasks[3].pk]
+        )
+        self.assertFalse(page["has_more"])
+
+    def test_rejects_bad_requests(self):
+        url = reverse("core:task-changes")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        response = self.client.get(
+            url, {"cursor": "soon"}, HTTP_AUTHORIZATION="Bearer sync-secret"
+        )
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(
+            url, {"cursor": "0_0_0_0"},
+            HTTP_AUTHORIZATION="Bearer sync-secret",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_is_a_position_in_the_change_log(self):
+        cursor = self.fetch()["cursor"]
+        # A change that commits after a later one is still after the
+        # cursor, whatever its ``updated_at`` says.
+        self.tasks[0].name = "Slow"
+        self.tasks[0].save()
+        Task.objects.filter(pk=self.tasks[0].pk).update(
+            updated_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        page = self.fetch(cursor=cursor)
+        self.assertEqual(
+            [task["name"] for task in page["tasks"]], ["Slow"]
+        )
+        cursor = page["cursor"]
+        self.assertEqual(self.fetch(cursor=cursor)["tasks"], [])
+
+        later = timezone.now() + datetime.timedelta(days=60)
+        self.assertEqual(prune_change_log(now=later), 6)
+        # The newest entry is kept, so a current cursor still works.
+        self.assertEqual(self.fetch(cursor=cursor)["tasks"], [])
+        deleted_id = self.tasks[1].pk
+        self.tasks[1].delete()
+        self.assertEqual(self.fetch(cursor=cursor)["deleted"], [deleted_id])
+        self.assertEqual(prune_change_log(now=later), 1)
+        response = self.client.get(
+            reverse("core:task-changes"), {"cursor": cursor},
+            HTTP_AUTHORIZATION="Bearer sync-secret",
+        )
+        self.assertEqual(response.status_code, 410)
+
+
+class TaskVersionTests(TestCase):
+    def setUp(self):
+        self.worker = Worker.objects.create_superuser(username="admin")
+        self.other = Worker.objects.create_user(username="other")
+        self.client.force_login(self.worker)
+        self.task = Task.objects.create(
+            name="Task", description="Long text", priority="low",
+            deadline=datetime.date(2026, 3, 1),
+        )
+        self.task.assignees.add(self.worker)
+        self.task.refresh_from_db()
+        self.url = reverse("core:task-update", args=[self.task.pk])
+
+    def form_data(self, **changes):
+        data = {
+            "name": self.task.name,
+            "description": self.task.description,
+            "deadline": "2026-03-01",
+            "priority": self.task.priority,
+            "assignees": [self.worker.pk],
+            "expected_version": self.task.version,
+        }
+        data.update(changes)
+        return data
+
+    def test_edit_writes_only_changed_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.url,
+                self.form_data(
+                    name="Renamed", assignees=[self.worker.pk, self.other.pk]
+                ),
+            )
+        # Read before the next request resets the query log.
+        sql = [query["sql"] for query in queries.captured_queries]
+        self.assertRedirects(response, reverse("core:task-list"))
+        update = next(q for q in sql if q.startswith('UPDATE "core_task"'))
+        self.assertNotIn('"description"', update)
+        self.assertFalse(
+            [q for q in sql if q.startswith("DELETE") and "assignees" in q]
+        )
+
+        task = Task.objects.get(pk=self.task.pk)
+        self.assertEqual(task.name, "Renamed")
+        self.assertEqual(task.assignees.count(), 2)
+        self.assertGreater(task.version, self.task.version)
+
+    def test_stale_edit_is_rejected(self):
+        stale = self.form_data(name="Mine")
+        Task.objects.get(pk=self.task.pk).save()
+
+        response = self.client.post(self.url, stale)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "Someone else changed this task", response.content.decode()
+        )
+        self.assertEqual(Task.objects.get(pk=self.task.pk).name, "Task")
+
+        with self.assertRaises(VersionConflict):
+            self.task.save(
+                update_fields=["name"], expected_version=self.task.version
+            )
+
+    def test_version_cannot_be_set_through_forms(self):
+        response = self.client.post(reverse("core:task-create"), {
+            **self.form_data(name="New", assignees=[]), "version": 50,
+            "expected_version": "",
+        })
+        self.assertRedirects(response, reverse("core:task-list"))
+        self.assertEqual(Task.objects.get(name="New").version, 1)
+
+        response = self.client.post(
+            self.url, self.form_data(name="Renamed", version=50)
+        )
+        self.assertRedirects(response, reverse("core:task-list"))
+        task = Task.objects.get(pk=self.task.pk)
+        self.assertEqual(task.version, self.task.version + 1)
+
+        data = self.form_data(name="Mine")
+        del data["expected_version"]
+        response = self.client.post(self.url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).name, "Renamed")
+
+    def test_admin_list_edit_checks_version(self):
+        url = reverse("admin:core_task_changelist")
+        self.assertContains(
+            self.client.get(url),
+            f'<input type="hidden" name="form-0-expected_version" '
+            f'value="{self.task.version}" id="id_form-0-expected_version">',
+            html=True,
+        )
+        data = {
+            "form-TOTAL_FORMS": "1",
+            "form-INITIAL_FORMS": "1",
+            "form-0-id": self.task.pk,
+            "form-0-priority": "urgent",
+            "form-0-expected_version": self.task.version,
+            "_save": "Save",
+        }
+        Task.objects.filter(pk=self.task.pk).update(version=99)
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).priority, "low")
+
+        data["form-0-expected_version"] = 99
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        task = Task.objects.get(pk=self.task.pk)
+        self.assertEqual((task.priority, task.version), ("urgent", 100))
+
+    def test_admin_conflict_after_validation_is_a_form_error(self):
+        save_edits = TaskAdminForm.save_edits
+
+        def edited_meanwhile(form):
+            # Another edit commits between validation and the save.
+            Task.objects.get(pk=self.task.pk).save()
+            save_edits(form)
+
+        url = reverse("admin:core_task_change", args=[self.task.pk])
+        data = self.form_data(name="Mine", _save="Save")
+        edit = mock.patch.object(
+            TaskAdminForm, "save_edits", autospec=True,
+            side_effect=edited_meanwhile,
+        )
+        with edit:
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Someone else changed this task")
+        self.assertEqual(Task.objects.get(pk=self.task.pk).name, "Task")
+        self.assertFalse(LogEntry.objects.exists())
+        self.assertFalse(list(response.context["messages"]))
+
+        # The same goes for edits in the change list.
+        data = {
+            "form-TOTAL_FORMS": "1",
+            "form-INITIAL_FORMS": "1",
+            "form-0-id": self.task.pk,
+            "form-0-priority": "urgent",
+            "form-0-expected_version": self.task.version,
+            "_save": "Save",
+        }
+        with edit:
+            response = self.client.post(
+                reverse("admin:core_task_changelist"), data
+            )
+        self.assertContains(response, "Someone else changed this task")
+        self.assertEqual(Task.objects.get(pk=self.task.pk).priority, "low")
+        self.assertFalse(LogEntry.objects.exists())
+
+
+class LoadTestTests(TestCase):
+    def test_journey_form_round_trips(self):
+        self.assertEqual(seed_data(3, 10), (3, 10))
+        self.assertEqual(seed_data(3, 10), (0, 0))
+        worker = Worker.objects.get(username="loadtest0")
+        self.assertEqual(worker.task_count, worker.tasks.count())
+
+        self.client.force_login(worker)
+        task = Task.objects.filter(name__startswith="Load test").first()
+        url = reverse("core:task-update", args=[task.pk])
+        form = parse_form(self.client.get(url).content.decode(), url)
+        self.assertEqual(form["expected_version"], [str(task.version)])
+        form["priority"] = ["urgent"]
+        self.assertEqual(self.client.post(url, form).status_code, 302)
+        task.refresh_from_db()
+        self.assertEqual(task.priority, "urgent")
+
+    def test_workers_sign_in_only_during_a_run(self):
+        seed_data(2, 1)
+        worker = Worker.objects.get(username="loadtest0")
+        self.assertFalse(worker.has_usable_password())
+        self.assertEqual(set_password("run-password"), 2)
+        self.assertTrue(self.client.login(
+            username="loadtest1", password="run-password"
+        ))
+        set_password(None)
+        worker.refresh_from_db()
+        self.assertFalse(worker.has_usable_password())
+
+    def test_refuses_to_run_without_debug(self):
+        with self.assertRaisesMessage(
+            CommandError, "--i-know-this-is-not-production"
+        ):
+            call_command("load_test", "--seed")
+        self.assertFalse(
+            Worker.objects.filter(username__startswith="loadtest").exists()
+        )
+
+    def test_percentiles(self):
+        stats = Stats()
+        for ms in range(1, 101):
+            stats.add("dashboard", ms / 1000, 200, ok=ms != 100)
+        row = stats.rows(elapsed=10)[0]
+        self.assertEqual(
+            (row["requests"], row["errors"], row["throughput"]),
+            (100, 1, 10),
+        )
+        self.assertAlmostEqual(row["p50_ms"], 50)
+        self.assertAlmostEqual(row["p99_ms"], 99)
+
+
+class SQLiteTuningTests(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_tuned_profile_applies_to_new_connections(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite only")
+        self.assertEqual(self.pragma("busy_timeout"), 5000)
+        self.assertEqual(self.pragma("synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma("cache_size"), -65536)
+        self.assertEqual(
+            connection.settings_dict["OPTIONS"]["transaction_mode"],
+            "IMMEDIATE",
+        )
+
+
+class TaskHierarchyTests(TestCase):
+    def setUp(self):
+        self.worker = Worker.objects.create_user(username="worker")
+        self.epic = self.create("Epic")
+        self.story = self.create("Story", parent=self.epic)
+        self.step = self.create("Step", parent=self.story, is_completed=True)
+        self.other = self.create("Other")
+
+    @staticmethod
+    def create(name, **fields):
+        return Task.objects.create(
+            name=name, description="-",
+            deadline=datetime.date(2026, 3, 1), **fields
+        )
+
+    def links(self):
+        return set(TaskClosure.objects.values_list(
+            "ancestor__name", "descendant__name", "depth"
+        ))
+
+    def test_moves_relink_the_whole_subtree(self):
+        self.assertEqual(self.links(), {
+            ("Epic", "Story", 1), ("Epic", "Step", 2), ("Story", "Step", 1),
+        })
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                set(hierarchy.descendants(self.epic)), {self.story, self.step}
+            )
+        self.assertEqual(
+            hierarchy.ancestors(self.step), [self.epic, self.story]
+        )
+
+        self.story.parent = self.other
+        self.story.save()
+        self.assertEqual(self.links(), {
+            ("Other", "Story", 1), ("Other", "Step", 2), ("Story", "Step", 1),
+        })
+
+        self.other.parent = self.step
+        with self.assertRaises(ValueError):
+            self.other.save()
+        self.story.parent = self.step
+        with self.assertRaises(ValueError):
+            self.story.save()
+
+    def test_removed_tasks_leave_their_subtasks_at_the_top(self):
+        self.story.delete()
+        self.step.refresh_from_db()
+        self.assertIsNone(self.step.parent)
+        self.assertEqual(self.links(), set())
+
+        self.create("Child", parent=self.other)
+        self.other.is_completed = True
+        self.other.deadline = datetime.date(2020, 1, 1)
+        self.other.save()
+        archive_tasks(older_than_days=30)
+        self.assertFalse(Task.objects.filter(parent__isnull=False).exists())
+        self.assertEqual(self.links(), set())
+
+    def test_detail_shows_subtree_progress(self):
+        self.client.force_login(self.worker)
+        url = reverse("core:task-detail", args=[self.epic.pk])
+        response = self.client.get(url)
+        self.assertEqual(
+            (response.context["subtree_total"],
+             response.context["subtree_completed"],
+             response.context["subtree_percent"]),
+            (2, 1, 50),
+        )
+        self.assertEqual(list(response.context["subtasks"]), [self.story])
+
+        response = self.client.post(
+            reverse("core:task-update", args=[self.epic.pk]),
+            {
+                "name": "Epic", "description": "-",
+                "deadline": "2026-03-01", "priority": "medium",
+                "parent": self.step.pk,
+                "expected_version": self.epic.version,
+            },
+        )
+        self.assertFormError(
+            response.context["form"], "parent",
+            "A task cannot be a subtask of itself or of one of its "
+            "subtasks.",
+        )
+
+
+@override_settings(
+    SESSION_ENGINE="core.sessions",
+    AUTHENTICATION_BACKENDS=["core.backends.CachedModelBackend"],
+)
+class AuthCacheTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.worker = Worker.objects.create_user(
+            username="worker", password="password"
+        )
+        self.client.login(username="worker", password="password")
+        self.url = reverse("core:dashboard")
+
+    def test_cached_user_is_dropped_on_deactivation(self):
+        self.client.get(self.url)
+        backend = CachedModelBackend()
+        with self.assertNumQueries(0):
+            self.assertEqual(backend.get_user(self.worker.pk), self.worker)
+
+        self.worker.is_active = False
+        self.worker.save()
+        self.assertIsNone(backend.get_user(self.worker.pk))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_logout_removes_the_cached_session(self):
+        session_key = self.client.session.session_key
+        cache_key = "django.contrib.sessions.cached_db" + session_key
+        self.assertIn(cache_key, caches["default"])
+        self.client.post(reverse("logout"))
+        self.assertNotIn(cache_key, caches["default"])
+        self.assertFalse(SessionStore().exists(session_key))
+
+    def test_check_rejects_process_local_caches(self):
+        self.assertEqual(
+            [error.id for error in check_auth_cache(None)],
+            ["core.E001", "core.E002"],
+        )
+        redis = {
+            alias: {"BACKEND": "django.core.cache.backends.redis.RedisCache"}
+            for alias in ("default", "task_pages")
+        }
+        with override_settings(CACHES=redis):
+            self.assertEqual(check_auth_cache(None), [])
+
+
+class RequestProfilerTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.profile_dir = Path(directory.name)
+        self.staff = Worker.objects.create_user(
+            username="staff", is_staff=True
+        )
+        self.client.force_login(self.staff)
+        self.url = reverse("core:dashboard")
+
+    def test_off_unless_enabled(self):
+        response = self.client.get(self.url, {"_profile": "cpu"})
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_staff_get_a_summary_instead_of_the_page(self):
+        with self.settings(PROFILE_DIR=self.profile_dir):
+            response = self.client.get(
+                self.url, HTTP_X_PROFILE="alloc", HTTP_IF_NONE_MATCH="*"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertContains(response, "view: core:dashboard  status: 200")
+        self.assertContains(response, "Top allocations by line:")
+        self.assertEqual(
+            sorted(path.suffix for path in self.profile_dir.iterdir()),
+            [".prof", ".tracemalloc"],
+        )
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_others_get_the_page(self):
+        self.staff.is_staff = False
+        self.staff.save()
+        with self.settings(PROFILE_DIR=self.profile_dir):
+            response = self.client.get(self.url, {"_profile": "cpu"})
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+        self.assertEqual(list(self.profile_dir.iterdir()), [])
+
+
+@override_settings(
+    SESSION_ENGINE="core.sessions",
+    AUTHENTICATION_BACKENDS=["core.backends.CachedModelBackend"],
+)
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.worker = Worker.objects.create_user(username="worker")
+        self.client.force_login(self.worker)
+        self.url = reverse("core:dashboard")
+
+    def etag(self, client=None):
+        response = (client or self.client).get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_matching_etag_is_answered_before_rendering(self):
+        etag = self.etag()
+        self.assertEqual(self.etag(), etag)
+        # Cached sessions and users leave the ETag lookup as the only
+        # query.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_data_changes_move_the_etag(self):
+        etag = self.etag()
+        Task.objects.create(
+            name="Task", description="-", deadline=datetime.date(2026, 3, 1)
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_differs_per_user_and_csrf_cookie(self):
+        etag = self.etag()
+        other = self.client_class()
+        other.force_login(Worker.objects.create_user(username="other"))
+        self.assertNotEqual(self.etag(other), etag)
+
+        # A new CSRF secret needs a page rendered with its token.
+        del self.client.cookies[settings.CSRF_COOKIE_NAME]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class WorkerTaskCountTests(TestCase):
+    def setUp(self):
+        self.ann = Worker.objects.create_user(username="ann")
+        self.bob = Worker.objects.create_user(username="bob")
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {number}", description="-",
+                deadline=datetime.date(2026, 3, 1),
+            )
+            for number in range(3)
+        ]
+
+    def counts(self, worker):
+        worker.refresh_from_db()
+        return worker.open_task_count, worker.completed_task_count
+
+    def test_counters_follow_assignments_and_completion(self):
+        self.tasks[0].assignees.add(self.ann, self.bob)
+        self.ann.tasks.add(self.tasks[1], self.tasks[2])
+        self.assertEqual(self.counts(self.ann), (3, 0))
+        self.assertEqual(self.counts(self.bob), (1, 0))
+
+        self.tasks[1].is_completed = True
+        self.tasks[1].save()
+        self.assertEqual(self.counts(self.ann), (2, 1))
+
+        self.ann.tasks.remove(self.tasks[1])
+        self.tasks[0].assignees.clear()
+        self.assertEqual(self.counts(self.ann), (1, 0))
+        self.assertEqual(self.counts(self.bob), (0, 0))
+
+        self.tasks[2].delete()
+        self.assertEqual(self.counts(self.ann), (0, 0))
+        self.assertEqual(reconcile_task_counts(), 0)
+
+    def test_reconcile_fixes_drift(self):
+        self.ann.tasks.add(*self.tasks)
+        Worker.objects.filter(pk=self.ann.pk).update(open_task_count=7)
+        self.assertEqual(reconcile_task_counts(dry_run=True), 1)
+        self.assertEqual(self.counts(self.ann), (7, 0))
+        self.assertEqual(reconcile_task_counts(), 1)
+        self.assertEqual(self.counts(self.ann), (3, 0))
+
+
+class TaskStatsTests(TestCase):
+    def setUp(self):
+        self.today = datetime.date(2026, 3, 10)
+        self.worker = Worker.objects.create_user(username="worker")
+        bug = TaskType.objects.create(name="Bug")
+        for name, days, completed, priority in (
+            ("Late", -1, False, "urgent"),
+            ("Done", -1, True, "low"),
+            ("Soon", 3, False, "low"),
+        ):
+            Task.objects.create(
+                name=name, description="-", priority=priority,
+                deadline=self.today + datetime.timedelta(days=days),
+                is_completed=completed, task_type=bug,
+            ).assignees.add(self.worker)
+        Task.objects.create(
+            name="Unassigned", description="-", priority="low",
+            deadline=self.today,
+        )
+
+    def test_snapshot_has_team_and_worker_rows(self):
+        self.assertEqual(take_snapshot(today=self.today), 2)
+        team = TaskStatsSnapshot.objects.get(worker=None)
+        self.assertEqual(
+            (team.total, team.completed, team.overdue), (4, 1, 1)
+        )
+        self.assertEqual(team.by_priority, {"low": 3, "urgent": 1})
+        self.assertEqual(team.by_type, {"Bug": 3})
+        mine = TaskStatsSnapshot.objects.get(worker=self.worker)
+        self.assertEqual(
+            (mine.total, mine.completed, mine.overdue), (3, 1, 1)
+        )
+
+        # Taking it again the same day replaces the rows.
+        Task.objects.filter(name="Late").delete()
+        self.assertEqual(take_snapshot(today=self.today), 2)
+        self.assertEqual(TaskStatsSnapshot.objects.count(), 2)
+        team = TaskStatsSnapshot.objects.get(worker=None)
+        self.assertEqual((team.total, team.overdue), (3, 0))
+
+    def test_trend_keeps_the_latest_snapshot_per_window(self):
+        start = self.today - datetime.timedelta(days=9)
+        TaskStatsSnapshot.objects.bulk_create(
+            TaskStatsSnapshot(
+                date=start + datetime.timedelta(days=day), total=day,
+                by_priority={"low": day},
+            )
+            for day in range(10)
+        )
+        series = trend_series(start, self.today, points=4)
+        self.assertEqual(series["window_days"], 3)
+        self.assertEqual(series["total"], [2, 5, 8, 9])
+        self.assertEqual(series["by_priority"]["low"], [2, 5, 8, 9])
+        self.assertEqual(series["by_priority"]["urgent"], [0, 0, 0, 0])
+
+        self.client.force_login(self.worker)
+        url = reverse("core:stats-trend")
+        response = self.client.get(url, {
+            "start": start, "end": self.today, "points": 4,
+        })
+        self.assertEqual(response.json()["total"], [2, 5, 8, 9])
+        response = self.client.get(url, {
+            "start": self.today, "end": start,
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskAuditTests(TestCase):
+    def setUp(self):
+        self.worker = Worker.objects.create_user(username="worker")
+        self.task = Task.objects.create(
+            name="Task", description="-", deadline=datetime.date(2026, 3, 1)
+        )
+
+    def rename(self, name):
+        self.task.name = name
+        self.task.save()
+
+    def events(self):
+        return list(
+            TaskAuditEvent.objects.order_by("pk").values_list(
+                "field", "old_value", "new_value"
+            )
+        )
+
+    def test_events_are_written_once_committed(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.rename("Renamed")
+            with self.assertRaises(ValueError):
+                with transaction.atomic():
+                    self.rename("Rolled back")
+                    raise ValueError
+            self.assertEqual(self.events(), [])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.events(), [("name", "Task", "Renamed")])
+
+    def test_context_buffers_and_flushes_in_batches(self):
+        with audit_context(
+            actor=self.worker, source=TaskAuditEvent.SOURCE_WEB,
+            flush_every=2,
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                for name in ("One", "Two", "Three"):
+                    self.rename(name)
+            # The third event waits for the next batch or the end.
+            self.assertEqual(len(self.events()), 2)
+        self.assertEqual(self.events(), [
+            ("name", "Task", "One"),
+            ("name", "One", "Two"),
+            ("name", "Two", "Three"),
+        ])
+        self.assertEqual(
+            set(TaskAuditEvent.objects.values_list("actor_id", "source")),
+            {(self.worker.pk, TaskAuditEvent.SOURCE_WEB)},
+        )
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """A primary and a replica that is a stale copy of it."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.worker = Worker.objects.create_user(
+            username="worker", password="password"
+        )
+        Task.objects.create(
+            name="Copied", description="-",
+            deadline=datetime.date(2026, 3, 1),
+        )
+        self.replica_path = Path(directory.name) / "replica.sqlite3"
+        connection.ensure_connection()
+        replica = sqlite3.connect(self.replica_path)
+        connection.connection.backup(replica)
+        replica.close()
+        # Only on the primary until the replica catches up.
+        Task.objects.create(
+            name="Fresh", description="-",
+            deadline=datetime.date(2026, 3, 1),
+        )
+        self.use_replica(self.replica_path)
+
+    def use_replica(self, path):
+        replica = {**settings.DATABASES["default"], "NAME": str(path)}
+        databases = mock.patch.dict(
+            settings.DATABASES, {REPLICA_ALIAS: replica}
+        )
+        # Lets this test connect to it without Django setting it up.
+        allowed = mock.patch.object(
+            type(self), "databases", {"default", REPLICA_ALIAS}
+        )
+        databases.start()
+        allowed.start()
+        routers._health.update(healthy=True, checked_at=None)
+
+        def remove():
+            connections[REPLICA_ALIAS].close()
+            del connections[REPLICA_ALIAS]
+            allowed.stop()
+            databases.stop()
+            routers._health.update(healthy=True, checked_at=None)
+
+        self.addCleanup(remove)
+
+    def names(self):
+        return set(Task.objects.values_list("name", flat=True))
+
+    def test_only_reads_in_replica_context_go_to_the_replica(self):
+        self.assertEqual(self.names(), {"Copied", "Fresh"})
+        with replica_reads():
+            self.assertEqual(self.names(), {"Copied"})
+            Task.objects.create(
+                name="Written", description="-",
+                deadline=datetime.date(2026, 3, 1),
+            )
+            self.assertEqual(self.names(), {"Copied"})
+        self.assertEqual(self.names(), {"Copied", "Fresh", "Written"})
+
+    def test_views_read_the_replica_until_the_user_writes(self):
+        self.client.post(
+            reverse("login"), {"username": "worker", "password": "password"}
+        )
+        # Logging in is a write, so the session starts out pinned.
+        session = self.client.session
+        session[PRIMARY_PIN_SESSION_KEY] = 0
+        session.save()
+        response = self.client.get(reverse("core:task-list"))
+        self.assertContains(response, "Copied")
+        self.assertNotContains(response, "Fresh")
+
+        self.client.post(
+            reverse("login"), {"username": "worker", "password": "password"}
+        )
+        response = self.client.get(reverse("core:task-list"))
+        self.assertContains(response, "Fresh")
+
+    def test_unavailable_replica_falls_back_to_the_primary(self):
+        broken = self.replica_path.with_name("empty.sqlite3")
+        broken.touch()
+        connections[REPLICA_ALIAS].close()
+        del connections[REPLICA_ALIAS]
+        settings.DATABASES[REPLICA_ALIAS]["NAME"] = str(broken)
+        with self.assertLogs("core.routers", "WARNING"), replica_reads():
+            self.assertEqual(self.names(), {"Copied", "Fresh"})
+
+
+@override_settings(METRICS_TOKEN="metrics-secret")
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.url = reverse("metrics")
+        self.worker = Worker.objects.create_user(username="worker")
+        Task.objects.create(
+            name="Task", description="-", deadline=datetime.date(2026, 3, 1)
+        )
+
+    def scrape(self):
+        response = self.client.get(
+            self.url, HTTP_AUTHORIZATION="Bearer metrics-secret"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_requires_the_token_or_staff(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        response = self.client.get(
+            self.url, HTTP_AUTHORIZATION="Bearer wrong"
+        )
+        self.assertEqual(response.status_code, 403)
+        self.client.force_login(self.worker)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.worker.is_staff = True
+        self.worker.save()
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_reports_requests_and_table_sizes(self):
+        labels = {"view": "core:dashboard", "method": "GET", "status": "3xx"}
+        before = REGISTRY.get_sample_value(
+            "pulseboard_requests_total", labels
+        ) or 0
+        self.client.get(reverse("core:dashboard"))
+        self.assertEqual(
+            REGISTRY.get_sample_value("pulseboard_requests_total", labels),
+            before + 1,
+        )
+        body = self.scrape()
+        self.assertIn('pulseboard_table_rows{table="core_task"} 1.0', body)
+        self.assertIn('pulseboard_table_rows{table="core_worker"} 1.0', body)
+        self.assertIn(
+            'pulseboard_request_db_queries_count{view="core:dashboard"}',
+            body,
+        )
+
+
+class AssetBundleTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output_dir = Path(directory.name)
+        settings_override = override_settings(
+            ASSET_BUNDLES_OUTPUT_DIR=self.output_dir
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def build(self):
+        out = io.StringIO()
+        call_command("build_assets", stdout=out)
+        return out.getvalue()
+
+    def render(self, name):
+        return Template(
+            "{% load assets %}{% bundle_scripts name %}"
+        ).render(Context({"name": name}))
+
+    def test_builds_minified_bundles(self):
+        self.assertEqual(
+            [error.id for error in check_asset_bundles(None)],
+            ["core.E003", "core.E003"],
+        )
+        output = self.build()
+        for name, sources in settings.ASSET_BUNDLES.items():
+            self.assertIn(f"Built {self.output_dir / name}", output)
+            bundle = (self.output_dir / name).read_text()
+            source_size = sum(
+                (Path(settings.ASSETS_DIR) / source).stat().st_size
+                for source in sources
+            )
+            self.assertLess(len(bundle), source_size)
+        dashboard = (self.output_dir / "dashboard.min.js").read_text()
+        self.assertLess(dashboard.index("Chart"), dashboard.index("canvas"))
+        self.assertEqual(check_asset_bundles(None), [])
+
+    def test_missing_source_fails(self):
+        with override_settings(ASSET_BUNDLES={"x.min.js": ["js/none.js"]}):
+            with self.assertRaisesMessage(CommandError, "js/none.js"):
+                self.build()
+        self.assertFalse((self.output_dir / "x.min.js").exists())
+
+    def test_debug_loads_sources_until_built(self):
+        with override_settings(DEBUG=True):
+            self.assertHTMLEqual(self.render("dashboard.min.js"), (
+                '<script src="/static/assets/vendor/chartjs/chart.umd.min.js"'
+                " defer></script>"
+                '<script src="/static/assets/js/dashboard.js" defer>'
+                "</script>"
+            ))
+            self.build()
+            self.assertHTMLEqual(
+                self.render("dashboard.min.js"),
+                '<script src="/static/dist/dashboard.min.js" defer></script>',
+            )
+        (self.output_dir / "board.min.js").unlink()
+        self.assertHTMLEqual(
+            self.render("board.min.js"),
+            '<script src="/static/dist/board.min.js" defer></script>',
+        )
+
+
+class StartupTests(TestCase):
+    def gunicorn_config(self, **env):
+        environ = {
+            name: value for name, value in os.environ.items()
+            if not name.startswith("GUNICORN_")
+            and name not in ("PORT", "WEB_CONCURRENCY")
+        }
+        with mock.patch.dict(os.environ, {**environ, **env}, clear=True):
+            return runpy.run_path(
+                str(settings.BASE_DIR / "gunicorn.conf.py")
+            )
+
+    def test_profile_reports_phases_and_packages(self):
+        out = io.StringIO()
+        call_command(
+            "startup_profile", "--repeat", "1", "--top", "3", stdout=out
+        )
+        lines = out.getvalue().splitlines()
+        phases = lines[1:lines.index("")]
+        self.assertEqual(
+            [line.rsplit(maxsplit=1)[0] for line in phases],
+            ["settings", "app loading", "URLconf", "total"],
+        )
+        packages = lines[lines.index("") + 2:]
+        self.assertEqual(len(packages), 3)
+        self.assertIn("django", [line.split()[0] for line in packages])
+
+    def test_gunicorn_config_reads_the_environment(self):
+        config = self.gunicorn_config()
+        self.assertEqual(
+            (config["bind"], config["workers"], config["worker_class"],
+             config["threads"]),
+            ("0.0.0.0:8000", 2, "gthread", 4),
+        )
+        self.assertTrue(config["preload_app"])
+        self.assertTrue(config["warmup"])
+
+        config = self.gunicorn_config(
+            PORT="9000", WEB_CONCURRENCY="5", GUNICORN_WORKER_CLASS="sync",
+            GUNICORN_PRELOAD="false", GUNICORN_WARMUP="1",
+        )
+        self.assertEqual(
+            (config["bind"], config["workers"], config["worker_class"]),
+            ("0.0.0.0:9000", 5, "sync"),
+        )
+        self.assertFalse(config["preload_app"])
+        self.assertTrue(config["warmup"])
+
+    def test_warm_up_runs_once_where_the_app_is_loaded(self):
+        for preload, in_master, in_worker in (
+            ("true", 1, 0), ("false", 0, 1),
+        ):
+            config = self.gunicorn_config(GUNICORN_PRELOAD=preload)
+            with mock.patch("pulseboard.startup.warm_up") as warm_up:
+                config["when_ready"](None)
+                self.assertEqual(warm_up.call_count, in_master)
+                config["post_worker_init"](None)
+                self.assertEqual(warm_up.call_count, in_master + in_worker)
+
+        config = self.gunicorn_config(GUNICORN_WARMUP="no")
+        with mock.patch("pulseboard.startup.warm_up") as warm_up:
+            config["when_ready"](None)
+            config["post_worker_init"](None)
+        warm_up.assert_not_called()
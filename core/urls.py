@@ -2,24 +2,47 @@ from django.urls import path
 
 from .views import (
     DashboardView,
+    TaskStatsTrendView,
     TaskListView,
+    TaskBoardView,
+    TaskBoardColumnView,
+    TaskMoveView,
     TaskCreateView,
     TaskDetailView,
     TaskUpdateView,
     TaskDeleteView,
+    TaskChangesView,
     WorkerListView,
     WorkerDetailView,
     WorkerUpdateView,
+    CalendarFeedView,
+    CalendarTokenResetView,
+    JobListView,
 )
 
 urlpatterns = [
     path("", DashboardView.as_view(), name="dashboard"),
+    path(
+        "stats/trend/",
+        TaskStatsTrendView.as_view(),
+        name="stats-trend",
+    ),
 
     path(
         "tasks/",
         TaskListView.as_view(),
         name="task-list",
     ),
+    path(
+        "tasks/board/",
+        TaskBoardView.as_view(),
+        name="task-board",
+    ),
+    path(
+        "tasks/board/<str:column>/",
+        TaskBoardColumnView.as_view(),
+        name="task-board-column",
+    ),
     path(
         "tasks/create/",
         TaskCreateView.as_view(),
@@ -35,11 +58,21 @@ urlpatterns = [
         TaskUpdateView.as_view(),
         name="task-update",
     ),
+    path(
+        "tasks/<int:pk>/move/",
+        TaskMoveView.as_view(),
+        name="task-move",
+    ),
     path(
         "tasks/<int:pk>/delete/",
         TaskDeleteView.as_view(),
         name="task-delete",
     ),
+    path(
+        "sync/tasks/",
+        TaskChangesView.as_view(),
+        name="task-changes",
+    ),
 
     path(
         "workers/",
@@ -56,6 +89,28 @@ urlpatterns = [
         WorkerUpdateView.as_view(),
         name="worker-update",
     ),
+
+    path(
+        "calendar/<str:token>/tasks.ics",
+        CalendarFeedView.as_view(scope="worker"),
+        name="calendar-worker",
+    ),
+    path(
+        "calendar/<str:token>/team.ics",
+        CalendarFeedView.as_view(scope="team"),
+        name="calendar-team",
+    ),
+    path(
+        "calendar/reset/",
+        CalendarTokenResetView.as_view(),
+        name="calendar-reset",
+    ),
+
+    path(
+        "jobs/",
+        JobListView.as_view(),
+        name="job-list",
+    ),
 ]
 
 app_name = "core"
@@ -1,10 +1,22 @@
 import json
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q, Count
+from django.db.models import Count, F
 from django.utils import timezone
 from django.urls import reverse_lazy, reverse
-from django.http import HttpResponseForbidden
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date, quote_etag
+from django.core.exceptions import BadRequest
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseForbidden,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404, redirect
 from django.views.generic import (
     ListView,
     CreateView,
@@ -12,47 +24,71 @@ from django.views.generic import (
     UpdateView,
     DeleteView,
     TemplateView,
+    View,
 )
 
-from core.models import Task, TaskType
+from core import board, hierarchy, ical, jobs, metrics, sync
+from core.deadlines import deadline_q
+from core.facets import task_facets
+from core.filters import normalized_filters, task_filter_q
+from core.pagecache import CachedTaskList
+from core.search import search_workers
+from core.mixins import ConditionalGetMixin, ReplicaReadMixin
+from core.models import (
+    ArchivedTask,
+    DataVersion,
+    Job,
+    Task,
+    TaskAuditEvent,
+    TaskType,
+    VersionConflict,
+)
 from core.forms import (
+    TASK_CONFLICT_MESSAGE,
     TaskForm,
     TaskSearchForm,
     TaskFilterForm,
     WorkerSearchForm,
     WorkerFilterForm,
     WorkerUpdateForm,
+    TaskStatsTrendForm,
+    JobEnqueueForm,
 )
+from core.stats import trend_series
 
 User = get_user_model()
 
 
-class DashboardView(LoginRequiredMixin, TemplateView):
+class DashboardView(
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    TemplateView,
+):
     template_name = "core/index.html"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
-        today = timezone.now().date()
+        overdue = deadline_q("overdue")
 
         # Personal Statistics
         personal_tasks = Task.objects.filter(assignees=user)
         personal_total = personal_tasks.count()
         personal_completed = personal_tasks.filter(is_completed=True).count()
         personal_pending = personal_tasks.filter(is_completed=False).count()
-        personal_overdue = personal_tasks.filter(
-            is_completed=False,
-            deadline__lt=today
-        ).count()
+        personal_overdue = personal_tasks.filter(overdue).count()
         personal_completion_percent = (
             (personal_completed / personal_total * 100)
             if personal_total > 0 else 0
         )
 
         # Distribution of tasks by priorities (personal)
-        personal_priority_dist = personal_tasks.values("priority").annotate(
+        personal_priority_dist = personal_tasks.values(
+            "priority", "priority_rank"
+        ).annotate(
             count=Count("id")
-        )
+        ).order_by("priority_rank")
         personal_priorities = {}
         for item in personal_priority_dist:
             count = item["count"]
@@ -71,7 +107,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             task_type__isnull=False
         ).values("task_type__name").annotate(
             count=Count("id")
-        )
+        ).order_by("task_type__name")
         personal_types = {}
         for item in personal_type_dist:
             count = item["count"]
@@ -90,19 +126,18 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         team_total = team_tasks.count()
         team_completed = team_tasks.filter(is_completed=True).count()
         team_pending = team_tasks.filter(is_completed=False).count()
-        team_overdue = team_tasks.filter(
-            is_completed=False,
-            deadline__lt=today
-        ).count()
+        team_overdue = team_tasks.filter(overdue).count()
         team_completion_percent = (
             (team_completed / team_total * 100)
             if team_total > 0 else 0
         )
 
         # Distribution of tasks by priorities (team)
-        team_priority_dist = team_tasks.values("priority").annotate(
+        team_priority_dist = team_tasks.values(
+            "priority", "priority_rank"
+        ).annotate(
             count=Count("id")
-        )
+        ).order_by("priority_rank")
         team_priorities = {}
         for item in team_priority_dist:
             count = item["count"]
@@ -117,7 +152,7 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             task_type__isnull=False
         ).values("task_type__name").annotate(
             count=Count("id")
-        )
+        ).order_by("task_type__name")
         team_types = {}
         for item in team_type_dist:
             count = item["count"]
@@ -128,11 +163,11 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             }
 
         # Top 5 workers with the most tasks
-        top_workers = User.objects.annotate(
-            task_count=Count("tasks")
+        top_workers = User.objects.alias(
+            total_tasks=F("open_task_count") + F("completed_task_count")
         ).filter(
-            task_count__gt=0
-        ).order_by("-task_count")[:5].select_related("position")
+            total_tasks__gt=0
+        ).order_by("-total_tasks")[:5].select_related("position")
 
         # Preparation of JSON data for charts
         personal_priority_chart = {
@@ -183,12 +218,52 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         return context
 
 
-class TaskListView(LoginRequiredMixin, ListView):
+class TaskStatsTrendView(LoginRequiredMixin, ReplicaReadMixin, View):
+    """JSON time series of daily task statistics for trend charts."""
+
+    def get(self, request, *args, **kwargs):
+        form = TaskStatsTrendForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+
+        series = trend_series(
+            form.cleaned_data["start"],
+            form.cleaned_data["end"],
+            worker=form.cleaned_data["worker"],
+            points=form.cleaned_data["points"] or 60,
+        )
+        return JsonResponse(series)
+
+
+class TaskListView(
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    ListView,
+):
     model = Task
     template_name = "core/task_list.html"
     context_object_name = "tasks"
     paginate_by = 20
 
+    # ``?sort=`` values; each ordering is served by an index in
+    # ``Task.Meta.indexes`` (or the primary key).
+    SORT_ORDERINGS = {
+        "id": ["id"],
+        "-id": ["-id"],
+        "name": ["name", "id"],
+        "-name": ["-name", "-id"],
+        "deadline": ["deadline", "id"],
+        "-deadline": ["-deadline", "-id"],
+        "priority": ["priority_rank", "id"],
+        "-priority": ["-priority_rank", "-id"],
+    }
+    default_sort = "-id"
+
+    def get_sort(self):
+        sort = self.request.GET.get("sort")
+        return sort if sort in self.SORT_ORDERINGS else self.default_sort
+
     def get_queryset(self):
         queryset = Task.objects.select_related(
             "task_type"
@@ -196,60 +271,44 @@ class TaskListView(LoginRequiredMixin, ListView):
             "assignees"
         )
 
-        # Search filter
-        search = self.request.GET.get("search")
-        if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search)
-                | Q(description__icontains=search)
-            )
-
-        # Status filter
-        status = self.request.GET.get("status")
-        if status == "completed":
-            queryset = queryset.filter(is_completed=True)
-        elif status == "pending":
-            queryset = queryset.filter(is_completed=False)
-
-        # Priority filter
-        priority = self.request.GET.get("priority")
-        if priority and priority != "all":
-            queryset = queryset.filter(priority=priority)
-
-        # Task type filter
-        task_type_id = self.request.GET.get("task_type")
-        if task_type_id and task_type_id != "all":
-            queryset = queryset.filter(task_type_id=task_type_id)
-
-        # Deadline filter
-        deadline_filter = self.request.GET.get("deadline_filter")
-        today = timezone.now().date()
-        if deadline_filter:
-            if deadline_filter == "today":
-                queryset = queryset.filter(deadline=today)
-            elif deadline_filter == "next_3_days":
-                end_date = today + timezone.timedelta(days=3)
-                queryset = queryset.filter(deadline__gte=today,
-                                           deadline__lte=end_date)
-            elif deadline_filter == "next_week":
-                end_date = today + timezone.timedelta(days=7)
-                queryset = queryset.filter(deadline__gte=today,
-                                           deadline__lte=end_date)
-            elif deadline_filter == "overdue":
-                queryset = queryset.filter(deadline__lt=today,
-                                           is_completed=False)
-
-        # Assignee filter
-        assignee_id = self.request.GET.get("assignee")
-        if assignee_id and assignee_id != "all":
-            queryset = queryset.filter(assignees__id=assignee_id).distinct()
-
-        return queryset
+        filters = normalized_filters(self.request.GET)
+        if filters:
+            queryset = queryset.filter(task_filter_q(filters))
+
+        return queryset.order_by(*self.SORT_ORDERINGS[self.get_sort()])
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        # Pages are served from cached id lists, see core.pagecache.
+        tasks = CachedTaskList(
+            queryset,
+            Task.objects.select_related(
+                "task_type"
+            ).prefetch_related(
+                "assignees"
+            ),
+            key_parts=[
+                normalized_filters(self.request.GET),
+                [str(field) for field in
+                 queryset.query.order_by or Task._meta.ordering],
+                self.data_versions[DataVersion.TASKS],
+                timezone.localdate().isoformat(),
+            ],
+        )
+        return super().get_paginator(tasks, per_page, **kwargs)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["task_page"] = "active"
-        context["today"] = timezone.now().date()
+        context["today"] = timezone.localdate()
+
+        sort = self.get_sort()
+        context["sort"] = sort
+        # What each column header links to: ascending first, then flip.
+        context["sort_toggles"] = {
+            column: f"-{column}" if sort == column else column
+            for column in ("id", "name", "deadline", "priority")
+        }
+        context["sort_toggles"]["id"] = "id" if sort == "-id" else "-id"
 
         search_form = TaskSearchForm(self.request.GET)
         filter_form = TaskFilterForm(self.request.GET)
@@ -257,6 +316,11 @@ class TaskListView(LoginRequiredMixin, ListView):
         context["search_form"] = search_form
         context["filter_form"] = filter_form
 
+        filter_form.show_counts(task_facets(
+            normalized_filters(self.request.GET),
+            self.data_versions[DataVersion.TASKS],
+        ))
+
         active_filters_count = 0
         filter_data = filter_form.data if filter_form.is_bound else {}
 
@@ -281,34 +345,167 @@ class TaskListView(LoginRequiredMixin, ListView):
         return context
 
 
+class TaskBoardView(
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    TemplateView,
+):
+    """Tasks as a Kanban board, filtered like the task list."""
+
+    template_name = "core/task_board.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        condition = task_filter_q(normalized_filters(self.request.GET))
+        counts = board.column_counts(condition)
+
+        columns = []
+        all_cards = []
+        for column in board.COLUMNS:
+            cards, next_cursor = [], None
+            if counts[column.key]:
+                cards, next_cursor = board.column_page(
+                    column, condition, settings.TASK_BOARD_PAGE_SIZE
+                )
+            all_cards.extend(cards)
+            columns.append({
+                "column": column,
+                "count": counts[column.key],
+                "cards": cards,
+                "next_cursor": next_cursor,
+            })
+        board.load_assignees(all_cards)
+
+        context["columns"] = columns
+        context["search_form"] = TaskSearchForm(self.request.GET)
+        context["task_page"] = "active"
+        context["today"] = timezone.localdate()
+        return context
+
+
+class TaskBoardColumnView(
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    TemplateView,
+):
+    """Next cards of one board column, as an HTML fragment."""
+
+    template_name = "core/task_board_cards.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        column = board.COLUMNS_BY_KEY.get(kwargs["column"])
+        if column is None:
+            raise Http404("Unknown board column")
+        try:
+            cursor = board.decode_cursor(self.request.GET.get("after", ""))
+        except ValueError:
+            raise BadRequest("Invalid cursor")
+
+        cards, next_cursor = board.column_page(
+            column,
+            task_filter_q(normalized_filters(self.request.GET)),
+            settings.TASK_BOARD_PAGE_SIZE,
+            cursor,
+        )
+        board.load_assignees(cards)
+        context["column"] = column
+        context["cards"] = cards
+        context["next_cursor"] = next_cursor
+        context["today"] = timezone.localdate()
+        return context
+
+
+class TaskMoveView(LoginRequiredMixin, View):
+    """Move a task to another board column."""
+
+    def post(self, request, *args, **kwargs):
+        column = board.COLUMNS_BY_KEY.get(request.POST.get("column"))
+        if column is None:
+            raise BadRequest("Unknown board column")
+        if not board.move_task(kwargs["pk"], column, actor=request.user):
+            raise Http404("No such task")
+        return JsonResponse({"task": kwargs["pk"], "column": column.key})
+
+
 class TaskCreateView(LoginRequiredMixin, CreateView):
     model = Task
     form_class = TaskForm
     success_url = reverse_lazy("core:task-list")
 
+    def get_initial(self):
+        # "Add subtask" links pass the parent along.
+        initial = super().get_initial()
+        parent = self.request.GET.get("parent", "")
+        if parent.isdigit():
+            initial["parent"] = int(parent)
+        return initial
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["task_page"] = "active"
         return context
 
 
-class TaskDetailView(LoginRequiredMixin, DetailView):
+class TaskDetailView(
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    DetailView,
+):
     model = Task
     fields = "__all__"
+    template_name = "core/task_detail.html"
+    context_object_name = "task"
     success_url = reverse_lazy("core:task-list")
+    audit_events_limit = 50
+    subtasks_limit = 100
+
+    def get_object(self, queryset=None):
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            # Links to tasks moved by ``archive_tasks`` keep working.
+            return get_object_or_404(ArchivedTask, pk=self.kwargs["pk"])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["task_page"] = "active"
-        context["today"] = timezone.now().date()
+        context["today"] = timezone.localdate()
+        context["audit_events"] = TaskAuditEvent.objects.filter(
+            task_id=self.object.pk
+        ).select_related("actor")[:self.audit_events_limit]
+        if not self.object.is_archived:
+            context.update(self.hierarchy_context(self.object))
         return context
 
+    def hierarchy_context(self, task):
+        total, completed = hierarchy.subtree_progress(task)
+        return {
+            "ancestors": hierarchy.ancestors(task),
+            "subtasks": task.subtasks.order_by(
+                "is_completed", "deadline", "pk"
+            )[:self.subtasks_limit],
+            "subtree_total": total,
+            "subtree_completed": completed,
+            "subtree_percent": round(completed * 100 / total) if total else 0,
+        }
+
 
 class TaskUpdateView(LoginRequiredMixin, UpdateView):
     model = Task
     form_class = TaskForm
     success_url = reverse_lazy("core:task-list")
 
+    def form_valid(self, form):
+        try:
+            return super().form_valid(form)
+        except VersionConflict:
+            form.add_error(None, TASK_CONFLICT_MESSAGE)
+            return self.form_invalid(form)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["task_page"] = "active"
@@ -325,7 +522,7 @@ class TaskDeleteView(LoginRequiredMixin, DeleteView):
         return context
 
 
-class WorkerListView(LoginRequiredMixin, ListView):
+class WorkerListView(LoginRequiredMixin, ReplicaReadMixin, ListView):
     model = User
     template_name = "core/worker_list.html"
     context_object_name = "workers"
@@ -336,11 +533,7 @@ class WorkerListView(LoginRequiredMixin, ListView):
 
         search = self.request.GET.get("search")
         if search:
-            queryset = queryset.filter(
-                Q(first_name__icontains=search)
-                | Q(last_name__icontains=search)
-                | Q(username__icontains=search)
-            )
+            queryset = search_workers(queryset, search)
 
         position_id = self.request.GET.get("position")
         if position_id and position_id != "all":
@@ -371,23 +564,44 @@ class WorkerListView(LoginRequiredMixin, ListView):
         return context
 
 
-class WorkerDetailView(LoginRequiredMixin, DetailView):
+class WorkerDetailView(
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    DetailView,
+):
     model = User
     context_object_name = "worker"
+    archived_tasks_limit = 50
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        worker = self.get_object()
+        worker = self.object
 
         all_tasks = Task.objects.filter(assignees=worker).select_related(
             "task_type"
         )
         context["completed_tasks"] = all_tasks.filter(is_completed=True)
         context["pending_tasks"] = all_tasks.filter(is_completed=False)
+        archived_tasks = ArchivedTask.objects.filter(assignees=worker)
+        context["archived_task_count"] = archived_tasks.count()
+        context["archived_tasks"] = archived_tasks.select_related(
+            "task_type"
+        )[:self.archived_tasks_limit]
         context["can_edit"] = self.request.user == worker
+        if context["can_edit"] and worker.calendar_token:
+            context["calendar_feeds"] = [
+                (label, settings.SITE_URL + reverse(
+                    url_name, kwargs={"token": worker.calendar_token}
+                ))
+                for label, url_name in (
+                    ("My tasks", "core:calendar-worker"),
+                    ("Team", "core:calendar-team"),
+                )
+            ]
 
         context["worker_page"] = "active"
-        context["today"] = timezone.now().date()
+        context["today"] = timezone.localdate()
         return context
 
 
@@ -407,3 +621,155 @@ class WorkerUpdateView(LoginRequiredMixin, UpdateView):
         context = super().get_context_data(**kwargs)
         context["worker_page"] = "active"
         return context
+
+
+class TaskChangesView(View):
+    """Change feed for task mirrors; see ``core.sync``.
+
+    Tools authenticate with "Authorization: Bearer <SYNC_TOKEN>"; signed
+    in users can read it too.
+    """
+
+    def get(self, request, *args, **kwargs):
+        if not self.has_access(request):
+            return HttpResponseForbidden("Sign in or send the sync token")
+        try:
+            cursor = request.GET.get("cursor")
+            if cursor is not None:
+                cursor = sync.decode_cursor(cursor)
+            limit = int(request.GET.get("limit", settings.SYNC_BATCH_SIZE))
+        except ValueError:
+            raise BadRequest("Invalid cursor or limit")
+        limit = min(max(limit, 1), settings.SYNC_BATCH_MAX)
+
+        try:
+            page = sync.changes(cursor, limit)
+        except sync.CursorExpired:
+            return JsonResponse(
+                {"error": "Cursor expired; sync again without one."},
+                status=410,
+            )
+        response = JsonResponse(page)
+        patch_cache_control(response, private=True, no_store=True)
+        return response
+
+    @staticmethod
+    def has_access(request):
+        token = settings.SYNC_TOKEN
+        header = request.headers.get("Authorization", "")
+        if token and constant_time_compare(header, f"Bearer {token}"):
+            return True
+        return request.user.is_authenticated
+
+
+class CalendarFeedView(View):
+    """iCalendar feed of open task deadlines for calendar apps.
+
+    Calendar apps cannot log in, so the worker is identified by the
+    secret token in the URL instead.
+    """
+
+    scope = ical.SCOPE_WORKER
+
+    def get(self, request, *args, **kwargs):
+        try:
+            worker = User.objects.only(
+                "first_name", "last_name", "username"
+            ).get(calendar_token=kwargs["token"], is_active=True)
+        except User.DoesNotExist:
+            raise Http404("No such calendar")
+
+        if self.scope == ical.SCOPE_TEAM:
+            name = "Pulseboard: team deadlines"
+        else:
+            name = "Pulseboard: " + (
+                worker.get_full_name() or worker.username
+            )
+        versions, last_modified = DataVersion.snapshot([DataVersion.TASKS])
+        if last_modified is None:
+            last_modified = timezone.now().replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+        etag = quote_etag(ical.feed_etag(
+            self.scope, worker, name, versions[DataVersion.TASKS]
+        ))
+        last_modified_ts = int(last_modified.timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified_ts
+        )
+        if response is None:
+            rows = ical.feed_tasks(self.scope, worker).iterator(
+                chunk_size=2000
+            )
+            response = StreamingHttpResponse(
+                ical.render_feed(rows, name, last_modified),
+                content_type="text/calendar; charset=utf-8",
+            )
+        response.headers.setdefault("ETag", etag)
+        response.headers.setdefault(
+            "Last-Modified", http_date(last_modified_ts)
+        )
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class CalendarTokenResetView(LoginRequiredMixin, View):
+    """Create new calendar feed URLs, revoking the old ones."""
+
+    def post(self, request, *args, **kwargs):
+        request.user.calendar_token = ical.new_token()
+        request.user.save(update_fields=["calendar_token"])
+        return redirect("core:worker-detail", pk=request.user.pk)
+
+
+class JobListView(LoginRequiredMixin, ListView):
+    """Background job progress; staff see all jobs and can start some."""
+
+    model = Job
+    template_name = "core/job_list.html"
+    context_object_name = "jobs"
+    paginate_by = 20
+
+    def get_queryset(self):
+        queryset = Job.objects.select_related("created_by").defer(
+            "payload", "result"
+        )
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(created_by=self.request.user)
+        return queryset
+
+    def post(self, request, *args, **kwargs):
+        if not request.user.is_staff:
+            return HttpResponseForbidden("Only staff can start jobs")
+        form = JobEnqueueForm(request.POST)
+        if form.is_valid():
+            jobs.enqueue(form.cleaned_data["name"], user=request.user)
+        return redirect("core:job-list")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["job_page"] = "active"
+        context["enqueue_form"] = JobEnqueueForm()
+        context["has_active_jobs"] = any(
+            job.is_active for job in context["jobs"]
+        )
+        return context
+
+
+class MetricsView(View):
+    """Prometheus scrape endpoint."""
+
+    def get(self, request, *args, **kwargs):
+        if not self.has_access(request):
+            return HttpResponseForbidden("Metrics are not public")
+        body, content_type = metrics.render()
+        return HttpResponse(body, content_type=content_type)
+
+    @staticmethod
+    def has_access(request):
+        token = settings.METRICS_TOKEN
+        header = request.headers.get("Authorization", "")
+        if token and constant_time_compare(header, f"Bearer {token}"):
+            return True
+        return request.user.is_staff
@@ -0,0 +1,73 @@
+"""Gunicorn configuration.
+
+Picked up automatically by ``gunicorn pulseboard.wsgi``. Every setting can
+be overridden from the environment, which is how
+``python manage.py startup_profile --serve`` compares configurations.
+"""
+import glob
+import os
+
+
+def env_flag(name, default):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+
+# Load Django once in the master so workers fork with it already imported.
+preload_app = env_flag("GUNICORN_PRELOAD", "true")
+
+# Recycle workers to cap memory growth; the jitter keeps them from all
+# restarting at the same moment.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# Import the URLconf and compile templates before serving instead of on
+# the first request ("lazy" mode when disabled).
+warmup = env_flag("GUNICORN_WARMUP", "true")
+
+
+# Worker processes share Prometheus samples through files in this
+# directory (see core.metrics).
+metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+
+def on_starting(server):
+    # Samples left by a previous run would be added to the new totals.
+    if metrics_dir:
+        for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+            os.remove(path)
+
+
+def when_ready(server):
+    if preload_app and warmup:
+        from pulseboard.startup import warm_up
+        warm_up()
+
+
+def post_worker_init(worker):
+    if warmup and not preload_app:
+        from pulseboard.startup import warm_up
+        warm_up()
+
+
+def post_fork(server, worker):
+    from core.metrics import WORKER_EVENTS
+    WORKER_EVENTS.labels("boot").inc()
+
+
+def worker_abort(worker):
+    from core.metrics import WORKER_EVENTS
+    WORKER_EVENTS.labels("abort").inc()
+
+
+def child_exit(server, worker):
+    from core.metrics import WORKER_EVENTS
+    WORKER_EVENTS.labels("exit").inc()
+    if metrics_dir:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -8,7 +8,7 @@ load_dotenv()
 
 def main():
     """Run administrative tasks."""
-    os.getenv("DJANGO_SETTINGS_MODULE", "pulseboard.settings.dev")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pulseboard.settings")
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
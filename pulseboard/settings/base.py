@@ -41,12 +41,16 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "core.middleware.RequestMetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.TaskAuditMiddleware",
+    "core.middleware.ReplicaPinMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.RequestProfilerMiddleware",
 ]
 
 ROOT_URLCONF = "pulseboard.urls"
@@ -122,15 +126,173 @@ STATIC_ROOT = "staticfiles/"
 
 STATICFILES_DIRS = (BASE_DIR / "static",)
 
+# Front-end bundles built by `python manage.py build_assets` from the
+# sources in ASSETS_DIR. Output lands in static/dist/ before collectstatic.
+ASSETS_DIR = BASE_DIR / "assets"
+ASSET_BUNDLES_OUTPUT_DIR = BASE_DIR / "static" / "dist"
+ASSET_BUNDLES = {
+    "dashboard.min.js": [
+        "vendor/chartjs/chart.umd.min.js",
+        "js/dashboard.js",
+    ],
+    "board.min.js": [
+        "js/board.js",
+    ],
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Read replica routing. DATABASES["replica"] is optional and is set up in
+# the environment-specific settings.
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+REPLICA_PIN_SECONDS = 5
+REPLICA_HEALTH_CHECK_INTERVAL = 10
+
+# SQLite connection tuning (core.sqlite), applied to every new SQLite
+# connection. "tuned" uses write-ahead logging so reads and a write can
+# run at once; "default" keeps SQLite's own settings. Compare the two
+# with ``python manage.py benchmark_sqlite``.
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE") or "tuned"
+SQLITE_PROFILES = {
+    "default": {},
+    "tuned": {
+        "busy_timeout": 5000,
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # in KiB when negative
+        "temp_store": "memory",
+    },
+}
+SQLITE_PRAGMAS = SQLITE_PROFILES[SQLITE_PROFILE]
+# Database OPTIONS of SQLite connections. BEGIN IMMEDIATE takes the write
+# lock up front, so read-then-write transactions queue on busy_timeout
+# instead of deadlocking when they upgrade their lock.
+SQLITE_OPTIONS = (
+    {"transaction_mode": "IMMEDIATE"} if SQLITE_PRAGMAS else {}
+)
+
+# Caching
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+CACHES = {
+    "default": {
+        "BACKEND": (
+            os.getenv("CACHE_BACKEND")
+            or "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION") or "pulseboard",
+    },
+    # Ordered task ids per task list filter (core.pagecache). Kept in
+    # process memory and bounded; least recently used entries go first.
+    "task_pages": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "task-pages",
+        "TIMEOUT": 300,
+        "OPTIONS": {
+            "MAX_ENTRIES": int(
+                os.getenv("TASK_PAGE_CACHE_MAX_ENTRIES") or 2000
+            ),
+        },
+    },
+}
+
+# Caches private to one process. Every gunicorn worker has its own, so
+# dropping an entry in one worker leaves it in the others.
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+# With a shared cache (Redis or Memcached), sessions are read from the
+# cache and written through to the database (``cached_db``, with hit/miss
+# counts reported to /metrics), and ``request.user`` is cached too.
+# Otherwise a logout or a deactivated account would only be seen by the
+# worker that handled it, so both stay in the database (see core.checks).
+SESSION_CACHE_ALIAS = os.getenv("SESSION_CACHE_ALIAS") or "default"
+SHARED_AUTH_CACHE = not {
+    CACHES["default"]["BACKEND"], CACHES[SESSION_CACHE_ALIAS]["BACKEND"],
+} & set(PROCESS_LOCAL_CACHE_BACKENDS)
+if SHARED_AUTH_CACHE:
+    SESSION_ENGINE = "core.sessions"
+    AUTHENTICATION_BACKENDS = ["core.backends.CachedModelBackend"]
+else:
+    SESSION_ENGINE = "django.contrib.sessions.backends.db"
+    AUTHENTICATION_BACKENDS = ["django.contrib.auth.backends.ModelBackend"]
+
 # Authentication settings
+AUTH_USER_CACHE_TIMEOUT = 300
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/logout/"
 LOGIN_URL = "/login/"
 
+# Task list facet counts (core.facets)
+TASK_FACET_CACHE_TIMEOUT = 300
+TASK_FACET_TOP_ASSIGNEES = 10
+
+# Cached task list pages (core.pagecache)
+TASK_PAGE_CACHE_CHUNK = 500
+TASK_PAGE_CACHE_TIMEOUT = 300
+
+# Cards per column on the task board, and per "load more" (core.board)
+TASK_BOARD_PAGE_SIZE = 20
+
+# Task audit log
+TASK_AUDIT_ENABLED = True
+TASK_AUDIT_FLUSH_EVERY = 100
+
+# Prometheus scrapers authenticate with "Authorization: Bearer <token>";
+# staff users can open /metrics without it.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# On-demand profiling of single requests by staff users (?_profile=cpu or
+# ?_profile=alloc); see core.profiling. Off unless PROFILING_ENABLED=true.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_DIR = os.getenv("PROFILE_DIR") or BASE_DIR / "profiles"
+PROFILE_TOP = 30
+PROFILE_TRACEMALLOC_FRAMES = 10
+
+# Email
+EMAIL_BACKEND = (
+    os.getenv("EMAIL_BACKEND")
+    or "django.core.mail.backends.smtp.EmailBackend"
+)
+EMAIL_HOST = os.getenv("EMAIL_HOST") or "localhost"
+EMAIL_PORT = int(os.getenv("EMAIL_PORT") or 25)
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "false").lower() == "true"
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL") or "pulseboard@localhost"
+# Prefix of links in emails.
+SITE_URL = os.getenv("SITE_URL") or "http://localhost:8000"
+
+# Deadline reminder digests (core.digests, manage.py send_deadline_digests)
+DIGEST_DUE_WITHIN_DAYS = 3
+DIGEST_BATCH_SIZE = 100
+
+# Task change feed for mirrors (core.sync, /sync/tasks/). Tools send
+# "Authorization: Bearer <SYNC_TOKEN>". Changes are logged for
+# SYNC_CHANGE_LOG_DAYS; older cursors have to sync again.
+SYNC_TOKEN = os.getenv("SYNC_TOKEN", "")
+SYNC_BATCH_SIZE = 500
+SYNC_BATCH_MAX = 2000
+SYNC_CHANGE_LOG_DAYS = 30
+
+# Background jobs (core.jobs), run by ``manage.py run_workers``. Failed
+# jobs are retried after JOB_RETRY_BACKOFF seconds, doubling each time.
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY") or 2)
+JOB_POLL_INTERVAL = 1.0
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_BACKOFF = 30
+JOB_RETRY_BACKOFF_MAX = 3600
+JOB_STALE_AFTER = 900
+# Running jobs are marked alive this often, in seconds, from a thread of
+# the worker; must stay well below JOB_STALE_AFTER.
+JOB_HEARTBEAT_INTERVAL = 60
+# Admin bulk edits of more tasks than this run as a background job.
+JOB_BULK_UPDATE_THRESHOLD = 1000
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = ("bootstrap5",)
 CRISPY_TEMPLATE_PACK = "bootstrap5"
@@ -4,6 +4,10 @@ DEBUG = True
 
 ALLOWED_HOSTS = []
 
+# Bundle sources, which {% bundle_scripts %} loads until build_assets has
+# written the minified bundles.
+STATICFILES_DIRS = (*STATICFILES_DIRS, ("assets", ASSETS_DIR))
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv("SECRET_KEY", "django-insecure--nn*&3=h73fb0t=20!&6v@p6of(ysag_9f)d^(&2&g&$frhdp&")
 
@@ -13,6 +17,23 @@ SECRET_KEY = os.getenv("SECRET_KEY", "django-insecure--nn*&3=h73fb0t=20!&6v@p6of
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": BASE_DIR / (os.getenv("SQLITE_PATH") or "db.sqlite3"),
+        "OPTIONS": SQLITE_OPTIONS,
     }
-}
\ No newline at end of file
+}
+
+# Optional read replica, e.g. a copy of db.sqlite3 to try out routing:
+# SQLITE_REPLICA_PATH=db-replica.sqlite3
+if os.getenv("SQLITE_REPLICA_PATH"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / os.environ["SQLITE_REPLICA_PATH"],
+        "OPTIONS": SQLITE_OPTIONS,
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Print emails to the console unless a backend is configured.
+EMAIL_BACKEND = (
+    os.getenv("EMAIL_BACKEND")
+    or "django.core.mail.backends.console.EmailBackend"
+)
@@ -10,6 +10,8 @@ SECRET_KEY = os.environ['SECRET_KEY']
 RENDER_EXTERNAL_HOSTNAME = os.environ.get('RENDER_EXTERNAL_HOSTNAME')
 if RENDER_EXTERNAL_HOSTNAME:
     ALLOWED_HOSTS.append(RENDER_EXTERNAL_HOSTNAME)
+    if not os.getenv("SITE_URL"):
+        SITE_URL = f"https://{RENDER_EXTERNAL_HOSTNAME}"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -22,4 +24,26 @@ DATABASES = {
         "HOST": os.environ["POSTGRES_HOST"],
         "PORT": int(os.environ["POSTGRES_DB_PORT"]),
     }
-}
\ No newline at end of file
+}
+
+if os.environ.get("POSTGRES_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ["POSTGRES_REPLICA_HOST"],
+        "PORT": int(
+            os.environ.get("POSTGRES_REPLICA_PORT")
+            or DATABASES["default"]["PORT"]
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Fingerprinted, gzip/brotli-precompressed static files. WhiteNoise serves
+# hashed names with far-future immutable cache headers.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
@@ -20,6 +20,7 @@ from django.urls import path, include, reverse_lazy
 from django.views.generic import CreateView, TemplateView
 
 from core.forms import WorkerCreationForm
+from core.views import MetricsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -30,6 +31,7 @@ urlpatterns = [
         name="login"
     ),
     path("logout/", LogoutView.as_view(), name="logout"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
     path(
         "register/",
         CreateView.as_view(